@@ -1,7 +1,7 @@
 
 import streamlit as st
-import pyperclip
 from crew import ContentCreationCrew
+from output_repair import repair_stats
 from datetime import datetime
 
 st.title("Crew AI Marketing Content Generator")
@@ -21,12 +21,32 @@ if st.button("Generate Content"):
 
         st.header("Results")
 
+        stats = repair_stats.summary()
+        if stats["repaired"] or stats["llm_fallbacks"]:
+            st.caption(
+                f"Structured output: {stats['repaired']} repaired locally, "
+                f"{stats['llm_fallbacks']} sent back to the LLM"
+            )
+
         for i, task in enumerate(result.tasks):
             st.subheader(task.description)
             st.write(task.output)
-            if st.button(f"Copy output from {task.agent.role}", key=f"copy_button_{i}"):
-                pyperclip.copy(task.output.json())
-                st.success("Copied to clipboard!")
+            # Downloads happen in the browser; clipboard access on the server
+            # only ever reached the machine running Streamlit
+            if task.output.pydantic is not None:
+                data = task.output.pydantic.model_dump_json(indent=2)
+                mime, extension = "application/json", "json"
+            else:
+                data = task.output.raw
+                mime, extension = "text/markdown", "md"
+            st.download_button(
+                f"Download output from {task.agent.role}",
+                data=data,
+                file_name=f"{task.name or f'task_{i + 1}'}.{extension}",
+                mime=mime,
+                key=f"download_button_{i}",
+                on_click="ignore",
+            )
 
     else:
         st.error("Please enter a topic.")
@@ -10,6 +10,9 @@ from crewai_tools import (
 )
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
+from output_repair import RepairingConverter
+from delegation import DelegationGuard, GuardedAgent
+from iteration_controller import IterationController
 
 _ = load_dotenv()
 llm = LLM(
@@ -17,6 +20,9 @@ llm = LLM(
     temperature=0.7,
 )
 
+# Watches agent steps for loops and adapts max_iter from previous runs
+iteration_controller = IterationController()
+
 
 class Content(BaseModel):
     content_type: str = Field(
@@ -55,91 +61,116 @@ class ContentCreationCrew:
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
 
+    def __init__(self):
+        # Delegation limits, answer cache and timing for this crew's runs
+        self.delegation_guard = DelegationGuard()
+
     @agent
     def market_research_agent(self) -> Agent:
-        return Agent(
-            config=self.agents_config["market_research_agent"],
-            tools=[
-                SerperDevTool(),
-                ScrapeWebsiteTool(),
-            ],
-            reasoning=True,
-            inject_date=True,
-            llm=llm,
-            allow_delegation=True,
-            # max_rpm=3,
+        return iteration_controller.attach(
+            GuardedAgent(
+                config=self.agents_config["market_research_agent"],
+                tools=[
+                    SerperDevTool(),
+                    ScrapeWebsiteTool(),
+                ],
+                reasoning=True,
+                inject_date=True,
+                llm=llm,
+                allow_delegation=True,
+                delegation_guard=self.delegation_guard,
+                max_iter=iteration_controller.budget("market_research_agent", 10),
+                # max_rpm=3,
+            ),
+            "market_research_agent",
         )
 
     @agent
     def content_ideation_agent(self) -> Agent:
-        return Agent(
-            config=self.agents_config["content_ideation_agent"],
-            tools=[
-                SerperDevTool(),
-                ScrapeWebsiteTool(),
-                DirectoryReadTool("resources/drafts"),
-                FileWriterTool(),
-                FileReadTool(),
-            ],
-            inject_date=True,
-            llm=llm,
-            allow_delegation=True,
-            max_iter=30,
-            max_rpm=3,
+        return iteration_controller.attach(
+            GuardedAgent(
+                config=self.agents_config["content_ideation_agent"],
+                tools=[
+                    SerperDevTool(),
+                    ScrapeWebsiteTool(),
+                    DirectoryReadTool("resources/drafts"),
+                    FileWriterTool(),
+                    FileReadTool(),
+                ],
+                inject_date=True,
+                llm=llm,
+                allow_delegation=True,
+                delegation_guard=self.delegation_guard,
+                max_iter=iteration_controller.budget("content_ideation_agent", 10),
+                max_rpm=3,
+            ),
+            "content_ideation_agent",
         )
 
     @agent
     def blog_writer_agent(self) -> Agent:
-        return Agent(
-            config=self.agents_config["blog_writer_agent"],
-            tools=[
-                SerperDevTool(),
-                ScrapeWebsiteTool(),
-                DirectoryReadTool("resources/drafts/blogs"),
-                FileWriterTool(),
-                FileReadTool(),
-            ],
-            inject_date=True,
-            llm=llm,
-            allow_delegation=True,
-            max_iter=5,
-            max_rpm=3,
+        return iteration_controller.attach(
+            GuardedAgent(
+                config=self.agents_config["blog_writer_agent"],
+                tools=[
+                    SerperDevTool(),
+                    ScrapeWebsiteTool(),
+                    DirectoryReadTool("resources/drafts/blogs"),
+                    FileWriterTool(),
+                    FileReadTool(),
+                ],
+                inject_date=True,
+                llm=llm,
+                allow_delegation=True,
+                delegation_guard=self.delegation_guard,
+                max_iter=iteration_controller.budget("blog_writer_agent", 5),
+                max_rpm=3,
+            ),
+            "blog_writer_agent",
         )
 
     @agent
     def social_media_agent(self) -> Agent:
-        return Agent(
-            config=self.agents_config["social_media_agent"],
-            tools=[
-                SerperDevTool(),
-                ScrapeWebsiteTool(),
-                DirectoryReadTool("resources/drafts/blogs"),
-                FileWriterTool(),
-                FileReadTool(),
-            ],
-            inject_date=True,
-            llm=llm,
-            allow_delegation=True,
-            max_iter=5,
-            max_rpm=3,
+        return iteration_controller.attach(
+            GuardedAgent(
+                config=self.agents_config["social_media_agent"],
+                tools=[
+                    SerperDevTool(),
+                    ScrapeWebsiteTool(),
+                    DirectoryReadTool("resources/drafts/blogs"),
+                    FileWriterTool(),
+                    FileReadTool(),
+                ],
+                inject_date=True,
+                llm=llm,
+                allow_delegation=True,
+                delegation_guard=self.delegation_guard,
+                max_iter=iteration_controller.budget("social_media_agent", 5),
+                max_rpm=3,
+            ),
+            "social_media_agent",
         )
 
     @agent
     def script_writer_agent(self) -> Agent:
-        return Agent(
-            config=self.agents_config["script_writer_agent"],
-            tools=[
-                SerperDevTool(),
-                ScrapeWebsiteTool(),
-                DirectoryReadTool("resources/drafts/blogs"),
-                FileWriterTool(),
-                FileReadTool(),
-            ],
-            inject_date=True,
-            llm=llm,
-            allow_delegation=True,
-            max_iter=5,
-            max_rpm=3,
+        return iteration_controller.attach(
+            GuardedAgent(
+                config=self.agents_config["script_writer_agent"],
+                tools=[
+                    SerperDevTool(),
+                    ScrapeWebsiteTool(),
+                    DirectoryReadTool("resources/drafts/blogs"),
+                    FileWriterTool(),
+                    FileReadTool(),
+                ],
+                inject_date=True,
+                llm=llm,
+                allow_delegation=True,
+                delegation_guard=self.delegation_guard,
+                max_iter=iteration_controller.budget("script_writer_agent", 5),
+                max_rpm=3,
+            ),
+            "script_writer_agent",
         )
 
     @task
@@ -148,6 +179,7 @@ class ContentCreationCrew:
             config=self.tasks_config["market_research_task"],
             agent=self.market_research_agent(),
             output_pydantic=MarketResearch,
+            converter_cls=RepairingConverter,
         )
 
     @task
@@ -157,6 +189,7 @@ class ContentCreationCrew:
             agent=self.content_ideation_agent(),
             context=[self.market_research_task()],
             output_pydantic=ContentIdeas,
+            converter_cls=RepairingConverter,
         )
 
     @task
@@ -166,6 +199,7 @@ class ContentCreationCrew:
             agent=self.blog_writer_agent(),
             context=[self.market_research_task(), self.content_ideation_task()],
             output_pydantic=Content,
+            converter_cls=RepairingConverter,
         )
 
     @task
@@ -175,6 +209,7 @@ class ContentCreationCrew:
             agent=self.social_media_agent(),
             context=[self.blog_writing_task(), self.content_ideation_task()],
             output_pydantic=Content,
+            converter_cls=RepairingConverter,
         )
 
     @task
@@ -184,6 +219,7 @@ class ContentCreationCrew:
             agent=self.script_writer_agent(),
             context=[self.blog_writing_task(), self.content_ideation_task()],
             output_pydantic=Content,
+            converter_cls=RepairingConverter,
         )
 
     @crew
@@ -201,6 +237,7 @@ class ContentCreationCrew:
 
 if __name__ == "__main__":
     from datetime import datetime
+    from output_repair import repair_stats
 
     inputs = {
         "topic": "AI-powered marketing automation for small businesses",
@@ -211,3 +248,5 @@ if __name__ == "__main__":
     result = crew.content_crew().kickoff(inputs=inputs)
     print("Content creation crew has been successfully created and run.")
     print("Results:", result)
+    print("Structured output repair:", repair_stats.summary())
+    print("Delegation:", crew.delegation_guard.summary())
@@ -0,0 +1,197 @@
+# delegation.py
+
+import hashlib
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from crewai import Agent
+from crewai.agents.agent_builder.base_agent import BaseAgent
+from crewai.tools.agent_tools.ask_question_tool import AskQuestionTool
+from crewai.tools.agent_tools.base_agent_tools import BaseAgentTool
+from crewai.tools.agent_tools.delegate_work_tool import DelegateWorkTool
+from crewai.utilities import I18N
+from pydantic import BaseModel, Field
+
+
+class DelegationLimits(BaseModel):
+    """Per-agent delegation limits, set under `delegation_limits` in agents.yaml"""
+
+    max_depth: int = Field(
+        default=1, description="How deep delegated work may itself delegate"
+    )
+    max_fan_out: int = Field(
+        default=2, description="Delegations allowed per task the agent executes"
+    )
+    cache_answers: bool = Field(
+        default=True, description="Reuse answers to identical delegated requests"
+    )
+
+
+class _FanOutBudget:
+    """Delegations used by one agent for one task, shared by its tools"""
+
+    def __init__(self):
+        self.used = 0
+
+
+def _normalize(text: Optional[str]) -> str:
+    return re.sub(r"\s+", " ", str(text or "")).strip().lower()
+
+
+class DelegationGuard:
+    """
+    Tracks delegation across one crew run.
+
+    Enforces depth and fan-out limits, caches answers to identical delegated
+    requests and records how much time delegation adds to the run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._answers: Dict[str, str] = {}
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+
+    def delegate(
+        self,
+        delegator: str,
+        limits: DelegationLimits,
+        budget: _FanOutBudget,
+        coworker: Optional[str],
+        task: str,
+        context: Optional[str],
+        execute: Callable[[], str],
+    ) -> str:
+        """
+        Run a delegation if the limits allow it.
+
+        Args:
+            delegator: Role of the agent delegating
+            limits: The delegator's limits
+            budget: Fan-out counter shared by the delegator's tools for one task
+            coworker: Role the work is delegated to
+            task: The delegated task or question
+            context: Context passed along with it
+            execute: Performs the actual delegation
+
+        Returns:
+            str: The coworker's answer, or an instruction to continue alone
+        """
+        metrics = self._metrics_for(delegator, coworker)
+        depth = getattr(self._local, "depth", 0)
+
+        if depth >= limits.max_depth or budget.used >= limits.max_fan_out:
+            with self._lock:
+                metrics["refused"] += 1
+            return (
+                "Delegation limit reached for this task. Do not delegate again; "
+                "complete the work yourself with the information you already have."
+            )
+
+        key = hashlib.sha256(
+            "\0".join(_normalize(part) for part in (coworker, task, context)).encode()
+        ).hexdigest()
+        if limits.cache_answers:
+            with self._lock:
+                answer = self._answers.get(key)
+                if answer is not None:
+                    metrics["cache_hits"] += 1
+                    return answer
+
+        budget.used += 1
+        self._local.depth = depth + 1
+        started = time.perf_counter()
+        try:
+            answer = execute()
+        finally:
+            self._local.depth = depth
+            with self._lock:
+                metrics["calls"] += 1
+                metrics["seconds"] += time.perf_counter() - started
+
+        if limits.cache_answers:
+            with self._lock:
+                self._answers[key] = answer
+        return answer
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Delegation metrics keyed by 'delegator -> coworker'"""
+        with self._lock:
+            return {route: dict(metrics) for route, metrics in self._metrics.items()}
+
+    def _metrics_for(self, delegator: str, coworker: Optional[str]) -> Dict[str, Any]:
+        route = f"{delegator.strip()} -> {(coworker or 'unknown').strip()}"
+        with self._lock:
+            return self._metrics.setdefault(
+                route, {"calls": 0, "cache_hits": 0, "refused": 0, "seconds": 0.0}
+            )
+
+
+class _GuardedAgentTool(BaseAgentTool):
+    """Routes delegation through a DelegationGuard before running it"""
+
+    guard: Any = Field(default=None, exclude=True)
+    delegator: str = ""
+    limits: DelegationLimits = Field(default_factory=DelegationLimits)
+    budget: Any = Field(default_factory=_FanOutBudget, exclude=True)
+
+    def _execute(self, agent_name: Optional[str], task: str, context: Optional[str] = None) -> str:
+        known = {self.sanitize_agent_name(agent.role) for agent in self.agents}
+        if agent_name is None or self.sanitize_agent_name(agent_name) not in known:
+            # Unknown coworker: let crewai report it without spending the budget
+            return super()._execute(agent_name, task, context)
+
+        return self.guard.delegate(
+            self.delegator,
+            self.limits,
+            self.budget,
+            agent_name,
+            task,
+            context,
+            lambda: super(_GuardedAgentTool, self)._execute(agent_name, task, context),
+        )
+
+
+class GuardedDelegateWorkTool(DelegateWorkTool, _GuardedAgentTool):
+    pass
+
+
+class GuardedAskQuestionTool(AskQuestionTool, _GuardedAgentTool):
+    pass
+
+
+class GuardedAgent(Agent):
+    """Agent whose delegation tools are bounded by a DelegationGuard"""
+
+    delegation_guard: Any = Field(default=None, exclude=True)
+    delegation_limits: DelegationLimits = Field(default_factory=DelegationLimits)
+
+    def get_delegation_tools(self, agents: List[BaseAgent]):
+        if self.delegation_guard is None:
+            return super().get_delegation_tools(agents)
+        if self.delegation_limits.max_depth <= 0 or self.delegation_limits.max_fan_out <= 0:
+            return []
+
+        i18n = I18N()
+        coworkers = ", ".join([f"{agent.role}" for agent in agents])
+        # Tools are built per task execution, so the fan-out budget is per task
+        shared = {
+            "agents": agents,
+            "i18n": i18n,
+            "guard": self.delegation_guard,
+            "delegator": self.role,
+            "limits": self.delegation_limits,
+            "budget": _FanOutBudget(),
+        }
+        return [
+            GuardedDelegateWorkTool(
+                description=i18n.tools("delegate_work").format(coworkers=coworkers),
+                **shared,
+            ),
+            GuardedAskQuestionTool(
+                description=i18n.tools("ask_question").format(coworkers=coworkers),
+                **shared,
+            ),
+        ]
@@ -0,0 +1,268 @@
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Type, get_args, get_origin
+
+from crewai.utilities.converter import Converter
+from pydantic import BaseModel, ValidationError
+
+
+@dataclass
+class RepairStats:
+    """Counters describing how structured outputs were recovered"""
+
+    repaired: int = 0  # fixed locally, no LLM round trip needed
+    llm_fallbacks: int = 0  # local repair failed, conversion went to the LLM
+    cache_hits: int = 0  # same raw output was already parsed
+
+    def summary(self) -> Dict[str, Any]:
+        total = self.repaired + self.llm_fallbacks
+        return {
+            **asdict(self),
+            "retries_avoided_ratio": self.repaired / total if total else 0.0,
+        }
+
+
+repair_stats = RepairStats()
+_stats_lock = threading.Lock()
+
+# Parsed models keyed by a hash of the raw output they came from
+_MODEL_CACHE_SIZE = 256
+_model_cache: "OrderedDict[str, BaseModel]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_key(raw: str, model: Type[BaseModel]) -> str:
+    return hashlib.sha256(f"{model.__name__}\0{raw}".encode()).hexdigest()
+
+
+def get_cached_model(raw: str, model: Type[BaseModel]) -> Optional[BaseModel]:
+    """Return the model previously parsed from this exact raw output, if any"""
+    key = _cache_key(raw, model)
+    with _cache_lock:
+        if key in _model_cache:
+            _model_cache.move_to_end(key)
+            return _model_cache[key]
+    return None
+
+
+def _cache_model(raw: str, parsed: BaseModel):
+    with _cache_lock:
+        _model_cache[_cache_key(raw, type(parsed))] = parsed
+        while len(_model_cache) > _MODEL_CACHE_SIZE:
+            _model_cache.popitem(last=False)
+
+
+def _record(counter: str):
+    with _stats_lock:
+        setattr(repair_stats, counter, getattr(repair_stats, counter) + 1)
+
+
+# --- Lenient JSON extraction ---------------------------------------------
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+def _balanced_object(text: str) -> Optional[str]:
+    """Return the first balanced {...} block, ignoring braces inside strings"""
+    start = text.find("{")
+    while start != -1:
+        depth, in_string, escaped = 0, False, False
+        for i in range(start, len(text)):
+            ch = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[start : i + 1]
+        start = text.find("{", start + 1)
+    return None
+
+
+def _loads_lenient(candidate: str) -> Optional[Any]:
+    attempts = [candidate]
+    fixed = _TRAILING_COMMA.sub(r"\1", candidate.translate(_SMART_QUOTES))
+    attempts.append(fixed)
+    # Python-style literals and single-quoted keys/strings
+    pythonic = re.sub(r"\bTrue\b", "true", fixed)
+    pythonic = re.sub(r"\bFalse\b", "false", pythonic)
+    pythonic = re.sub(r"\bNone\b", "null", pythonic)
+    attempts.append(pythonic)
+    if '"' not in pythonic:
+        attempts.append(pythonic.replace("'", '"'))
+
+    for attempt in attempts:
+        try:
+            return json.loads(attempt, strict=False)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def extract_json(text: str) -> Optional[Any]:
+    """Pull a JSON object out of an LLM answer, tolerating common defects"""
+    candidates = _FENCE.findall(text) + [text]
+    for candidate in candidates:
+        block = _balanced_object(candidate)
+        if block is None:
+            continue
+        data = _loads_lenient(block)
+        if data is not None:
+            return data
+    return None
+
+
+# --- Schema-guided fix-up --------------------------------------------------
+
+
+def _normalize_key(key: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", key.lower())
+
+
+_BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+
+
+def _split_items(value: str) -> List[str]:
+    lines = [line for line in value.splitlines() if line.strip()]
+    if len(lines) <= 1:
+        lines = re.split(r";\s*", value)
+    return [_BULLET.sub("", line).strip() for line in lines if line.strip()]
+
+
+def _as_text(item: Any) -> str:
+    if isinstance(item, dict):
+        return ": ".join(str(v) for v in item.values())
+    return item if isinstance(item, str) else str(item)
+
+
+def _coerce(value: Any, annotation: Any) -> Any:
+    """Coerce a value towards the field's annotated type"""
+    origin = get_origin(annotation)
+    if origin in (list, List):
+        (item_type,) = get_args(annotation) or (Any,)
+        if isinstance(value, str):
+            value = _split_items(value)
+        elif isinstance(value, dict):
+            value = [value]
+        if not isinstance(value, list):
+            return value
+        if item_type is str:
+            return [_as_text(item) for item in value]
+        if item_type is dict or get_origin(item_type) is dict:
+            return [item if isinstance(item, dict) else {"idea": item} for item in value]
+        return value
+    if annotation is str:
+        if isinstance(value, list):
+            return "\n".join(str(item) for item in value)
+        if isinstance(value, (dict, int, float)):
+            return json.dumps(value) if isinstance(value, dict) else str(value)
+    return value
+
+
+def _markdown_sections(text: str) -> Dict[str, str]:
+    """Split a markdown answer into {normalized heading: body} sections"""
+    sections: Dict[str, str] = {}
+    current = None
+    for line in text.splitlines():
+        heading = re.match(r"^\s*(?:#+\s*|\*\*)(.+?)(?:\*\*)?:?\s*$", line)
+        if heading:
+            current = _normalize_key(heading.group(1))
+            sections[current] = ""
+        elif current is not None:
+            sections[current] += line + "\n"
+    return sections
+
+
+def fit_to_schema(data: Any, model: Type[BaseModel], raw: str = "") -> Dict[str, Any]:
+    """Map loosely shaped data onto the model's fields"""
+    fields = model.model_fields
+
+    # Unwrap {"MarketResearch": {...}} or {"result": {...}} style wrappers
+    while (
+        isinstance(data, dict)
+        and len(data) == 1
+        and _normalize_key(next(iter(data))) not in {_normalize_key(f) for f in fields}
+        and isinstance(next(iter(data.values())), dict)
+    ):
+        data = next(iter(data.values()))
+
+    if not isinstance(data, dict):
+        data = {}
+
+    by_key = {_normalize_key(key): value for key, value in data.items()}
+    sections = _markdown_sections(raw) if raw else {}
+
+    fitted: Dict[str, Any] = {}
+    for name, field in fields.items():
+        key = _normalize_key(name)
+        if key in by_key:
+            value = by_key[key]
+        elif key in sections:
+            value = sections[key].strip()
+        else:
+            continue
+        fitted[name] = _coerce(value, field.annotation)
+    return fitted
+
+
+def repair_output(raw: str, model: Type[BaseModel]) -> Optional[BaseModel]:
+    """
+    Try to turn a malformed LLM answer into the model without calling the LLM.
+
+    Args:
+        raw: The agent's raw final answer
+        model: The pydantic model the task expects
+
+    Returns:
+        The validated model, or None if local repair was not enough
+    """
+    data = extract_json(raw)
+    try:
+        return model.model_validate(fit_to_schema(data, model, raw))
+    except ValidationError:
+        return None
+
+
+class RepairingConverter(Converter):
+    """
+    Converter that repairs structured output locally before asking the LLM.
+
+    CrewAI only reaches the converter once strict JSON parsing has failed;
+    the stock converter then spends a full LLM round trip on reformatting.
+    Most failures are small (code fences, trailing commas, a string where a
+    list was expected), so those are fixed here first.
+    """
+
+    def to_pydantic(self, current_attempt=1) -> BaseModel:
+        if current_attempt == 1:
+            cached = get_cached_model(self.text, self.model)
+            if cached is not None:
+                _record("cache_hits")
+                return cached
+
+            repaired = repair_output(self.text, self.model)
+            if repaired is not None:
+                _record("repaired")
+                _cache_model(self.text, repaired)
+                return repaired
+            _record("llm_fallbacks")
+
+        result = super().to_pydantic(current_attempt)
+        if current_attempt == 1 and isinstance(result, BaseModel):
+            _cache_model(self.text, result)
+        return result
@@ -0,0 +1,358 @@
+# api.py
+
+import json
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+
+from config_registry import ConfigValidationError, config_registry
+from events import CrewEvent, payloads
+from process_pool import DEFAULT_WORKERS, CrewProcessPool
+from singleflight import Sink, campaign_flights, campaign_key
+
+API_HOST = os.getenv("CREW_API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("CREW_API_PORT", "8765"))
+
+# Finished runs kept for late readers; the oldest are forgotten first
+MAX_RUNS = int(os.getenv("CREW_API_MAX_RUNS", "200"))
+
+# Requests larger than this are rejected
+MAX_BODY_BYTES = 1_000_000
+
+# A comment line is sent this often so idle streams stay open through proxies
+KEEPALIVE_SECONDS = 15
+
+# Run options a client may set; everything else execute_crew takes is internal
+CLIENT_OPTIONS = ("incremental", "speculative", "budget", "cassette")
+
+_RUN_PATH = re.compile(r"^/runs/([0-9a-f-]{36})(/events)?$")
+
+
+class ApiRun:
+    """
+    One submitted campaign: its event log, status and result.
+
+    Events and the result arrive through ``put`` on its two queues, from
+    the pool or from an identical run this one joined. Events are kept in
+    order, which lets any number of SSE clients follow the run and lets a
+    client that reconnects resume after the last event it saw.
+    """
+
+    def __init__(self, run_id: str, inputs: Dict[str, Any]):
+        self.run_id = run_id
+        self.inputs = inputs
+        self.flight_key: Optional[str] = None
+        self.joined = False
+        self.status = "queued"
+        self.submitted_at = datetime.now().isoformat()
+        self.result: Optional[Dict[str, Any]] = None
+        self.events: List[CrewEvent] = []
+        self._changed = threading.Condition()
+        self.event_queue = Sink(self._add_event)
+        self.result_queue = Sink(self._set_result)
+
+    def _add_event(self, event: CrewEvent):
+        with self._changed:
+            if self.status == "queued":
+                self.status = "running"
+            self.events.append(event)
+            self._changed.notify_all()
+
+    def mark_cancelled(self):
+        with self._changed:
+            self.status = "cancelled"
+
+    def _set_result(self, result: Dict[str, Any]):
+        with self._changed:
+            self.result = result
+            if self.status != "cancelled":
+                self.status = "completed" if result.get("success") else "failed"
+            self._changed.notify_all()
+
+    @property
+    def done(self) -> bool:
+        return self.result is not None
+
+    def wait(self, seen: int, timeout: float) -> Tuple[List[CrewEvent], bool]:
+        """
+        Events after the first ``seen``, waiting up to ``timeout`` for one.
+
+        Returns:
+            Tuple[List[CrewEvent], bool]: New events, and whether the run is done
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.events) > seen or self.done, timeout)
+            return self.events[seen:], self.done
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "status": self.status,
+            "joined": self.joined,
+            "submitted_at": self.submitted_at,
+            "events": len(self.events),
+            "result": self.result,
+        }
+
+
+class CrewApi:
+    """Submits runs to a process pool and keeps their logs for HTTP clients"""
+
+    def __init__(self, pool: CrewProcessPool, max_runs: int = MAX_RUNS):
+        self.pool = pool
+        self.max_runs = max_runs
+        self._lock = threading.Lock()
+        self._runs: "OrderedDict[str, ApiRun]" = OrderedDict()
+
+    def submit(self, inputs: Dict[str, Any], options: Dict[str, Any]) -> ApiRun:
+        """
+        Raises:
+            ConfigValidationError: If required inputs are missing
+            ValueError: If an option is not one clients may set
+        """
+        config_registry.validate_inputs(inputs)
+        unknown = set(options) - set(CLIENT_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown options {sorted(unknown)}, expected some of {list(CLIENT_OPTIONS)}")
+
+        run = ApiRun(str(uuid.uuid4()), inputs)
+        run.flight_key = campaign_key(inputs, options)
+        # An identical campaign already running is joined rather than rerun.
+        # The run id doubles as the execution id, so artifacts land under it
+        run.joined = campaign_flights.submit(
+            run.flight_key,
+            run.event_queue,
+            run.result_queue,
+            lambda events, results: self.pool.submit(
+                inputs, events, results, execution_id=run.run_id, **options
+            ),
+            run.run_id,
+        )
+        with self._lock:
+            self._runs[run.run_id] = run
+            self._evict()
+        return run
+
+    def get(self, run_id: str) -> Optional[ApiRun]:
+        with self._lock:
+            return self._runs.get(run_id)
+
+    def runs(self) -> List[ApiRun]:
+        """Runs still remembered, oldest first"""
+        with self._lock:
+            return list(self._runs.values())
+
+    def cancel(self, run: ApiRun) -> bool:
+        """Detach the run; the pool job stops once no identical run is following it"""
+        if run.done:
+            return False
+        last, job_id = campaign_flights.leave(run.flight_key, run.event_queue)
+        if last and job_id is not None:
+            self.pool.cancel(job_id)
+        run.mark_cancelled()
+        run.result_queue.put(
+            {"success": False, "error": "Execution cancelled", "timestamp": datetime.now().isoformat()}
+        )
+        return True
+
+    def _evict(self):
+        # Caller holds the lock; running runs are never forgotten
+        finished = [run_id for run_id, run in self._runs.items() if run.done]
+        for run_id in finished[: max(0, len(self._runs) - self.max_runs)]:
+            del self._runs[run_id]
+            # The payloads go once no other run following the same flight shows them
+            payloads.release(run_id)
+
+
+def _sse(event_id: int, event: CrewEvent) -> bytes:
+    return (
+        f"id: {event_id}\nevent: {event.type.name.lower()}\n"
+        f"data: {json.dumps(event.to_dict())}\n\n"
+    ).encode("utf-8")
+
+
+class _ApiHandler(BaseHTTPRequestHandler):
+    api: CrewApi  # set on the subclass made by start_api_server
+
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, status: int, body: Any):
+        data = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _run_or_404(self) -> Tuple[Optional[ApiRun], bool]:
+        match = _RUN_PATH.match(self.path.split("?", 1)[0])
+        run = self.api.get(match.group(1)) if match else None
+        if run is None:
+            self._send_json(404, {"error": "Unknown run"})
+        return run, bool(match and match.group(2))
+
+    def do_POST(self):
+        if self.path.split("?", 1)[0] != "/runs":
+            self._send_json(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_json(400, {"error": "Invalid Content-Length"})
+            return
+        if length > MAX_BODY_BYTES:
+            self._send_json(413, {"error": "Request body too large"})
+            return
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            self._send_json(400, {"error": f"Invalid JSON: {e}"})
+            return
+        if not isinstance(body, dict):
+            self._send_json(400, {"error": "Expected a JSON object"})
+            return
+
+        # Either the bare inputs dict, or {"inputs": {...}, "options": {...}}
+        if isinstance(body.get("inputs"), dict):
+            inputs, options = body["inputs"], body.get("options") or {}
+        else:
+            inputs, options = body, {}
+        try:
+            run = self.api.submit(inputs, options)
+        except ConfigValidationError as e:
+            self._send_json(400, {"error": str(e), "problems": e.problems})
+            return
+        except (TypeError, ValueError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        except RuntimeError as e:
+            self._send_json(503, {"error": str(e)})
+            return
+
+        self._send_json(
+            202,
+            {
+                "run_id": run.run_id,
+                "status": run.status,
+                "joined": run.joined,
+                "links": {
+                    "self": f"/runs/{run.run_id}",
+                    "events": f"/runs/{run.run_id}/events",
+                },
+            },
+        )
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] == "/runs":
+            # Results can be large; they are fetched per run
+            self._send_json(200, [{**run.summary(), "result": None} for run in self.api.runs()])
+            return
+        run, events = self._run_or_404()
+        if run is None:
+            return
+        if events:
+            self._stream(run)
+        else:
+            self._send_json(200, run.summary())
+
+    def do_DELETE(self):
+        run, events = self._run_or_404()
+        if run is None:
+            return
+        if events:
+            self._send_json(405, {"error": "Cancel the run at /runs/<id>"})
+        elif self.api.cancel(run):
+            self._send_json(200, run.summary())
+        else:
+            self._send_json(409, {"error": f"Run is already {run.status}"})
+
+    def _stream(self, run: ApiRun):
+        """Server-sent events until the run finishes, then its result"""
+        try:
+            seen = int(self.headers.get("Last-Event-ID", -1)) + 1
+        except ValueError:
+            seen = 0
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            while True:
+                new_events, done = run.wait(seen, KEEPALIVE_SECONDS)
+                for event in new_events:
+                    self.wfile.write(_sse(seen, event))
+                    seen += 1
+                if not new_events and not done:
+                    self.wfile.write(b": keepalive\n\n")
+                if done and not new_events:
+                    result = json.dumps(run.summary(), default=str)
+                    self.wfile.write(f"event: result\ndata: {result}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    return
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            return  # the client went away; the run carries on
+
+    def log_message(self, format, *args):
+        # Streams are long-lived; only errors are worth logging
+        pass
+
+
+def start_api_server(
+    host: str = API_HOST,
+    port: int = API_PORT,
+    pool: Optional[CrewProcessPool] = None,
+) -> ThreadingHTTPServer:
+    """
+    Serve the run API from a daemon thread.
+
+    Endpoints:
+        POST /runs: Submit inputs (optionally {"inputs", "options"}); 202 with the run id
+        GET /runs/<id>/events: Server-sent events, resumable with Last-Event-ID
+        GET /runs/<id>: Status and, once finished, the result payload
+        DELETE /runs/<id>: Cancel a queued or running run
+
+    Args:
+        host: Interface to bind
+        port: Port to bind; 0 picks a free one
+        pool: Process pool to run on; one with DEFAULT_WORKERS is created when omitted
+
+    Returns:
+        ThreadingHTTPServer: The running server; its ``api`` attribute holds the runs
+    """
+    api = CrewApi(pool or CrewProcessPool(DEFAULT_WORKERS))
+    handler = type("ApiHandler", (_ApiHandler,), {"api": api})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.api = api
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Run marketing crews over HTTP")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args()
+
+    server = start_api_server(args.host, args.port, CrewProcessPool(args.workers))
+    print(f"Crew API listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        server.api.pool.shutdown()
@@ -1,34 +1,25 @@
-from crewai.utilities.events.base_event_listener import BaseEventListener
 import os
 import mimetypes
 import base64
-from crewai.utilities.events import (
-    crewai_event_bus,
-    CrewKickoffStartedEvent,
-    CrewKickoffCompletedEvent,
-    CrewKickoffFailedEvent,
-    AgentExecutionStartedEvent,
-    AgentExecutionCompletedEvent,
-    AgentExecutionErrorEvent,
-    TaskStartedEvent,
-    TaskCompletedEvent,
-    TaskFailedEvent,
-    ToolUsageStartedEvent,
-    ToolUsageFinishedEvent,
-    ToolUsageErrorEvent,
-)
 import streamlit as st
 import json
 import threading
 import time
-from datetime import datetime, date
-from typing import Dict, Any, Optional
+from datetime import date
+from typing import Dict, Any, List, Optional
 from queue import Queue, Empty
 import uuid
 
 # Import your CrewAI classes
-from crew import TheMarketingCrew
-from crewai import Agent, Task, Crew
+from runner import run_crew_in_background, run_sweep_in_background
+from singleflight import campaign_flights, campaign_key
+from process_pool import CrewProcessPool
+from cassettes import list_cassettes
+from config_registry import ConfigValidationError, config_registry
+from event_channel import EventChannel
+from events import CrewEvent, EventType, payloads, seconds_between
+from metering import recent_runs
+from metrics import start_metrics_server
 
 # Configure page
 st.set_page_config(
@@ -49,6 +40,14 @@ def to_data_uri(path: str):
     return f"data:{mt};base64,{b64}"
 
 
+# Fail fast on a broken agent/task configuration instead of mid-run
+try:
+    config_registry.configs()
+except ConfigValidationError as e:
+    st.error("❌ The crew configuration is invalid:\n\n" + "\n".join(f"- {p}" for p in e.problems))
+    st.stop()
+
+
 logo_path = "assets/logo.png"
 logo = to_data_uri(logo_path)
 
@@ -79,6 +78,21 @@ def get_gemini_api_key():
     return os.environ.get("GEMINI_API_KEY", "")
 
 
+# OpenMetrics endpoint for scraping (CREW_METRICS_PORT, 0 disables it)
+start_metrics_server()
+
+
+@st.cache_resource
+def get_process_pool():
+    """
+    Get the worker process pool shared by every dashboard session
+
+    Returns:
+        CrewProcessPool: The pool, started on first use
+    """
+    return CrewProcessPool()
+
+
 # Modern UI theme CSS (same as before)
 st.markdown(
     """
@@ -291,296 +305,6 @@ button[role="tab"][aria-selected="true"]{
 )
 
 
-class StreamlitCrewEventListener(BaseEventListener):
-    """Event listener for CrewAI events that sends updates to Streamlit UI"""
-
-    def __init__(self, event_queue: Queue):
-        super().__init__()
-        self.event_queue = event_queue
-
-    def setup_listeners(self, crewai_event_bus):
-        """Setup event listeners according to CrewAI documentation"""
-
-        @crewai_event_bus.on(CrewKickoffStartedEvent)
-        def on_crew_started(source, event):
-            self.event_queue.put(
-                {
-                    "type": "crew_started",
-                    "crew_name": getattr(event, "crew_name", "Marketing Crew"),
-                    "message": f"🚀 Crew '{getattr(event, 'crew_name', 'Marketing Crew')}' has started execution!",
-                    "timestamp": event.timestamp.isoformat()
-                    if hasattr(event, "timestamp")
-                    else datetime.now().isoformat(),
-                }
-            )
-
-        @crewai_event_bus.on(CrewKickoffCompletedEvent)
-        def on_crew_completed(source, event):
-            self.event_queue.put(
-                {
-                    "type": "crew_complete",
-                    "crew_name": getattr(event, "crew_name", "Marketing Crew"),
-                    "output": getattr(event, "output", "Completed successfully"),
-                    "message": f"✅ Crew '{getattr(event, 'crew_name', 'Marketing Crew')}' has completed execution!",
-                    "timestamp": event.timestamp.isoformat()
-                    if hasattr(event, "timestamp")
-                    else datetime.now().isoformat(),
-                }
-            )
-
-        @crewai_event_bus.on(CrewKickoffFailedEvent)
-        def on_crew_failed(source, event):
-            self.event_queue.put(
-                {
-                    "type": "crew_error",
-                    "crew_name": getattr(event, "crew_name", "Marketing Crew"),
-                    "error": getattr(event, "error", "Unknown error"),
-                    "message": f"❌ Crew '{getattr(event, 'crew_name', 'Marketing Crew')}' failed to complete execution",
-                    "timestamp": event.timestamp.isoformat()
-                    if hasattr(event, "timestamp")
-                    else datetime.now().isoformat(),
-                }
-            )
-
-        @crewai_event_bus.on(AgentExecutionStartedEvent)
-        def on_agent_started(source, event):
-            agent_role = (
-                getattr(event.agent, "role", "Unknown Agent")
-                if hasattr(event, "agent")
-                else "Unknown Agent"
-            )
-            self.event_queue.put(
-                {
-                    "type": "agent_start",
-                    "agent_name": agent_role,
-                    "message": f"🤖 Agent '{agent_role}' started execution",
-                    "timestamp": event.timestamp.isoformat()
-                    if hasattr(event, "timestamp")
-                    else datetime.now().isoformat(),
-                }
-            )
-
-        @crewai_event_bus.on(AgentExecutionCompletedEvent)
-        def on_agent_completed(source, event):
-            agent_role = (
-                getattr(event.agent, "role", "Unknown Agent")
-                if hasattr(event, "agent")
-                else "Unknown Agent"
-            )
-            output = getattr(event, "output", "")
-            self.event_queue.put(
-                {
-                    "type": "agent_finish",
-                    "agent_name": agent_role,
-                    "output": str(output)[:200] + "..."
-                    if len(str(output)) > 200
-                    else str(output),
-                    "message": f"✅ Agent '{agent_role}' completed execution",
-                    "timestamp": event.timestamp.isoformat()
-                    if hasattr(event, "timestamp")
-                    else datetime.now().isoformat(),
-                }
-            )
-
-        @crewai_event_bus.on(AgentExecutionErrorEvent)
-        def on_agent_error(source, event):
-            agent_role = (
-                getattr(event.agent, "role", "Unknown Agent")
-                if hasattr(event, "agent")
-                else "Unknown Agent"
-            )
-            error = getattr(event, "error", "Unknown error")
-            self.event_queue.put(
-                {
-                    "type": "agent_error",
-                    "agent_name": agent_role,
-                    "error": str(error),
-                    "message": f"❌ Agent '{agent_role}' encountered an error",
-                    "timestamp": event.timestamp.isoformat()
-                    if hasattr(event, "timestamp")
-                    else datetime.now().isoformat(),
-                }
-            )
-
-        @crewai_event_bus.on(TaskStartedEvent)
-        def on_task_started(source, event):
-            task_desc = (
-                getattr(event, "description", "Unknown task")
-                if hasattr(event, "description")
-                else "Task started"
-            )
-            self.event_queue.put(
-                {
-                    "type": "task_start",
-                    "task_description": task_desc[:100] + "..."
-                    if len(task_desc) > 100
-                    else task_desc,
-                    "message": f"📋 Task started: {task_desc[:50]}{'...' if len(task_desc) > 50 else ''}",
-                    "timestamp": event.timestamp.isoformat()
-                    if hasattr(event, "timestamp")
-                    else datetime.now().isoformat(),
-                }
-            )
-
-        @crewai_event_bus.on(TaskCompletedEvent)
-        def on_task_completed(source, event):
-            task_desc = (
-                getattr(event, "description", "Unknown task")
-                if hasattr(event, "description")
-                else "Task completed"
-            )
-            self.event_queue.put(
-                {
-                    "type": "task_complete",
-                    "task_description": task_desc[:100] + "..."
-                    if len(task_desc) > 100
-                    else task_desc,
-                    "message": f"✅ Task completed: {task_desc[:50]}{'...' if len(task_desc) > 50 else ''}",
-                    "timestamp": event.timestamp.isoformat()
-                    if hasattr(event, "timestamp")
-                    else datetime.now().isoformat(),
-                }
-            )
-
-        @crewai_event_bus.on(TaskFailedEvent)
-        def on_task_failed(source, event):
-            task_desc = (
-                getattr(event, "description", "Unknown task")
-                if hasattr(event, "description")
-                else "Task failed"
-            )
-            error = getattr(event, "error", "Unknown error")
-            self.event_queue.put(
-                {
-                    "type": "task_error",
-                    "task_description": task_desc[:100] + "..."
-                    if len(task_desc) > 100
-                    else task_desc,
-                    "error": str(error),
-                    "message": f"❌ Task failed: {task_desc[:50]}{'...' if len(task_desc) > 50 else ''}",
-                    "timestamp": event.timestamp.isoformat()
-                    if hasattr(event, "timestamp")
-                    else datetime.now().isoformat(),
-                }
-            )
-
-        @crewai_event_bus.on(ToolUsageStartedEvent)
-        def on_tool_usage_started(source, event):
-            tool_name = (
-                getattr(event, "tool_name", "Unknown tool")
-                if hasattr(event, "tool_name")
-                else "Tool"
-            )
-            self.event_queue.put(
-                {
-                    "type": "tool_start",
-                    "tool_name": tool_name,
-                    "message": f"🔧 Tool '{tool_name}' started",
-                    "timestamp": event.timestamp.isoformat()
-                    if hasattr(event, "timestamp")
-                    else datetime.now().isoformat(),
-                }
-            )
-
-        @crewai_event_bus.on(ToolUsageFinishedEvent)
-        def on_tool_usage_finished(source, event):
-            tool_name = (
-                getattr(event, "tool_name", "Unknown tool")
-                if hasattr(event, "tool_name")
-                else "Tool"
-            )
-            self.event_queue.put(
-                {
-                    "type": "tool_finish",
-                    "tool_name": tool_name,
-                    "message": f"🔧 Tool '{tool_name}' completed",
-                    "timestamp": event.timestamp.isoformat()
-                    if hasattr(event, "timestamp")
-                    else datetime.now().isoformat(),
-                }
-            )
-
-        @crewai_event_bus.on(ToolUsageErrorEvent)
-        def on_tool_usage_error(source, event):
-            tool_name = (
-                getattr(event, "tool_name", "Unknown tool")
-                if hasattr(event, "tool_name")
-                else "Tool"
-            )
-            error = getattr(event, "error", "Unknown error")
-            self.event_queue.put(
-                {
-                    "type": "tool_error",
-                    "tool_name": tool_name,
-                    "error": str(error),
-                    "message": f"🔧 Tool '{tool_name}' encountered an error",
-                    "timestamp": event.timestamp.isoformat()
-                    if hasattr(event, "timestamp")
-                    else datetime.now().isoformat(),
-                }
-            )
-
-
-def run_crew_in_background(
-    inputs: Dict[str, Any], event_queue: Queue, result_queue: Queue
-):
-    """Run CrewAI in background thread with proper event listening"""
-    # Global event listener instance (required for proper registration)
-    global streamlit_listener
-
-    try:
-        # Create and register event listener
-        streamlit_listener = StreamlitCrewEventListener(event_queue)
-
-        # Initialize crew
-        crew_instance = TheMarketingCrew()
-        crew = crew_instance.marketingcrew()
-
-        # Start execution log
-        event_queue.put(
-            {
-                "type": "info",
-                "message": "🚀 Starting CrewAI execution...",
-                "timestamp": datetime.now().isoformat(),
-            }
-        )
-
-        # Execute crew (events will be automatically captured)
-        result = crew.kickoff(inputs=inputs)
-
-        # Put final result
-        result_data = result
-        if hasattr(result, "raw"):
-            result_data = result.raw
-        elif hasattr(result, "dict"):
-            result_data = result.dict()
-        else:
-            result_data = str(result)
-
-        result_queue.put(
-            {
-                "success": True,
-                "result": result_data,
-                "timestamp": datetime.now().isoformat(),
-            }
-        )
-
-    except Exception as e:
-        # Put error result
-        result_queue.put(
-            {"success": False, "error": str(e), "timestamp": datetime.now().isoformat()}
-        )
-
-        event_queue.put(
-            {
-                "type": "error",
-                "error": str(e),
-                "message": f"❌ Execution failed: {str(e)}",
-                "timestamp": datetime.now().isoformat(),
-            }
-        )
-
-
 def create_agent_card(
     agent_name: str, agent_icon: str, status: str = "pending", content: str = None
 ):
@@ -624,53 +348,103 @@ def create_progress_bar(current: int, total: int):
     """
 
 
-def format_log_entry(event):
+# How each event type is shown in the live log: css class and label
+LOG_STYLES = {
+    EventType.AGENT_START: ("log-agent", "🤖 {name}</span> started execution"),
+    EventType.AGENT_FINISH: ("log-agent", "✅ {name}</span> completed execution"),
+    EventType.AGENT_ERROR: ("log-error", "❌ {name} error:</span> {text}"),
+    EventType.TASK_START: ("log-task", "📋 Task started:</span> {name}"),
+    EventType.TASK_COMPLETE: ("log-task", "✅ Task completed:</span> {name}"),
+    EventType.TASK_ERROR: ("log-error", "❌ Task failed:</span> {name}"),
+    EventType.TOOL_START: ("log-info", "🔧 Tool started:</span> {name}"),
+    EventType.TOOL_FINISH: ("log-info", "🔧 Tool completed:</span> {name} {text}"),
+    EventType.TOOL_ERROR: ("log-error", "🔧 Tool error:</span> {name}"),
+    EventType.CREW_STARTED: ("log-info", "🚀 Crew started:</span> {name}"),
+    EventType.CREW_COMPLETE: ("log-info", "🎉 Crew completed:</span> {name}"),
+    EventType.CREW_ERROR: ("log-error", "❌ Crew failed:</span> {name}"),
+    EventType.ERROR: ("log-error", "❌ Error:</span> {text}"),
+    EventType.INFO: ("log-info", "ℹ️</span> {text}"),
+}
+
+
+def format_log_entry(event: CrewEvent):
     """Format a log entry for display"""
-    timestamp = event.get("timestamp", "")
-    if timestamp:
-        try:
-            dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-            formatted_time = dt.strftime("%H:%M:%S")
-        except:
-            formatted_time = timestamp[:8]
-    else:
-        formatted_time = datetime.now().strftime("%H:%M:%S")
-
-    event_type = event.get("type", "info")
-
-    if event_type == "agent_start":
-        return f'<div class="log-entry"><span class="log-timestamp">[{formatted_time}]</span> <span class="log-agent">🤖 {event.get("agent_name", "Agent")}</span> started execution</div>'
-    elif event_type == "agent_finish":
-        return f'<div class="log-entry"><span class="log-timestamp">[{formatted_time}]</span> <span class="log-agent">✅ {event.get("agent_name", "Agent")}</span> completed execution</div>'
-    elif event_type == "agent_error":
-        return f'<div class="log-entry"><span class="log-timestamp">[{formatted_time}]</span> <span class="log-error">❌ {event.get("agent_name", "Agent")} error:</span> {event.get("error", "Unknown error")}</div>'
-    elif event_type == "task_start":
-        return f'<div class="log-entry"><span class="log-timestamp">[{formatted_time}]</span> <span class="log-task">📋 Task started:</span> {event.get("task_description", "")}</div>'
-    elif event_type == "task_complete":
-        return f'<div class="log-entry"><span class="log-timestamp">[{formatted_time}]</span> <span class="log-task">✅ Task completed:</span> {event.get("task_description", "")}</div>'
-    elif event_type == "task_error":
-        return f'<div class="log-entry"><span class="log-timestamp">[{formatted_time}]</span> <span class="log-error">❌ Task failed:</span> {event.get("task_description", "")}</div>'
-    elif event_type == "tool_start":
-        return f'<div class="log-entry"><span class="log-timestamp">[{formatted_time}]</span> <span class="log-info">🔧 Tool started:</span> {event.get("tool_name", "Unknown tool")}</div>'
-    elif event_type == "tool_finish":
-        return f'<div class="log-entry"><span class="log-timestamp">[{formatted_time}]</span> <span class="log-info">🔧 Tool completed:</span> {event.get("tool_name", "Unknown tool")}</div>'
-    elif event_type == "tool_error":
-        return f'<div class="log-entry"><span class="log-timestamp">[{formatted_time}]</span> <span class="log-error">🔧 Tool error:</span> {event.get("tool_name", "Unknown tool")}</div>'
-    elif event_type == "crew_started":
-        return f'<div class="log-entry"><span class="log-timestamp">[{formatted_time}]</span> <span class="log-info">🚀 Crew started:</span> {event.get("crew_name", "Marketing Crew")}</div>'
-    elif event_type == "crew_complete":
-        return f'<div class="log-entry"><span class="log-timestamp">[{formatted_time}]</span> <span class="log-info">🎉 Crew completed:</span> {event.get("crew_name", "Marketing Crew")}</div>'
-    elif event_type == "crew_error":
-        return f'<div class="log-entry"><span class="log-timestamp">[{formatted_time}]</span> <span class="log-error">❌ Crew failed:</span> {event.get("crew_name", "Marketing Crew")}</div>'
-    elif event_type == "error":
-        return f'<div class="log-entry"><span class="log-timestamp">[{formatted_time}]</span> <span class="log-error">❌ Error:</span> {event.get("error", "Unknown error")}</div>'
-    else:
-        message = event.get("message", str(event))
-        return f'<div class="log-entry"><span class="log-timestamp">[{formatted_time}]</span> <span class="log-info">ℹ️</span> {message}</div>'
+    css_class, template = LOG_STYLES[event.type]
+    return (
+        f'<div class="log-entry"><span class="log-timestamp">[{event.datetime:%H:%M:%S}]</span> '
+        f'<span class="{css_class}">{template.format(name=event.name, text=event.text)}</div>'
+    )
+
 
+# Characters of output rendered per page in the results summary
+PAGE_CHARS = 20_000
+
+
+def split_pages(text: str, page_chars: int = PAGE_CHARS) -> List[str]:
+    """Split text into pages of roughly page_chars, breaking at line ends"""
+    pages, start = [], 0
+    while start < len(text):
+        end = start + page_chars
+        if end < len(text):
+            newline = text.rfind("\n", start, end)
+            end = newline + 1 if newline > start else end
+        pages.append(text[start:end])
+        start = end
+    return pages or [""]
+
+
+def show_paginated(text: str, key: str, as_code: bool = False):
+    """Render one page of a long output, with a page picker when needed"""
+    pages = split_pages(text)
+    page = 1
+    if len(pages) > 1:
+        page = st.number_input(
+            f"Page (of {len(pages)})", min_value=1, max_value=len(pages), value=1, key=key
+        )
+    if as_code:
+        st.code(pages[page - 1], language="markdown")
+    else:
+        st.markdown(pages[page - 1])
+
+
+def show_usage(usage: Dict[str, Any]):
+    """Token, tool-call and cost totals of a run, per agent and per task"""
+    totals = usage.get("totals") or {}
+    if not totals:
+        return
+    st.markdown("#### Usage and Cost")
+    usage_cols = st.columns(4)
+    usage_cols[0].metric(
+        "Tokens",
+        f"{totals['prompt_tokens'] + totals['completion_tokens']:,}",
+        help=f"{totals['prompt_tokens']:,} prompt ({totals['cached_tokens']:,} cached), "
+        f"{totals['completion_tokens']:,} completion in {totals['llm_calls']} LLM calls",
+    )
+    usage_cols[1].metric("Tool Calls", totals["tool_calls"], help=f"{totals['tool_errors']} failed")
+    usage_cols[2].metric("Estimated Cost (USD)", f"{totals['cost_usd']:.4f}")
+    budget = usage.get("budget") or {}
+    usage_cols[3].metric(
+        "Budget (USD)",
+        f"{budget['max_cost_usd']:.2f}" if budget.get("max_cost_usd") else "None",
+    )
+    for scope in ("agents", "tasks"):
+        if usage.get(scope):
+            st.dataframe(
+                [
+                    {
+                        scope[:-1]: name,
+                        "llm calls": counters["llm_calls"],
+                        "prompt tokens": counters["prompt_tokens"],
+                        "cached tokens": counters["cached_tokens"],
+                        "completion tokens": counters["completion_tokens"],
+                        "tool calls": counters["tool_calls"],
+                        "cost (USD)": round(counters["cost_usd"], 4),
+                    }
+                    for name, counters in usage[scope].items()
+                ],
+                use_container_width=True,
+            )
 
-# Global variable to keep event listener in memory (required by CrewAI)
-streamlit_listener = None
 
 # Initialize session state
 if "crew_results" not in st.session_state:
@@ -681,14 +455,24 @@ if "crew_running" not in st.session_state:
     st.session_state.crew_running = False
 if "crew_thread" not in st.session_state:
     st.session_state.crew_thread = None
+if "flight_key" not in st.session_state:
+    st.session_state.flight_key = None
+if "joined_run" not in st.session_state:
+    st.session_state.joined_run = False
 if "event_queue" not in st.session_state:
-    st.session_state.event_queue = Queue()
+    st.session_state.event_queue = EventChannel()
 if "result_queue" not in st.session_state:
     st.session_state.result_queue = Queue()
 if "live_logs" not in st.session_state:
     st.session_state.live_logs = []
 if "execution_id" not in st.session_state:
     st.session_state.execution_id = None
+if "sweep_running" not in st.session_state:
+    st.session_state.sweep_running = False
+if "sweep_queue" not in st.session_state:
+    st.session_state.sweep_queue = Queue()
+if "sweep_results" not in st.session_state:
+    st.session_state.sweep_results = {}
 
 # Header
 st.markdown(
@@ -805,241 +589,587 @@ with st.sidebar:
             "Additional Requirements",
             placeholder="Any specific requirements or notes...",
         )
+        use_process_pool = st.checkbox(
+            "Run in isolated worker process",
+            value=False,
+            help="Execute the crew in a separate process so concurrent runs never share events or state",
+        )
+        incremental = st.checkbox(
+            "Reuse unchanged task results",
+            value=True,
+            help="Only rerun tasks whose inputs changed since a previous run, e.g. market research is kept when only the budget changes",
+        )
+        speculative = st.checkbox(
+            "Speculative drafting (best of N)",
+            value=False,
+            help="Request several drafts at once for blog, social and script tasks and keep the first that meets the task's constraints. Uses more quota for lower latency",
+        )
+        budget_usd = st.number_input(
+            "Run budget (USD)",
+            min_value=0.0,
+            value=0.0,
+            step=0.05,
+            format="%.2f",
+            help="Abort the run once its estimated cost reaches this amount; 0 means no limit",
+        )
+        budget_tokens = st.number_input(
+            "Run token budget",
+            min_value=0,
+            value=0,
+            step=10_000,
+            help="Abort the run once it has used this many prompt plus completion tokens; 0 means no limit",
+        )
+        run_budget = {
+            "max_cost_usd": budget_usd or None,
+            "max_tokens": budget_tokens or None,
+        }
+        cassette_mode = st.selectbox(
+            "Cassette",
+            ["Off", "Record", "Replay"],
+            help="Record every LLM and tool call of a live run, or replay a recorded run without calling any provider",
+        )
+        run_cassette = None
+        if cassette_mode == "Record":
+            run_cassette = {"mode": "record"}
+        elif cassette_mode == "Replay":
+            recorded = list_cassettes()
+            replay_path = st.selectbox(
+                "Recorded run",
+                recorded,
+                format_func=os.path.basename,
+                help="Recordings are kept in .crew_state/cassettes",
+            )
+            time_scale = st.slider(
+                "Replay timing",
+                0.0,
+                2.0,
+                1.0,
+                0.1,
+                help="1 replays at the recorded pace, 0 as fast as possible",
+            )
+            if replay_path:
+                run_cassette = {"mode": "replay", "path": replay_path, "time_scale": time_scale}
         # Auto-refresh settings
         auto_refresh = st.checkbox("Auto-refresh logs", value=True)
         refresh_interval = st.slider("Refresh interval (seconds)", 1, 10, 3)
 
-# Main content area
-col1, col2 = st.columns([1, 1])
-
-with col1:
-    st.markdown("## 🎯 Campaign Overview")
-
-    # Display current configuration
-    config_card = f"""
-    <div class="card">
-        <h3>Configuration Summary</h3>
-        <p><strong>Product:</strong> {product_name}</p>
-        <p><strong>Industry:</strong> {industry}</p>
-        <p><strong>Target:</strong> {target_audience}</p>
-        <p><strong>Budget:</strong> {budget}</p>
-        <p><strong>Duration:</strong> {campaign_duration}</p>
-        <p><strong>Goal:</strong> {primary_goal}</p>
-    </div>
-    """
-    st.markdown(config_card, unsafe_allow_html=True)
-
-with col2:
-    st.markdown("## 🚀 Execution Controls")
-
-    # Execution button
-    if not st.session_state.crew_running:
-        if st.button(
-            "🚀 Start Marketing Crew", use_container_width=True, type="primary"
-        ):
-            # Prepare inputs
-            inputs = {
-                "product_name": product_name,
-                "target_audience": target_audience,
-                "product_description": product_description,
-                "budget": budget,
-                "current_date": current_date.strftime("%Y-%m-%d"),
-                "industry": industry,
-                "campaign_duration": campaign_duration,
-                "primary_goal": primary_goal,
-                "location": location,
-            }
-
-            if custom_requirements:
-                inputs["additional_requirements"] = custom_requirements
-
-            # Clear previous results
-            st.session_state.crew_results = {}
-            st.session_state.execution_status = {}
-            st.session_state.live_logs = []
-            st.session_state.execution_id = str(uuid.uuid4())
-
-            # Create new queues
-            st.session_state.event_queue = Queue()
-            st.session_state.result_queue = Queue()
-
-            # Start crew in background thread
-            st.session_state.crew_thread = threading.Thread(
-                target=run_crew_in_background,
-                args=(
-                    inputs,
+# Inputs shared by single runs and parameter sweeps
+campaign_inputs = {
+    "product_name": product_name,
+    "target_audience": target_audience,
+    "product_description": product_description,
+    "budget": budget,
+    "current_date": current_date.strftime("%Y-%m-%d"),
+    "industry": industry,
+    "campaign_duration": campaign_duration,
+    "primary_goal": primary_goal,
+    "location": location,
+}
+if custom_requirements:
+    campaign_inputs["additional_requirements"] = custom_requirements
+
+# Single runs and parameter sweeps each get their own tab
+run_tab, sweep_tab = st.tabs(["🚀 Campaign Run", "🧪 Parameter Sweep"])
+
+with run_tab:
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        st.markdown("## 🎯 Campaign Overview")
+
+        # Display current configuration
+        config_card = f"""
+        <div class="card">
+            <h3>Configuration Summary</h3>
+            <p><strong>Product:</strong> {product_name}</p>
+            <p><strong>Industry:</strong> {industry}</p>
+            <p><strong>Target:</strong> {target_audience}</p>
+            <p><strong>Budget:</strong> {budget}</p>
+            <p><strong>Duration:</strong> {campaign_duration}</p>
+            <p><strong>Goal:</strong> {primary_goal}</p>
+        </div>
+        """
+        st.markdown(config_card, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown("## 🚀 Execution Controls")
+
+        # Execution button
+        if not st.session_state.crew_running:
+            if st.button(
+                "🚀 Start Marketing Crew", use_container_width=True, type="primary"
+            ):
+                # Prepare inputs
+                inputs = dict(campaign_inputs)
+
+                # Clear previous results
+                st.session_state.crew_results = {}
+                st.session_state.execution_status = {}
+                st.session_state.live_logs = []
+                # The previous run's log is gone, and the outputs behind it with it
+                # unless another session that followed the same run still shows them
+                if st.session_state.execution_id:
+                    payloads.release(st.session_state.execution_id)
+                st.session_state.execution_id = str(uuid.uuid4())
+
+                # Create new queues
+                st.session_state.event_queue = EventChannel()
+                st.session_state.result_queue = Queue()
+
+                options = {
+                    "incremental": incremental,
+                    "speculative": speculative,
+                    "budget": run_budget,
+                    "cassette": run_cassette,
+                }
+
+                def start_run(event_queue, result_queue):
+                    if use_process_pool:
+                        # Start crew in an isolated worker process
+                        return get_process_pool().submit(
+                            inputs,
+                            event_queue,
+                            result_queue,
+                            execution_id=st.session_state.execution_id,
+                            **options,
+                        )
+                    # Start crew in background thread
+                    st.session_state.crew_thread = threading.Thread(
+                        target=run_crew_in_background,
+                        args=(inputs, event_queue, result_queue),
+                        kwargs={"execution_id": st.session_state.execution_id, **options},
+                        daemon=True,
+                    )
+                    st.session_state.crew_thread.start()
+                    return None
+
+                # Identical campaigns already running (e.g. another user's) are joined
+                st.session_state.flight_key = campaign_key(inputs, options)
+                st.session_state.joined_run = campaign_flights.submit(
+                    st.session_state.flight_key,
                     st.session_state.event_queue,
                     st.session_state.result_queue,
-                ),
-                daemon=True,
-            )
-            st.session_state.crew_thread.start()
-            st.session_state.crew_running = True
-            st.rerun()
-    else:
-        st.button("⏳ Crew Running...", disabled=True, use_container_width=True)
-        if st.button("🛑 Stop Execution", use_container_width=True):
-            st.session_state.crew_running = False
-            # Note: In a production app, you'd want to implement proper thread cancellation
-            st.rerun()
-
-# Live Logs Section
-if st.session_state.crew_running or st.session_state.live_logs:
-    st.markdown("## 📝 Live Execution Logs")
-
-    # Process new events from queue
-    new_events = []
-    try:
-        while True:
-            event = st.session_state.event_queue.get_nowait()
+                    start_run,
+                    st.session_state.execution_id,
+                )
+                st.session_state.crew_running = True
+                st.rerun()
+        else:
+            st.button("⏳ Crew Running...", disabled=True, use_container_width=True)
+            if st.session_state.joined_run:
+                st.info("An identical campaign was already running; showing its progress instead of starting another")
+            if st.button("🛑 Stop Execution", use_container_width=True):
+                st.session_state.crew_running = False
+                # Only this session stops following; the run is cancelled once nobody is
+                last, pool_job_id = campaign_flights.leave(
+                    st.session_state.flight_key, st.session_state.event_queue
+                )
+                if last and pool_job_id:
+                    get_process_pool().cancel(pool_job_id)
+                # Note: Threaded runs cannot be cancelled; use the worker process mode for that
+                st.rerun()
+
+    # Live Logs Section
+    if st.session_state.crew_running or st.session_state.live_logs:
+        st.markdown("## 📝 Live Execution Logs")
+
+        # Process new events from queue
+        new_events = []
+        for event in st.session_state.event_queue.drain():
             new_events.append(event)
             st.session_state.live_logs.append(event)
-    except Empty:
-        pass
-
-    # Check for final result
-    try:
-        final_result = st.session_state.result_queue.get_nowait()
-        st.session_state.crew_results = final_result
-        st.session_state.crew_running = False
-        if new_events or final_result:
-            st.rerun()
-    except Empty:
-        pass
-
-    # Display logs
-    if st.session_state.live_logs:
-        log_html = '<div class="live-log">'
-        for event in st.session_state.live_logs[-50:]:  # Show last 50 events
-            log_html += format_log_entry(event)
-        log_html += "</div>"
-        st.markdown(log_html, unsafe_allow_html=True)
-
-    # Auto-refresh
-    if auto_refresh and st.session_state.crew_running:
-        time.sleep(refresh_interval)
-        st.rerun()
 
-# Define agents and their details
-agents_info = [
-    ("Market Research Agent", "📊", "market_research_task"),
-    ("Marketing Strategy Agent", "🎯", "marketing_strategy_task"),
-    ("Content Calendar Agent", "📅", "content_calendar_task"),
-    ("Content Writer Agent", "✍️", "content_drafting_blogs_task"),
-    ("Social Content Agent", "📱", "content_drafting_social_task"),
-    ("SEO Specialist Agent", "🔍", "seo_optimization_task"),
-    ("Social Script Agent", "🎬", "script_generation_task"),
-]
-
-# Results Section
-st.markdown("## 📊 Agent Results")
-
-# Display agent cards with updated status from logs
-for agent_name, agent_icon, task_key in agents_info:
-    # Determine status based on logs and results
-    status = "pending"
-    content = None
-
-    # Check logs for this agent
-    for log in st.session_state.live_logs:
-        if (
-            log.get("type") == "agent_start"
-            and agent_name.lower() in log.get("agent_name", "").lower()
-        ):
-            status = "running"
-        elif (
-            log.get("type") == "agent_finish"
-            and agent_name.lower() in log.get("agent_name", "").lower()
-        ):
-            status = "complete"
-            content = (
-                log.get("result", "")[:500] + "..."
-                if len(log.get("result", "")) > 500
-                else log.get("result", "")
-            )
-
-    # Check if crew is complete
-    if st.session_state.crew_results and st.session_state.crew_results.get("success"):
-        status = "complete"
-        result_data = st.session_state.crew_results.get("result", {})
-        if isinstance(result_data, dict) and task_key in str(result_data):
-            content = json.dumps(result_data, indent=2)[:500] + "..."
-        elif isinstance(result_data, str):
-            content = (
-                result_data[:500] + "..." if len(result_data) > 500 else result_data
+        # Check for final result
+        try:
+            final_result = st.session_state.result_queue.get_nowait()
+            # Serialize the result once rather than on every rerun
+            result_data = final_result.get("result")
+            final_result["result_text"] = (
+                json.dumps(result_data, indent=2)
+                if isinstance(result_data, (dict, list))
+                else str(result_data or "")
             )
+            st.session_state.crew_results = final_result
+            st.session_state.crew_running = False
+            if new_events or final_result:
+                st.rerun()
+        except Empty:
+            pass
+
+        # Display logs
+        if st.session_state.live_logs:
+            log_html = '<div class="live-log">'
+            for event in st.session_state.live_logs[-50:]:  # Show last 50 events
+                log_html += format_log_entry(event)
+            log_html += "</div>"
+            st.markdown(log_html, unsafe_allow_html=True)
+
+        # Auto-refresh
+        if auto_refresh and st.session_state.crew_running:
+            time.sleep(refresh_interval)
+            st.rerun()
 
-    # Check for errors
-    for log in st.session_state.live_logs:
-        if log.get("type") == "error":
-            status = "error"
-            content = log.get("error", "")
-            break
-
-    # Create and display card
-    # card_html = create_agent_card(agent_name, agent_icon, status, content)
-    # st.markdown(card_html, unsafe_allow_html=True)
+    # Define agents and their details
+    agents_info = [
+        ("Market Research Agent", "📊", "market_research_task"),
+        ("Marketing Strategy Agent", "🎯", "marketing_strategy_task"),
+        ("Content Calendar Agent", "📅", "content_calendar_task"),
+        ("Content Writer Agent", "✍️", "content_drafting_blogs_task"),
+        ("Social Content Agent", "📱", "content_drafting_social_task"),
+        ("SEO Specialist Agent", "🔍", "seo_optimization_task"),
+        ("Social Script Agent", "🎬", "script_generation_task"),
+    ]
+
+    # Results Section
+    st.markdown("## 📊 Agent Results")
+
+    # Display agent cards with updated status from logs
+    for agent_name, agent_icon, task_key in agents_info:
+        # Determine status based on logs and results
+        status = "pending"
+        content = None
+
+        # Check logs for this agent
+        for log in st.session_state.live_logs:
+            if log.type == EventType.AGENT_START and agent_name.lower() in log.name.lower():
+                status = "running"
+            elif log.type == EventType.AGENT_FINISH and agent_name.lower() in log.name.lower():
+                status = "complete"
+                # The preview is enough for a card; the full output stays in the payload store
+                content = log.text
+
+        # Check if crew is complete
+        if st.session_state.crew_results and st.session_state.crew_results.get("success"):
+            status = "complete"
+            result_data = st.session_state.crew_results.get("result", {})
+            if isinstance(result_data, dict) and task_key in str(result_data):
+                content = json.dumps(result_data, indent=2)[:500] + "..."
+            elif isinstance(result_data, str):
+                content = (
+                    result_data[:500] + "..." if len(result_data) > 500 else result_data
+                )
+
+        # Check for errors
+        for log in st.session_state.live_logs:
+            if log.type == EventType.ERROR:
+                status = "error"
+                content = log.text
+                break
+
+        # Create and display card
+        # card_html = create_agent_card(agent_name, agent_icon, status, content)
+        # st.markdown(card_html, unsafe_allow_html=True)
+
+    # Results Summary
+    if st.session_state.crew_results:
+        st.markdown("## 📋 Final Results Summary")
+
+        if st.session_state.crew_results.get("success"):
+            bundle = st.session_state.crew_results.get("bundle")
+            if bundle and os.path.exists(bundle):
+                with open(bundle, "rb") as bundle_file:
+                    st.download_button(
+                        "📦 Download Results Bundle (.zip)",
+                        data=bundle_file,
+                        file_name=f"campaign-{st.session_state.execution_id or 'run'}.zip",
+                        mime="application/zip",
+                        on_click="ignore",
+                        help=f"All artifacts and task outputs ({os.path.getsize(bundle) / 1024:.0f} KB)",
+                    )
+
+            tabs = st.tabs(["📊 Raw Output", "📁 Structured Data", "📈 Analysis"])
+
+            with tabs[0]:
+                st.markdown("### Complete Crew Output")
+                show_paginated(
+                    st.session_state.crew_results.get("result_text", ""),
+                    key="raw_output_page",
+                    as_code=True,
+                )
+
+            with tabs[1]:
+                st.markdown("### Structured Results")
+                task_outputs = st.session_state.crew_results.get("task_outputs") or {}
+                if task_outputs:
+                    # Only the selected task's output is sent to the browser
+                    selected_task = st.selectbox(
+                        "Task",
+                        list(task_outputs),
+                        format_func=lambda name: name.replace("_", " ").title(),
+                    )
+                    show_paginated(
+                        task_outputs[selected_task], key=f"task_output_page_{selected_task}"
+                    )
+                else:
+                    result_data = st.session_state.crew_results.get("result", {})
+                    if isinstance(result_data, dict):
+                        for key, value in result_data.items():
+                            st.markdown(f"**{key.replace('_', ' ').title()}:**")
+                            if isinstance(value, (dict, list)):
+                                st.json(value, expanded=False)
+                            else:
+                                st.write(value)
+                    else:
+                        show_paginated(str(result_data), key="structured_output_page")
+
+            with tabs[2]:
+                st.markdown("### Performance Analysis")
+                execution_time = "N/A"
+                start_event = next(
+                    (log for log in st.session_state.live_logs if log.type == EventType.INFO),
+                    None,
+                )
+                end_event = next(
+                    (
+                        log
+                        for log in reversed(st.session_state.live_logs)
+                        if log.type == EventType.CREW_COMPLETE
+                    ),
+                    None,
+                )
+                if start_event and end_event:
+                    execution_time = f"{seconds_between(start_event, end_event):.2f} seconds"
+
+                st.metric("Execution Time", execution_time)
+                st.metric("Total Agents", len(agents_info))
+                st.metric("Log Entries", len(st.session_state.live_logs))
+                channel_stats = st.session_state.event_queue.stats()
+                st.metric(
+                    "Tool Events Coalesced",
+                    channel_stats["coalesced"],
+                    help=f"{channel_stats['dropped']} low-priority events dropped",
+                )
+                reused_tasks = st.session_state.crew_results.get("reused_tasks") or []
+                st.metric("Reused Task Results", len(reused_tasks))
+
+                show_usage(st.session_state.crew_results.get("usage") or {})
+                recording = st.session_state.crew_results.get("cassette") or {}
+                if recording:
+                    st.caption(
+                        f"Cassette {recording['mode']}: {os.path.basename(recording['path'])}, "
+                        f"{recording['llm_calls']} LLM and {recording['tool_calls']} tool calls"
+                        + (
+                            f", {recording['by_order']} matched by order, {recording['misses']} missing"
+                            if recording["mode"] == "replay"
+                            else ""
+                        )
+                    )
+                history = recent_runs()
+                if history:
+                    with st.expander("Run history"):
+                        st.dataframe(
+                            [
+                                {
+                                    "run": run.get("execution_id"),
+                                    "finished": run.get("finished_at"),
+                                    "status": run.get("status"),
+                                    "tokens": run["totals"]["prompt_tokens"]
+                                    + run["totals"]["completion_tokens"],
+                                    "tool calls": run["totals"]["tool_calls"],
+                                    "cost (USD)": round(run["totals"]["cost_usd"], 4),
+                                }
+                                for run in history
+                            ],
+                            use_container_width=True,
+                        )
 
-# Results Summary
-if st.session_state.crew_results:
-    st.markdown("## 📋 Final Results Summary")
+                tool_memo = st.session_state.crew_results.get("tool_memo") or {}
+                if tool_memo:
+                    st.markdown("#### File Tool Memo")
+                    memo_cols = st.columns(3)
+                    memo_cols[0].metric("Cache Hits", tool_memo.get("hits", 0))
+                    memo_cols[1].metric("Disk Reads", tool_memo.get("misses", 0))
+                    memo_cols[2].metric("Invalidations", tool_memo.get("invalidations", 0))
+
+                drafting = st.session_state.crew_results.get("drafting") or {}
+                if drafting.get("calls"):
+                    st.markdown("#### Speculative Drafting")
+                    draft_cols = st.columns(4)
+                    draft_cols[0].metric("Drafted Calls", drafting["calls"])
+                    draft_cols[1].metric("Accepted Drafts", drafting["accepted"])
+                    draft_cols[2].metric("Best Effort", drafting["best_effort"])
+                    draft_cols[3].metric(
+                        "Abandoned Drafts",
+                        drafting["abandoned"],
+                        help="Drafts still running when a winner was chosen. They finish "
+                        "within the latency budget and their results are discarded.",
+                    )
+
+                prompt_cache = st.session_state.crew_results.get("prompt_cache") or {}
+                if prompt_cache.get("calls"):
+                    st.markdown("#### Prompt Prefix Cache")
+                    cache_cols = st.columns(4)
+                    cache_cols[0].metric(
+                        "Prefix Hits",
+                        prompt_cache["prefix_hits"],
+                        help=f"{prompt_cache['prefix_misses']} misses, {prompt_cache['skipped']} skipped",
+                    )
+                    cache_cols[1].metric("Cached Input Tokens", prompt_cache["cached_tokens"])
+                    cache_cols[2].metric("Estimated Savings (USD)", f"{prompt_cache['saved_usd']:.4f}")
+                    cache_cols[3].metric(
+                        "Avg Latency, Cached Calls",
+                        f"{prompt_cache['avg_cached_call_seconds']:.2f}s",
+                        delta=f"{prompt_cache['avg_cached_call_seconds'] - prompt_cache['avg_first_call_seconds']:.2f}s vs first call",
+                        delta_color="inverse",
+                    )
+
+                hedging = st.session_state.crew_results.get("hedging") or {}
+                if hedging.get("calls"):
+                    st.markdown("#### Hedged LLM Calls")
+                    hedge_cols = st.columns(4)
+                    hedge_cols[0].metric("Hedges Sent", hedging["hedges"])
+                    hedge_cols[1].metric("Won by Hedge", hedging["hedge_wins"])
+                    hedge_cols[2].metric(
+                        "Timeouts", hedging["timeouts"], help=f"{hedging['retries']} retried"
+                    )
+                    hedge_cols[3].metric("Task SLO Breaches", hedging["slo_breaches"])
+
+                http_clients = (st.session_state.crew_results.get("http_pool") or {}).get("clients") or {}
+                if http_clients:
+                    st.markdown("#### HTTP Connection Pool")
+                    st.dataframe(
+                        [
+                            {
+                                "client": client,
+                                "requests": stats["requests"],
+                                "new connections": stats["new_connections"],
+                                "reuse rate": f"{stats['reuse_rate']:.0%}",
+                                "connect time (s)": round(stats["connect_seconds"], 2),
+                            }
+                            for client, stats in http_clients.items()
+                        ],
+                        use_container_width=True,
+                    )
+
+                model_routes = st.session_state.crew_results.get("model_routes") or {}
+                if model_routes:
+                    st.markdown("#### Model Routes")
+                    st.dataframe(
+                        [
+                            {
+                                "route / model": key,
+                                "calls": stats["calls"],
+                                "errors": stats["errors"],
+                                "fallbacks": stats["fallbacks"],
+                                "avg latency (s)": round(stats["avg_seconds"], 2),
+                                "tokens": stats["prompt_tokens"] + stats["completion_tokens"],
+                                "cost (USD)": round(stats["cost_usd"], 4),
+                            }
+                            for key, stats in model_routes.items()
+                        ],
+                        use_container_width=True,
+                    )
+
+                delegation = st.session_state.crew_results.get("delegation") or {}
+                if delegation:
+                    st.markdown("#### Delegation")
+                    st.dataframe(
+                        [{"route": route, **metrics} for route, metrics in delegation.items()],
+                        use_container_width=True,
+                    )
+
+                artifacts = st.session_state.crew_results.get("artifacts") or {}
+                if artifacts.get("artifacts") or artifacts.get("errors"):
+                    st.markdown("#### Artifacts")
+                    st.caption(f"Written to `{artifacts['directory']}`")
+                    st.dataframe(
+                        [
+                            {
+                                "path": artifact["path"],
+                                "bytes": artifact["bytes"],
+                                "sha256": artifact["sha256"],
+                            }
+                            for artifact in artifacts["artifacts"]
+                        ],
+                        use_container_width=True,
+                    )
+                    for error in artifacts["errors"]:
+                        st.warning(f"Could not write {error}")
+        else:
+            st.error(f"❌ {st.session_state.crew_results.get('error', 'Execution failed')}")
+            show_usage(st.session_state.crew_results.get("usage") or {})
 
-    if st.session_state.crew_results.get("success"):
-        tabs = st.tabs(["📊 Raw Output", "📁 Structured Data", "📈 Analysis"])
 
-        with tabs[0]:
-            st.markdown("### Complete Crew Output")
-            result_data = st.session_state.crew_results.get("result", {})
-            st.code(
-                json.dumps(result_data, indent=2)
-                if isinstance(result_data, dict)
-                else str(result_data),
-                language="json",
-            )
+with sweep_tab:
+    st.markdown("## 🧪 Compare Campaign Variants")
+    st.caption(
+        "Enter one value per line. Every combination is run; tasks that do not depend "
+        "on a varied input (e.g. market research for budgets) are computed once and shared."
+    )
+    sweep_cols = st.columns(3)
+    sweep_budgets = sweep_cols[0].text_area("Budgets", value=budget)
+    sweep_goals = sweep_cols[1].text_area("Primary Goals", value=primary_goal)
+    sweep_durations = sweep_cols[2].text_area("Campaign Durations", value=campaign_duration)
+
+    variations = {
+        name: [line.strip() for line in text.splitlines() if line.strip()]
+        for name, text in [
+            ("budget", sweep_budgets),
+            ("primary_goal", sweep_goals),
+            ("campaign_duration", sweep_durations),
+        ]
+    }
+    variant_count = 1
+    for values in variations.values():
+        variant_count *= max(1, len(values))
+
+    if st.session_state.sweep_running:
+        st.button("⏳ Sweep Running...", disabled=True, use_container_width=True)
+        try:
+            st.session_state.sweep_results = st.session_state.sweep_queue.get_nowait()
+            st.session_state.sweep_running = False
+            st.rerun()
+        except Empty:
+            if auto_refresh:
+                time.sleep(refresh_interval)
+                st.rerun()
+    elif st.button(f"🧪 Run Sweep ({variant_count} variants)", use_container_width=True):
+        st.session_state.sweep_results = {}
+        st.session_state.sweep_queue = Queue()
+        threading.Thread(
+            target=run_sweep_in_background,
+            args=(dict(campaign_inputs), variations, st.session_state.sweep_queue),
+            daemon=True,
+        ).start()
+        st.session_state.sweep_running = True
+        st.rerun()
 
-        with tabs[1]:
-            st.markdown("### Structured Results")
-            result_data = st.session_state.crew_results.get("result", {})
-            if isinstance(result_data, dict):
-                for key, value in result_data.items():
-                    st.markdown(f"**{key.replace('_', ' ').title()}:**")
-                    if isinstance(value, (dict, list)):
-                        st.json(value)
-                    else:
-                        st.write(value)
-            else:
-                st.write(result_data)
-
-        with tabs[2]:
-            st.markdown("### Performance Analysis")
-            execution_time = "N/A"
-            if st.session_state.live_logs:
-                start_time = None
-                end_time = None
-                for log in st.session_state.live_logs:
-                    if log.get("type") == "info" and "Starting" in log.get(
-                        "message", ""
-                    ):
-                        start_time = log.get("timestamp")
-                    elif log.get("type") == "crew_complete":
-                        end_time = log.get("timestamp")
-
-                if start_time and end_time:
-                    try:
-                        start_dt = datetime.fromisoformat(
-                            start_time.replace("Z", "+00:00")
+    sweep_results = st.session_state.sweep_results
+    if sweep_results and not sweep_results.get("success"):
+        st.error(f"Sweep failed: {sweep_results.get('error')}")
+    elif sweep_results:
+        stats = sweep_results["stats"]
+        stat_cols = st.columns(4)
+        stat_cols[0].metric("Variants", stats["variants"])
+        stat_cols[1].metric("Independent Task Runs", stats["independent_task_runs"])
+        stat_cols[2].metric("Task Runs Executed", stats["task_runs"])
+        stat_cols[3].metric("Reused From Cache", stats["reused_from_cache"])
+
+        task_names = [task_key for _, _, task_key in agents_info]
+        compare_task = st.selectbox(
+            "Compare output of",
+            task_names,
+            index=len(task_names) - 1,
+            format_func=lambda name: name.replace("_", " ").title(),
+        )
+        variants = sweep_results["variants"]
+        for row in range(0, len(variants), 3):
+            columns = st.columns(3)
+            for column, variant in zip(columns, variants[row : row + 3]):
+                with column:
+                    st.markdown(f"**{variant['label'] or 'Base inputs'}**")
+                    totals = (variant.get("usage") or {}).get("totals")
+                    if totals:
+                        st.caption(
+                            f"{totals['llm_calls']} LLM calls, ~${totals['cost_usd']:.4f}"
                         )
-                        end_dt = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
-                        duration = (end_dt - start_dt).total_seconds()
-                        execution_time = f"{duration:.2f} seconds"
-                    except:
-                        pass
-
-            st.metric("Execution Time", execution_time)
-            st.metric("Total Agents", len(agents_info))
-            st.metric("Log Entries", len(st.session_state.live_logs))
-    else:
-        pass
+                    if variant["error"]:
+                        st.error(variant["error"])
+                    output = variant["outputs"].get(compare_task)
+                    if output:
+                        with st.container(height=400):
+                            st.markdown(output)
+
 # Footer
 st.markdown("---")
 st.markdown(
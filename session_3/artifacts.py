@@ -0,0 +1,228 @@
+# artifacts.py
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import uuid
+import zipfile
+from datetime import datetime
+from queue import Queue
+from typing import Dict, Any, List, Optional
+
+# Run outputs land in <root>/<execution_id>/<path the agent asked for>
+ARTIFACTS_ROOT = os.getenv("CREW_ARTIFACTS_DIR", os.path.join(".crew_state", "runs"))
+
+# Queued after the last write to let the writer thread exit
+_STOP = object()
+
+
+def atomic_write(path: str, content: bytes):
+    """Write through a temp file in the same directory, then rename over the target"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ArtifactStore:
+    """
+    Run-scoped store for files the agents produce.
+
+    Each run writes below its own ``execution_id`` directory, so concurrent
+    runs using the same relative paths never overwrite each other. Writes
+    are queued to a background thread and land atomically (temp file plus
+    rename); reads of a queued path wait for that write only. ``close``
+    flushes the queue, stops the writer thread and returns a manifest with
+    every artifact's size and SHA-256; a later write starts a new writer.
+    """
+
+    def __init__(self, root: str = ARTIFACTS_ROOT):
+        self.root = os.path.abspath(root)
+        self.execution_id: Optional[str] = None
+        self._lock = threading.Condition()
+        self._queue: Queue = Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._pending: Dict[str, int] = {}
+        self._artifacts: Dict[str, Dict[str, Any]] = {}
+        self._errors: List[str] = []
+
+    def begin(self, execution_id: Optional[str] = None):
+        """Start a new run namespace; earlier writes are flushed first"""
+        self.flush()
+        with self._lock:
+            self.execution_id = execution_id or str(uuid.uuid4())
+            self._artifacts = {}
+            self._errors = []
+
+    @property
+    def run_dir(self) -> str:
+        if self.execution_id is None:
+            self.begin()
+        return os.path.join(self.root, self.execution_id)
+
+    def relative(self, path: str) -> str:
+        """The path an agent asked for, normalized and confined to the run"""
+        path = os.path.abspath(path)
+        if path.startswith(self.run_dir + os.sep):
+            return os.path.relpath(path, self.run_dir)
+        # Paths inside the working directory keep their layout; others keep their name
+        cwd = os.getcwd()
+        if path.startswith(cwd + os.sep):
+            return os.path.relpath(path, cwd)
+        return os.path.basename(path)
+
+    def path_for(self, path: str) -> str:
+        """Absolute location of an artifact inside the current run"""
+        return os.path.join(self.run_dir, self.relative(path))
+
+    def exists(self, path: str) -> bool:
+        target = self.path_for(path)
+        with self._lock:
+            return target in self._pending or os.path.exists(target)
+
+    def write(self, path: str, content: str) -> str:
+        """
+        Queue an artifact write and return immediately.
+
+        Args:
+            path: Path the agent asked for, relative to the working directory
+            content: Text to store
+
+        Returns:
+            str: Absolute path the artifact will have
+        """
+        target = self.path_for(path)
+        with self._lock:
+            self._pending[target] = self._pending.get(target, 0) + 1
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._drain, daemon=True)
+                self._writer.start()
+        self._queue.put((target, content))
+        return target
+
+    def resolve(self, path: str) -> str:
+        """
+        Where a read of ``path`` should go.
+
+        Returns the run's copy when it has one, waiting for a queued write
+        to land; otherwise the path itself.
+        """
+        target = self.path_for(path)
+        with self._lock:
+            self._lock.wait_for(
+                lambda: not any(
+                    p == target or p.startswith(target.rstrip(os.sep) + os.sep)
+                    for p in self._pending
+                )
+            )
+        return target if os.path.exists(target) else path
+
+    def flush(self):
+        """Block until every queued write has landed"""
+        self._queue.join()
+
+    def manifest(self) -> Dict[str, Any]:
+        """Artifacts written in the current run, with sizes and hashes"""
+        with self._lock:
+            return {
+                "execution_id": self.execution_id,
+                "directory": self.run_dir if self.execution_id else None,
+                "artifacts": sorted(self._artifacts.values(), key=lambda a: a["path"]),
+                "errors": list(self._errors),
+            }
+
+    def close(self) -> Dict[str, Any]:
+        """Flush pending writes, stop the writer and save the manifest next to the artifacts"""
+        self.flush()
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None and writer.is_alive():
+            self._queue.put(_STOP)
+            writer.join()
+        manifest = self.manifest()
+        if manifest["artifacts"] or manifest["errors"]:
+            atomic_write(
+                os.path.join(self.run_dir, "manifest.json"),
+                json.dumps(manifest, indent=2).encode("utf-8"),
+            )
+        return manifest
+
+    def bundle(self, outputs: Dict[str, str], result: Any = None) -> Optional[str]:
+        """
+        Zip the run's artifacts together with its structured outputs.
+
+        The bundle is built once per run and reused afterwards, so the
+        dashboard can stream it from disk on every rerun.
+
+        Args:
+            outputs: Raw output of each task, keyed by task name
+            result: Final crew result, stored as outputs.json alongside them
+
+        Returns:
+            Optional[str]: Path of bundle.zip, or None before any run started
+        """
+        if self.execution_id is None:
+            return None
+        path = os.path.join(self.run_dir, "bundle.zip")
+        if os.path.exists(path):
+            return path
+
+        manifest = self.close()
+        os.makedirs(self.run_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.run_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f, zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED) as zf:
+                for artifact in manifest["artifacts"]:
+                    zf.write(artifact["file"], os.path.join("artifacts", artifact["path"]))
+                for name, output in outputs.items():
+                    zf.writestr(os.path.join("outputs", f"{name}.md"), output or "")
+                zf.writestr(
+                    "outputs.json",
+                    json.dumps({"result": result, "tasks": outputs}, indent=2, default=str),
+                )
+                zf.writestr("manifest.json", json.dumps(manifest, indent=2))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+
+    def _drain(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            target, content = item
+            try:
+                data = content.encode("utf-8")
+                atomic_write(target, data)
+                with self._lock:
+                    self._artifacts[target] = {
+                        "path": os.path.relpath(target, self.run_dir),
+                        "file": target,
+                        "bytes": len(data),
+                        "sha256": hashlib.sha256(data).hexdigest(),
+                        "written_at": datetime.now().isoformat(),
+                    }
+            except Exception as e:
+                with self._lock:
+                    self._errors.append(f"{os.path.relpath(target, self.root)}: {e}")
+            finally:
+                with self._lock:
+                    self._pending[target] -= 1
+                    if not self._pending[target]:
+                        del self._pending[target]
+                    self._lock.notify_all()
+                self._queue.task_done()
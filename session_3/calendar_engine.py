@@ -0,0 +1,284 @@
+# calendar_engine.py
+
+import calendar
+import re
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from tool_memo import never_cache
+
+DEFAULT_STRATEGY_PATH = "resources/strategy/marketing_strategy.md"
+
+# Campaigns longer than a quarter (at most 92 days) get one row per week
+# instead of one per post. Counted in days, so the weekday a campaign starts
+# on cannot change its layout.
+SLOT_DAYS_MAX = 92
+
+# Channel name: (pattern found in a strategy, format, posts per week)
+CHANNELS: Dict[str, Tuple[str, str, int]] = {
+    "Blog": (r"\bblog", "Long-form article", 1),
+    "LinkedIn": (r"\blinked\s?in\b", "Professional post", 3),
+    "X/Twitter": (r"\btwitter\b|\bx\s*\(twitter\)|\bx\.com\b", "Short post or thread", 5),
+    "Instagram": (r"\binstagram\b|\breels?\b", "Carousel or reel", 3),
+    "Facebook": (r"\bfacebook\b", "Community post", 3),
+    "TikTok": (r"\btik\s?tok\b", "Short video", 3),
+    "YouTube": (r"\byou\s?tube\b", "Video", 1),
+    "Email": (r"\be-?mail\b|\bnewsletter", "Newsletter", 1),
+    "Webinar": (r"\bwebinars?\b", "Live session", 1),
+    "Podcast": (r"\bpodcasts?\b", "Episode", 1),
+}
+DEFAULT_CHANNELS = ["Blog", "LinkedIn", "Instagram", "Email"]
+
+_NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+}
+_DURATION = re.compile(
+    r"\b(\d+(?:\.\d+)?|" + "|".join(_NUMBER_WORDS) + r")\s*-?\s*(day|week|month|quarter|year)s?\b",
+    re.IGNORECASE,
+)
+
+
+def _add_months(start: date, months: int) -> date:
+    month = start.month - 1 + months
+    year, month = start.year + month // 12, month % 12 + 1
+    return date(year, month, min(start.day, calendar.monthrange(year, month)[1]))
+
+
+def campaign_end(start: date, duration: str) -> date:
+    """
+    Last day of a campaign described like "3 months" or "six weeks".
+
+    Raises:
+        ValueError: If the duration names no number of days, weeks, months,
+            quarters or years
+    """
+    match = _DURATION.search(duration or "")
+    if match is None:
+        raise ValueError(f"Cannot read a campaign duration from '{duration}', e.g. '3 months'")
+    amount, unit = match.group(1).lower(), match.group(2).lower()
+    count = float(_NUMBER_WORDS.get(amount, amount))
+    if unit == "day":
+        end = start + timedelta(days=round(count))
+    elif unit == "week":
+        end = start + timedelta(days=round(count * 7))
+    else:
+        months = count * {"month": 1, "quarter": 3, "year": 12}[unit]
+        end = _add_months(start, int(months)) + timedelta(days=round((months % 1) * 30))
+    return max(start, end - timedelta(days=1))
+
+
+def channels_from_strategy(strategy: str) -> List[str]:
+    """Channels a strategy mentions, in CHANNELS order; DEFAULT_CHANNELS when none"""
+    found = [
+        name
+        for name, (pattern, _, _) in CHANNELS.items()
+        if re.search(pattern, strategy or "", re.IGNORECASE)
+    ]
+    return found or list(DEFAULT_CHANNELS)
+
+
+def _channel(name: str) -> Tuple[str, str, int]:
+    """(name, format, posts per week) for a known or free-form channel name"""
+    for known, (pattern, content_format, per_week) in CHANNELS.items():
+        if name.lower() == known.lower() or re.search(pattern, name, re.IGNORECASE):
+            return known, content_format, per_week
+    return name, "Post", 1
+
+
+def _weekday_slots(per_week: int) -> List[int]:
+    """Weekdays (Monday=0) spreading ``per_week`` posts evenly from Monday to Friday"""
+    per_week = max(1, min(per_week, 7))
+    if per_week > 5:
+        return list(range(per_week))
+    if per_week == 1:
+        return [0]
+    return [round(i * 4 / (per_week - 1)) for i in range(per_week)]
+
+
+def build_calendar(
+    start: date,
+    duration: str,
+    channels: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Skeleton of a content calendar: weeks, publishing slots, channels and formats.
+
+    Weeks run Monday to Sunday, the first and last ones clipped to the
+    campaign. Each channel posts on fixed weekdays at its cadence, and at
+    least once in a clipped week that has a weekday left; a clipped week
+    with nothing to publish (e.g. a weekend start) is left out. Up to
+    SLOT_DAYS_MAX days, a quarter whichever day it starts on, every post
+    is a slot; longer campaigns get one row per week with the number of
+    posts per channel.
+
+    Args:
+        start: First day of the campaign
+        duration: Campaign length, e.g. "3 months"
+        channels: Channel names; DEFAULT_CHANNELS when omitted
+
+    Returns:
+        Dict[str, Any]: Campaign span, channels with cadence, and weeks with their slots
+    """
+    end = campaign_end(start, duration)
+    resolved = [_channel(name) for name in (channels or DEFAULT_CHANNELS)]
+    weeks = []
+    week_start = start - timedelta(days=start.weekday())
+    while week_start <= end:
+        days = [week_start + timedelta(days=offset) for offset in range(7)]
+        open_days = [day for day in days if start <= day <= end]
+        slots = []
+        for name, content_format, per_week in resolved:
+            dates = [day for day in open_days if day.weekday() in _weekday_slots(per_week)]
+            if not dates:
+                # A clipped week still gets the channel's post, on its first weekday
+                dates = [day for day in open_days if day.weekday() < 5][:1]
+            slots += [{"date": day, "channel": name, "format": content_format} for day in dates]
+        slots.sort(key=lambda slot: slot["date"])
+        week_start += timedelta(days=7)
+        if not slots:
+            continue
+        weeks.append(
+            {
+                "week": len(weeks) + 1,
+                "start": max(start, days[0]),
+                "end": min(end, days[-1]),
+                "slots": slots,
+            }
+        )
+    return {
+        "start": start,
+        "end": end,
+        "channels": [
+            {"channel": name, "format": content_format, "per_week": per_week}
+            for name, content_format, per_week in resolved
+        ],
+        "weeks": weeks,
+        "per_slot": (end - start).days + 1 <= SLOT_DAYS_MAX,
+    }
+
+
+def format_calendar(skeleton: Dict[str, Any]) -> str:
+    """Markdown table of a skeleton with empty Topic and Theme cells to fill in"""
+    channels = ", ".join(
+        f"{c['channel']} ({c['per_week']}/week)" for c in skeleton["channels"]
+    )
+    lines = [
+        f"Campaign {skeleton['start']:%Y-%m-%d} to {skeleton['end']:%Y-%m-%d}, "
+        f"{len(skeleton['weeks'])} week(s). Channels: {channels}.",
+        "",
+    ]
+    if skeleton["per_slot"]:
+        lines += [
+            "| Week | Date | Day | Channel | Format | Topic | Theme |",
+            "|---|---|---|---|---|---|---|",
+        ]
+        for week in skeleton["weeks"]:
+            for slot in week["slots"]:
+                lines.append(
+                    f"| {week['week']} | {slot['date']:%Y-%m-%d} | {slot['date']:%a} "
+                    f"| {slot['channel']} | {slot['format']} |  |  |"
+                )
+    else:
+        lines += [
+            "| Week | Dates | Posts | Key Theme | Topics |",
+            "|---|---|---|---|---|",
+        ]
+        for week in skeleton["weeks"]:
+            counts: Dict[str, int] = {}
+            for slot in week["slots"]:
+                counts[slot["channel"]] = counts.get(slot["channel"], 0) + 1
+            posts = ", ".join(f"{channel} x{n}" for channel, n in counts.items()) or "-"
+            lines.append(
+                f"| {week['week']} | {week['start']:%Y-%m-%d} to {week['end']:%Y-%m-%d} "
+                f"| {posts} |  |  |"
+            )
+    return "\n".join(lines)
+
+
+class ContentCalendarToolSchema(BaseModel):
+    """Input for ContentCalendarTool"""
+
+    start_date: str = Field(..., description="Campaign start date, YYYY-MM-DD")
+    campaign_duration: str = Field(..., description="Campaign length, e.g. '3 months'")
+    channels: str = Field(
+        default="",
+        description="Comma-separated channels; empty takes them from the marketing strategy",
+    )
+
+
+class ContentCalendarTool(BaseTool):
+    """
+    Lays out a content calendar's dates, channels and cadence locally.
+
+    Channels default to those the marketing strategy mentions, read
+    through the run's artifacts. Without a readable strategy the output
+    says so before falling back to DEFAULT_CHANNELS.
+    """
+
+    name: str = "Build content calendar skeleton"
+    description: str = (
+        "Returns the content calendar table for a campaign with every week, publishing date, "
+        "channel and format already laid out, derived from the start date, the duration and "
+        "the channels in the marketing strategy. Only the Topic and Theme cells are left "
+        "to fill in."
+    )
+    args_schema: Type[BaseModel] = ContentCalendarToolSchema
+    strategy_path: str = DEFAULT_STRATEGY_PATH
+    artifacts: Any = Field(default=None, exclude=True)
+    cache_function: Callable = never_cache
+
+    def _strategy(self) -> Optional[str]:
+        """The marketing strategy, or None when it cannot be read"""
+        path = self.strategy_path
+        if self.artifacts is not None:
+            path = self.artifacts.resolve(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _run(
+        self,
+        start_date: str,
+        campaign_duration: str,
+        channels: str = "",
+        **kwargs: Any,
+    ) -> str:
+        try:
+            start = datetime.strptime(start_date.strip(), "%Y-%m-%d").date()
+        except ValueError:
+            return f"Error: start_date must be YYYY-MM-DD, got '{start_date}'"
+        names = [c.strip() for c in channels.split(",") if c.strip()]
+        note = ""
+        if not names:
+            strategy = self._strategy()
+            if strategy is None:
+                note = (
+                    f"Note: the marketing strategy ({self.strategy_path}) could not be read, "
+                    f"so the default channels {', '.join(DEFAULT_CHANNELS)} are used. "
+                    "Pass `channels` to plan the strategy's channels instead.\n\n"
+                )
+            names = channels_from_strategy(strategy or "")
+        try:
+            return note + format_calendar(build_calendar(start, campaign_duration, names))
+        except ValueError as e:
+            return f"Error: {e}"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Content calendar skeleton")
+    parser.add_argument("start_date", help="YYYY-MM-DD")
+    parser.add_argument("duration", help="e.g. '3 months'")
+    parser.add_argument("--channels", default="", help="Comma-separated channels")
+    parser.add_argument("--strategy", help="Take the channels from this strategy file")
+    args = parser.parse_args()
+
+    tool = ContentCalendarTool(strategy_path=args.strategy or DEFAULT_STRATEGY_PATH)
+    print(tool._run(args.start_date, args.duration, args.channels))
@@ -0,0 +1,430 @@
+# cassettes.py
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, List, Literal, Optional, Tuple, Union
+
+from crewai import BaseLLM, Crew
+from crewai.utilities.exceptions.context_window_exceeding_exception import (
+    LLMContextLengthExceededException,
+)
+from crewai_tools import FileWriterTool
+from pydantic import BaseModel, Field
+
+from artifacts import atomic_write
+from model_routing import LLMWrapper, RoutedLLM, UsageCapture
+
+# Recorded runs land here unless a path is given
+CASSETTES_DIR = os.getenv("CREW_CASSETTES_DIR", os.path.join(".crew_state", "cassettes"))
+
+CASSETTE_VERSION = 1
+
+
+class CassetteConfig(BaseModel):
+    """How a run uses a cassette; passed to execute_crew as `cassette`"""
+
+    mode: Literal["record", "replay"] = Field(description="Record a live run or replay one")
+    path: Optional[str] = Field(
+        default=None, description="Cassette file; recordings default to CASSETTES_DIR"
+    )
+    time_scale: float = Field(
+        default=1.0,
+        description="Replayed calls take their recorded time multiplied by this; 0 replays instantly",
+    )
+
+
+class CassetteMissError(LookupError):
+    """Raised on replay when the run makes a call the cassette has no answer for"""
+
+
+class ReplayedError(RuntimeError):
+    """An error the recorded run got back from the LLM or a tool"""
+
+
+def list_cassettes(directory: str = CASSETTES_DIR) -> List[str]:
+    """Recorded cassettes, newest first"""
+    if not os.path.isdir(directory):
+        return []
+    paths = [
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith(".jsonl.gz")
+    ]
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return str(content)
+
+
+def _request_key(messages: Union[str, List[Dict[str, Any]]], tools: Optional[List[dict]]) -> str:
+    # Cache markers added by PrefixCachingLLM do not change what was asked
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    request = [(m.get("role"), _text(m.get("content", ""))) for m in messages]
+    return _hash(json.dumps([request, tools], sort_keys=True, default=str))
+
+
+def _tool_key(tool_name: str, args: Tuple, kwargs: Dict[str, Any]) -> str:
+    return _hash(json.dumps([tool_name, list(args), kwargs], sort_keys=True, default=str))
+
+
+def _llm_stream(from_task: Any, from_agent: Any) -> str:
+    agent = from_agent or getattr(from_task, "agent", None)
+    role = (getattr(agent, "role", None) or "").strip()
+    return f"llm:{role}/{getattr(from_task, 'name', None) or ''}"
+
+
+class Cassette:
+    """
+    Every LLM and tool call of one crew run, recorded or replayed.
+
+    Recording wraps the crew's routed LLMs (below metering, prompt caching
+    and drafting, so each request that would reach a provider is captured)
+    and its tools, and saves requests, responses, token usage, errors and
+    timings to a gzipped JSON-lines file. Prompt messages repeat heavily
+    between iterations, so each distinct message is stored once and calls
+    refer to it by hash.
+
+    Replaying serves the same calls back without touching a provider or
+    the network. A call is matched by a hash of its request; failing that
+    (e.g. the prompt carries a different date), by its position among the
+    calls of the same agent and task, or of the same tool. Replayed calls
+    take their recorded time scaled by ``time_scale``, and report the
+    recorded token usage, so metering and the dashboard see the original
+    run. File writes still happen so the run's artifacts exist.
+    """
+
+    def __init__(self, config: CassetteConfig, execution_id: Optional[str] = None):
+        self.config = config
+        self.mode = config.mode
+        self.path = config.path or os.path.join(
+            CASSETTES_DIR, f"{execution_id or datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl.gz"
+        )
+        self.header: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._blobs: Dict[str, str] = {}
+        self._calls: List[Dict[str, Any]] = []
+        self._used: List[bool] = []
+        self._by_key: Dict[str, Deque[int]] = {}
+        self._by_stream: Dict[str, Deque[int]] = {}
+        self._wrapped: List[Tuple[LLMWrapper, RoutedLLM]] = []
+        self._patched: List[Any] = []
+        self._stats = {"llm_calls": 0, "tool_calls": 0, "matched": 0, "by_order": 0, "misses": 0}
+        if self.mode == "replay":
+            self._load()
+
+    # Recording
+
+    def _blob(self, text: str) -> str:
+        # Caller holds the lock
+        blob_id = _hash(text)
+        self._blobs.setdefault(blob_id, text)
+        return blob_id
+
+    def _record(self, call: Dict[str, Any], texts: Dict[str, Any]):
+        with self._lock:
+            for field, value in texts.items():
+                if isinstance(value, list):
+                    call[field] = [self._blob(v) for v in value]
+                elif value is not None:
+                    call[field] = self._blob(value)
+            self._calls.append(call)
+            self._stats[f"{call['kind']}_calls"] += 1
+
+    def save(self) -> str:
+        """Write the recording; returns its path"""
+        with self._lock:
+            lines = [
+                {"kind": "header", "version": CASSETTE_VERSION, **self.header},
+                *({"kind": "blob", "id": k, "text": v} for k, v in self._blobs.items()),
+                *self._calls,
+            ]
+        data = "\n".join(json.dumps(line, default=str) for line in lines) + "\n"
+        atomic_write(os.path.abspath(self.path), gzip.compress(data.encode("utf-8")))
+        return self.path
+
+    # Replaying
+
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                kind = entry.pop("kind")
+                if kind == "header":
+                    self.header = entry
+                elif kind == "blob":
+                    self._blobs[entry["id"]] = entry["text"]
+                else:
+                    entry["kind"] = kind
+                    index = len(self._calls)
+                    self._calls.append(entry)
+                    self._by_key.setdefault(entry["key"], deque()).append(index)
+                    self._by_stream.setdefault(entry["stream"], deque()).append(index)
+        self._used = [False] * len(self._calls)
+
+    def _next(self, queue: Optional[Deque[int]]) -> Optional[int]:
+        # Caller holds the lock
+        while queue:
+            index = queue.popleft()
+            if not self._used[index]:
+                self._used[index] = True
+                return index
+        return None
+
+    def _take(self, key: str, stream: str, describe: str) -> Dict[str, Any]:
+        with self._lock:
+            index = self._next(self._by_key.get(key))
+            counter = "matched"
+            if index is None:
+                index = self._next(self._by_stream.get(stream))
+                counter = "by_order"
+            if index is None:
+                self._stats["misses"] += 1
+                raise CassetteMissError(f"{self.path} has no recorded answer for {describe}")
+            self._stats[counter] += 1
+            call = self._calls[index]
+            self._stats[f"{call['kind']}_calls"] += 1
+        if call.get("seconds") and self.config.time_scale > 0:
+            time.sleep(call["seconds"] * self.config.time_scale)
+        return call
+
+    def _raise_recorded(self, call: Dict[str, Any]):
+        error_type, message = call["error_type"], self._blobs.get(call["error"], "")
+        if error_type == LLMContextLengthExceededException.__name__:
+            # The agent recovers from this one by summarizing, as it did live
+            raise LLMContextLengthExceededException(message)
+        raise ReplayedError(f"{error_type}: {message}")
+
+    # Calls
+
+    def llm_call(
+        self,
+        inner: RoutedLLM,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]],
+        callbacks: Optional[List[Any]],
+        available_functions: Optional[Dict[str, Any]],
+        from_task: Optional[Any],
+        from_agent: Optional[Any],
+    ) -> Union[str, Any]:
+        key = _request_key(messages, tools)
+        stream = _llm_stream(from_task, from_agent)
+
+        if self.mode == "replay":
+            call = self._take(key, stream, f"an LLM call from {stream}")
+            usage = SimpleNamespace(
+                prompt_tokens=call["usage"]["prompt_tokens"],
+                completion_tokens=call["usage"]["completion_tokens"],
+                prompt_tokens_details=SimpleNamespace(cached_tokens=call["usage"]["cached_tokens"]),
+            )
+            for callback in callbacks or []:
+                if isinstance(callback, UsageCapture):
+                    callback.log_success_event({"model": call["model"]}, {"usage": usage}, None, None)
+            if "error" in call:
+                self._raise_recorded(call)
+            return self._blobs[call["response"]]
+
+        usage = UsageCapture()
+        started = time.perf_counter()
+        result: Any = None
+        error: Optional[Exception] = None
+        try:
+            result = inner.call(
+                messages,
+                tools=tools,
+                callbacks=list(callbacks or []) + [usage],
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+            )
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            call = {
+                "kind": "llm",
+                "key": key,
+                "stream": stream,
+                "model": usage.model or inner.model,
+                "usage": {
+                    "prompt_tokens": usage.prompt_tokens,
+                    "completion_tokens": usage.completion_tokens,
+                    "cached_tokens": usage.cached_tokens,
+                },
+                "offset": started - self._started,
+                "seconds": time.perf_counter() - started,
+            }
+            if isinstance(messages, str):
+                messages = [{"role": "user", "content": messages}]
+            texts: Dict[str, Any] = {
+                "messages": [json.dumps(m, sort_keys=True, default=str) for m in messages]
+            }
+            if error is not None:
+                call["error_type"] = type(error).__name__
+                texts["error"] = str(error)
+            else:
+                texts["response"] = result if isinstance(result, str) else json.dumps(result, default=str)
+            self._record(call, texts)
+
+    def tool_call(self, tool: Any, run: Any, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+        key = _tool_key(tool.name, args, kwargs)
+        stream = f"tool:{tool.name}"
+
+        if self.mode == "replay" and not isinstance(tool, FileWriterTool):
+            call = self._take(key, stream, f"{tool.name} called with {kwargs or args}")
+            if "error" in call:
+                self._raise_recorded(call)
+            return self._blobs[call["result"]]
+
+        started = time.perf_counter()
+        result: Any = None
+        error: Optional[Exception] = None
+        try:
+            result = run(*args, **kwargs)
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if self.mode == "record":
+                call = {
+                    "kind": "tool",
+                    "key": key,
+                    "stream": stream,
+                    "tool": tool.name,
+                    "args": json.loads(json.dumps([list(args), kwargs], default=str)),
+                    "offset": started - self._started,
+                    "seconds": time.perf_counter() - started,
+                }
+                if error is not None:
+                    call["error_type"] = type(error).__name__
+                    texts = {"error": str(error)}
+                else:
+                    texts = {"result": str(result)}
+                self._record(call, texts)
+
+    # Crew wiring
+
+    def attach(self, crew: Crew, inputs: Optional[Dict[str, Any]] = None):
+        """
+        Route a crew's LLM and tool calls through the cassette.
+
+        Args:
+            crew: The crew about to run; ``close`` undoes the wiring
+            inputs: Run inputs, saved with a recording so it can be replayed
+        """
+        if self.mode == "record":
+            self.header = {
+                "recorded_at": datetime.now().isoformat(),
+                "inputs": inputs or {},
+            }
+        llms = [crew_agent.llm for crew_agent in crew.agents] + [crew.planning_llm]
+        for llm in llms:
+            # The routed LLM sits innermost, under metering, drafting and caching
+            while isinstance(llm, LLMWrapper) and not isinstance(llm.inner, (RoutedLLM, CassetteLLM)):
+                llm = llm.inner
+            if isinstance(llm, LLMWrapper) and isinstance(llm.inner, RoutedLLM):
+                self._wrapped.append((llm, llm.inner))
+                llm.inner = CassetteLLM(llm.inner, self)
+
+        for crew_agent in crew.agents:
+            for tool in crew_agent.tools or []:
+                if "_run" in tool.__dict__:
+                    continue
+                run = tool._run
+                # Instance attribute: crewai converts the tool with func=tool._run
+                object.__setattr__(
+                    tool, "_run", lambda *a, _tool=tool, _run=run, **k: self.tool_call(_tool, _run, a, k)
+                )
+                self._patched.append(tool)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            unused = self._used.count(False) if self.mode == "replay" else 0
+            return {
+                "mode": self.mode,
+                "path": self.path,
+                "time_scale": self.config.time_scale,
+                **self._stats,
+                "unused": unused,
+                "distinct_messages": len(self._blobs),
+                "seconds": time.perf_counter() - self._started,
+            }
+
+    def close(self) -> Dict[str, Any]:
+        """Undo ``attach``, save a recording, and return the cassette's counters"""
+        for parent, routed in self._wrapped:
+            parent.inner = routed
+        self._wrapped = []
+        for tool in self._patched:
+            del tool.__dict__["_run"]
+        self._patched = []
+        if self.mode == "record":
+            self.save()
+        return self.summary()
+
+
+class CassetteLLM(LLMWrapper):
+    """Sends calls through a cassette instead of straight to the routed LLM"""
+
+    def __init__(self, inner: BaseLLM, cassette: Cassette):
+        super().__init__(inner)
+        self.cassette = cassette
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Union[str, Any]:
+        self.inner.stop = self.stop
+        return self.cassette.llm_call(
+            self.inner, messages, tools, callbacks, available_functions, from_task, from_agent
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+    from queue import Queue
+
+    from runner import execute_crew
+
+    parser = argparse.ArgumentParser(description="Replay a recorded crew run offline")
+    parser.add_argument("path", help="Cassette to replay")
+    parser.add_argument(
+        "--time-scale", type=float, default=0.0, help="1 replays at the recorded pace"
+    )
+    args = parser.parse_args()
+
+    with gzip.open(args.path, "rt", encoding="utf-8") as f:
+        recorded_inputs = json.loads(f.readline())["inputs"]
+    result_queue: Queue = Queue()
+    started = time.perf_counter()
+    execute_crew(
+        recorded_inputs,
+        Queue(),
+        result_queue,
+        cassette={"mode": "replay", "path": args.path, "time_scale": args.time_scale},
+    )
+    outcome = result_queue.get()
+    print(json.dumps(outcome.get("cassette") or {"error": outcome.get("error")}, indent=2))
+    print(f"Replayed in {time.perf_counter() - started:.2f}s")
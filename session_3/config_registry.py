@@ -0,0 +1,204 @@
+# config_registry.py
+
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+import yaml
+from pydantic import ValidationError
+
+from delegation import DelegationLimits
+from hedging import TaskLatencyConfig
+from speculative import DraftingConfig
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config")
+
+# Same placeholder syntax crewai interpolates
+_PLACEHOLDER = re.compile(r"\{([A-Za-z_][A-Za-z0-9_\-]*)\}")
+
+_FILES = ("agents.yaml", "tasks.yaml", "inputs.yaml", "models.yaml")
+_AGENT_TEXT = ("role", "goal", "backstory")
+_TASK_TEXT = ("description", "expected_output", "output_file")
+
+
+class ConfigValidationError(ValueError):
+    """Raised when the crew configuration or run inputs are invalid"""
+
+    def __init__(self, problems: List[str]):
+        self.problems = problems
+        super().__init__(
+            "Invalid crew configuration:\n" + "\n".join(f"- {p}" for p in problems)
+        )
+
+
+def _signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def validate_config(
+    agents: Dict[str, Any],
+    tasks: Dict[str, Any],
+    inputs: Dict[str, Any],
+    models: Dict[str, Any],
+) -> List[str]:
+    """
+    Check agent and task configuration against each other and the input schema.
+
+    Returns:
+        List[str]: Problems found; empty when the configuration is valid
+    """
+    problems: List[str] = []
+    declared = set(inputs)
+    routes = set((models.get("routes") or {}).keys())
+
+    def check_placeholders(where: str, text: Any):
+        for name in _PLACEHOLDER.findall(str(text or "")):
+            if name not in declared:
+                problems.append(f"{where} uses {{{name}}}, which is not declared in inputs.yaml")
+
+    for name, agent in agents.items():
+        if not isinstance(agent, dict):
+            problems.append(f"agent '{name}' must be a mapping")
+            continue
+        for field in _AGENT_TEXT:
+            if not agent.get(field):
+                problems.append(f"agent '{name}' is missing '{field}'")
+            check_placeholders(f"agent '{name}' {field}", agent.get(field))
+        if agent.get("llm_route") and agent["llm_route"] not in routes:
+            problems.append(f"agent '{name}' uses unknown llm_route '{agent['llm_route']}'")
+        if "delegation_limits" in agent:
+            try:
+                DelegationLimits(**(agent["delegation_limits"] or {}))
+            except (TypeError, ValidationError) as e:
+                problems.append(f"agent '{name}' has invalid delegation_limits: {e}")
+
+    seen_tasks: List[str] = []
+    for name, task in tasks.items():
+        if not isinstance(task, dict):
+            problems.append(f"task '{name}' must be a mapping")
+            continue
+        for field in _TASK_TEXT:
+            if field != "output_file" and not task.get(field):
+                problems.append(f"task '{name}' is missing '{field}'")
+            check_placeholders(f"task '{name}' {field}", task.get(field))
+        if task.get("agent") and task["agent"] not in agents:
+            problems.append(f"task '{name}' references unknown agent '{task['agent']}'")
+        for context_name in task.get("context") or []:
+            if context_name not in tasks:
+                problems.append(f"task '{name}' has unknown context task '{context_name}'")
+            elif context_name not in seen_tasks:
+                problems.append(f"task '{name}' has context task '{context_name}' that runs after it")
+        if task.get("llm_route") and task["llm_route"] not in routes:
+            problems.append(f"task '{name}' uses unknown llm_route '{task['llm_route']}'")
+        if "drafting" in task:
+            try:
+                DraftingConfig(**(task["drafting"] or {}))
+            except (TypeError, ValidationError) as e:
+                problems.append(f"task '{name}' has invalid drafting settings: {e}")
+        if "latency" in task:
+            try:
+                TaskLatencyConfig(**(task["latency"] or {}))
+            except (TypeError, ValidationError) as e:
+                problems.append(f"task '{name}' has invalid latency settings: {e}")
+        seen_tasks.append(name)
+
+    return problems
+
+
+class ConfigRegistry:
+    """
+    Parses, validates and caches the crew's YAML configuration.
+
+    Files are parsed once and re-read only when their mtime or size
+    changes, so building a crew costs a stat per file instead of a YAML
+    parse. Every (re)load validates the whole configuration directory,
+    which surfaces undeclared placeholders and broken references when the
+    crew is built rather than partway through a run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signatures: Dict[str, Dict[str, Optional[Tuple[int, int]]]] = {}
+        self._configs: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.reloads = 0
+
+    def configs(self, config_dir: str = CONFIG_DIR) -> Dict[str, Dict[str, Any]]:
+        """
+        The validated configuration files of a directory, keyed by file name.
+
+        Raises:
+            ConfigValidationError: If the configuration is invalid
+        """
+        config_dir = os.path.abspath(config_dir)
+        signatures = {name: _signature(os.path.join(config_dir, name)) for name in _FILES}
+        with self._lock:
+            if self._signatures.get(config_dir) != signatures:
+                configs = {}
+                for name in _FILES:
+                    path = os.path.join(config_dir, name)
+                    if signatures[name] is None:
+                        configs[name] = {}
+                        continue
+                    with open(path, "r", encoding="utf-8") as f:
+                        configs[name] = yaml.safe_load(f) or {}
+                problems = validate_config(
+                    configs["agents.yaml"],
+                    configs["tasks.yaml"],
+                    configs["inputs.yaml"],
+                    configs["models.yaml"],
+                )
+                if problems:
+                    raise ConfigValidationError(problems)
+                self._configs[config_dir] = configs
+                self._signatures[config_dir] = signatures
+                self.reloads += 1
+            return self._configs[config_dir]
+
+    def load_yaml(self, config_path: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Drop-in for CrewBase.load_yaml.
+
+        Returns a copy because CrewBase replaces names in the loaded
+        configuration with the objects they refer to.
+        """
+        config_path = Path(config_path)
+        if not config_path.exists():
+            raise FileNotFoundError(config_path)
+        configs = self.configs(str(config_path.parent))
+        return copy.deepcopy(configs[config_path.name])
+
+    def version(self, config_dir: str = CONFIG_DIR) -> str:
+        """Hash of the parsed configuration; changes whenever any file's content does"""
+        configs = self.configs(config_dir)
+        return hashlib.sha256(
+            json.dumps(configs, sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+
+    def validate_inputs(self, inputs: Dict[str, Any], config_dir: str = CONFIG_DIR):
+        """
+        Check run inputs against inputs.yaml before anything is spent on a run.
+
+        Raises:
+            ConfigValidationError: If required inputs are missing or empty
+        """
+        schema = self.configs(config_dir)["inputs.yaml"]
+        missing = [
+            name
+            for name, spec in schema.items()
+            if (spec or {}).get("required") and not str(inputs.get(name) or "").strip()
+        ]
+        if missing:
+            raise ConfigValidationError([f"missing required input '{name}'" for name in missing])
+
+
+# Shared by every crew built in this process
+config_registry = ConfigRegistry()
@@ -1,17 +1,28 @@
 from typing import List
 import os
-from crewai import Agent, Crew, Process, Task, LLM
+from crewai import Agent, Crew, Process, Task
 from langchain_openai import AzureChatOpenAI
 from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import (
-    SerperDevTool,
-    ScrapeWebsiteTool,
-    DirectoryReadTool,
-    FileWriterTool,
-    FileReadTool,
-)
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
+from artifacts import ArtifactStore
+from calendar_engine import ContentCalendarTool
+from config_registry import config_registry
+from iteration_controller import IterationController
+from metering import MeteredLLM, UsageLedger
+from model_routing import ModelRouter, RouteStats
+from hedging import HedgedLLM, HedgingStats, load_hedging_config
+from http_pool import PooledScrapeWebsiteTool, PooledSerperDevTool
+from seo_analyzer import SeoAnalyzerTool
+from prompt_cache import PrefixCachingLLM, PromptCacheStats, load_prompt_cache_config
+from speculative import DraftingStats, SpeculativeLLM
+from delegation import DelegationGuard, GuardedAgent
+from tool_memo import (
+    ToolMemo,
+    MemoDirectoryReadTool,
+    MemoFileWriterTool,
+    MemoFileReadTool,
+)
 
 load_dotenv()
 
@@ -23,10 +34,12 @@ load_dotenv()
 #     temperature=0.7,
 # )
 
-llm = LLM(
-    model="gemini/gemini-2.0-flash",
-    temperature=0.7,
-)
+# Model routes and fallback chains from config/models.yaml
+model_router = ModelRouter()
+
+
+# Watches agent steps for loops and adapts max_iter from previous runs
+iteration_controller = IterationController()
 
 
 class Content(BaseModel):
@@ -47,112 +60,211 @@ class TheMarketingCrew:
     agents_config = "config/agents.yaml"
     tasks_config = "config/tasks.yaml"
 
+    def __init__(self):
+        # Delegation limits, answer cache and timing for this crew's runs
+        self.delegation_guard = DelegationGuard()
+        # File reads and listings memoized until the file changes
+        self.tool_memo = ToolMemo()
+        # Files the agents write, namespaced per run and written off the agent loop
+        self.artifacts = ArtifactStore()
+        # Calls, latency and cost per route and model of this crew's agents
+        self.route_stats = RouteStats()
+        # Hedges, timeouts and latency objective breaches of this crew's calls
+        self.hedging_stats = HedgingStats()
+        # Best-of-N redrafts of this crew's final answers
+        self.drafting_stats = DraftingStats()
+        # Prompt prefix reuse across this crew's agents
+        self.prompt_cache_stats = PromptCacheStats()
+        # Tokens, tool calls and estimated cost per run, agent and task
+        self.usage_ledger = UsageLedger(
+            model_router.pricing,
+            model_router.tool_pricing,
+            load_prompt_cache_config(model_router.prompt_cache).cached_input_discount,
+        )
+
+    def _llm(self, agent_name: str):
+        """
+        LLM on the agent's `llm_route`, honouring per-task routes.
+
+        The agent's stable prompt prefix is cached across its iterations, and
+        tasks with a `drafting` block can be drafted best-of-N once
+        speculative drafting is enabled for the crew. Every call, drafts
+        included, runs under a hedging deadline and is metered into the
+        crew's usage ledger.
+        """
+        routed = model_router.llm(
+            self.agents_config[agent_name].get("llm_route"), self.tasks_config, self.route_stats
+        )
+        cached = PrefixCachingLLM(
+            routed,
+            load_prompt_cache_config(model_router.prompt_cache),
+            model_router.pricing,
+            self.prompt_cache_stats,
+        )
+        hedged = HedgedLLM(
+            cached,
+            load_hedging_config(model_router.hedging),
+            self.tasks_config,
+            self.hedging_stats,
+        )
+        drafted = SpeculativeLLM(hedged, self.tasks_config, self.drafting_stats)
+        return MeteredLLM(drafted, self.usage_ledger)
+
     @agent
     def market_research_agent(self) -> Agent:
-        return Agent(
-            config=self.agents_config["market_research_agent"],
-            tools=[
-                SerperDevTool(),
-                DirectoryReadTool("resources"),
-                FileWriterTool(),
-                FileReadTool(),
-            ],
-            reasoning=True,
-            inject_date=True,
-            llm=llm,
-            allow_delegation=True,
-            max_iter=5,
-            max_rpm=3,
+        return iteration_controller.attach(
+            GuardedAgent(
+                config=self.agents_config["market_research_agent"],
+                tools=[
+                    PooledSerperDevTool(),
+                    MemoDirectoryReadTool(
+                        "resources", memo=self.tool_memo, artifacts=self.artifacts
+                    ),
+                    MemoFileWriterTool(memo=self.tool_memo, artifacts=self.artifacts),
+                    MemoFileReadTool(memo=self.tool_memo, artifacts=self.artifacts),
+                ],
+                reasoning=True,
+                inject_date=True,
+                llm=self._llm("market_research_agent"),
+                allow_delegation=True,
+                delegation_guard=self.delegation_guard,
+                max_iter=iteration_controller.budget("market_research_agent", 5),
+                max_rpm=3,
+            ),
+            "market_research_agent",
         )
 
     @agent
     def marketing_strategy_agent(self) -> Agent:
-        return Agent(
-            config=self.agents_config["marketing_strategy_agent"],
-            tools=[
-                SerperDevTool(),
-                ScrapeWebsiteTool(),
-                DirectoryReadTool("resources/research"),
-                FileWriterTool(),
-                FileReadTool(),
-            ],
-            reasoning=True,
-            inject_date=True,
-            llm=llm,
-            allow_delegation=True,
-            max_rpm=3,
+        return iteration_controller.attach(
+            GuardedAgent(
+                config=self.agents_config["marketing_strategy_agent"],
+                tools=[
+                    PooledSerperDevTool(),
+                    PooledScrapeWebsiteTool(),
+                    MemoDirectoryReadTool(
+                        "resources/research",
+                        memo=self.tool_memo,
+                        artifacts=self.artifacts,
+                    ),
+                    MemoFileWriterTool(memo=self.tool_memo, artifacts=self.artifacts),
+                    MemoFileReadTool(memo=self.tool_memo, artifacts=self.artifacts),
+                ],
+                reasoning=True,
+                inject_date=True,
+                llm=self._llm("marketing_strategy_agent"),
+                allow_delegation=True,
+                delegation_guard=self.delegation_guard,
+                max_iter=iteration_controller.budget("marketing_strategy_agent", 10),
+                max_rpm=3,
+            ),
+            "marketing_strategy_agent",
         )
 
     @agent
     def content_calendar_agent(self) -> Agent:
-        return Agent(
-            config=self.agents_config["content_calendar_agent"],
-            tools=[
-                # SerperDevTool(),
-                # ScrapeWebsiteTool(),
-                DirectoryReadTool("resources/strategy"),
-                FileWriterTool(),
-                FileReadTool(),
-            ],
-            inject_date=True,
-            llm=llm,
-            allow_delegation=True,
-            max_iter=5,
-            max_rpm=3,
+        return iteration_controller.attach(
+            GuardedAgent(
+                config=self.agents_config["content_calendar_agent"],
+                tools=[
+                    # PooledSerperDevTool(),
+                    # PooledScrapeWebsiteTool(),
+                    MemoDirectoryReadTool(
+                        "resources/strategy",
+                        memo=self.tool_memo,
+                        artifacts=self.artifacts,
+                    ),
+                    MemoFileWriterTool(memo=self.tool_memo, artifacts=self.artifacts),
+                    MemoFileReadTool(memo=self.tool_memo, artifacts=self.artifacts),
+                    ContentCalendarTool(artifacts=self.artifacts),
+                ],
+                inject_date=True,
+                llm=self._llm("content_calendar_agent"),
+                allow_delegation=True,
+                delegation_guard=self.delegation_guard,
+                max_iter=iteration_controller.budget("content_calendar_agent", 5),
+                max_rpm=3,
+            ),
+            "content_calendar_agent",
         )
 
     @agent
     def content_writer_agent(self) -> Agent:
-        return Agent(
-            config=self.agents_config["content_writer_agent"],
-            tools=[
-                # SerperDevTool(),
-                # ScrapeWebsiteTool(),
-                DirectoryReadTool("resources/calendar"),
-                FileWriterTool(),
-                FileReadTool(),
-            ],
-            inject_date=True,
-            llm=llm,
-            allow_delegation=True,
-            max_iter=5,
-            max_rpm=3,
+        return iteration_controller.attach(
+            GuardedAgent(
+                config=self.agents_config["content_writer_agent"],
+                tools=[
+                    # PooledSerperDevTool(),
+                    # PooledScrapeWebsiteTool(),
+                    MemoDirectoryReadTool(
+                        "resources/calendar",
+                        memo=self.tool_memo,
+                        artifacts=self.artifacts,
+                    ),
+                    MemoFileWriterTool(memo=self.tool_memo, artifacts=self.artifacts),
+                    MemoFileReadTool(memo=self.tool_memo, artifacts=self.artifacts),
+                ],
+                inject_date=True,
+                llm=self._llm("content_writer_agent"),
+                allow_delegation=True,
+                delegation_guard=self.delegation_guard,
+                max_iter=iteration_controller.budget("content_writer_agent", 5),
+                max_rpm=3,
+            ),
+            "content_writer_agent",
         )
 
     @agent
     def seo_specialist_agent(self) -> Agent:
-        return Agent(
-            config=self.agents_config["seo_specialist_agent"],
-            tools=[
-                # SerperDevTool(),
-                # ScrapeWebsiteTool(),
-                DirectoryReadTool("resources/content"),
-                FileWriterTool(),
-                FileReadTool(),
-            ],
-            inject_date=True,
-            llm=llm,
-            allow_delegation=True,
-            max_iter=5,
-            max_rpm=3,
+        return iteration_controller.attach(
+            GuardedAgent(
+                config=self.agents_config["seo_specialist_agent"],
+                tools=[
+                    # PooledSerperDevTool(),
+                    # PooledScrapeWebsiteTool(),
+                    MemoDirectoryReadTool(
+                        "resources/content",
+                        memo=self.tool_memo,
+                        artifacts=self.artifacts,
+                    ),
+                    MemoFileWriterTool(memo=self.tool_memo, artifacts=self.artifacts),
+                    MemoFileReadTool(memo=self.tool_memo, artifacts=self.artifacts),
+                    SeoAnalyzerTool(memo=self.tool_memo, artifacts=self.artifacts),
+                ],
+                inject_date=True,
+                llm=self._llm("seo_specialist_agent"),
+                allow_delegation=True,
+                delegation_guard=self.delegation_guard,
+                max_iter=iteration_controller.budget("seo_specialist_agent", 5),
+                max_rpm=3,
+            ),
+            "seo_specialist_agent",
         )
 
     @agent
     def social_script_agent(self) -> Agent:
-        return Agent(
-            config=self.agents_config["social_script_agent"],
-            tools=[
-                # SerperDevTool(),
-                # ScrapeWebsiteTool(),
-                DirectoryReadTool("resources/content"),
-                FileWriterTool(),
-                FileReadTool(),
-            ],
-            inject_date=True,
-            llm=llm,
-            allow_delegation=True,
-            max_iter=5,
-            max_rpm=3,
+        return iteration_controller.attach(
+            GuardedAgent(
+                config=self.agents_config["social_script_agent"],
+                tools=[
+                    # PooledSerperDevTool(),
+                    # PooledScrapeWebsiteTool(),
+                    MemoDirectoryReadTool(
+                        "resources/content",
+                        memo=self.tool_memo,
+                        artifacts=self.artifacts,
+                    ),
+                    MemoFileWriterTool(memo=self.tool_memo, artifacts=self.artifacts),
+                    MemoFileReadTool(memo=self.tool_memo, artifacts=self.artifacts),
+                ],
+                inject_date=True,
+                llm=self._llm("social_script_agent"),
+                allow_delegation=True,
+                delegation_guard=self.delegation_guard,
+                max_iter=iteration_controller.budget("social_script_agent", 5),
+                max_rpm=3,
+            ),
+            "social_script_agent",
         )
 
     @task
@@ -226,10 +338,17 @@ class TheMarketingCrew:
             process=Process.sequential,
             verbose=True,
             planning=True,
-            planning_llm=llm,
+            planning_llm=MeteredLLM(
+                model_router.llm("planning", stats=self.route_stats), self.usage_ledger
+            ),
         )
 
 
+# Read agent and task configs through the registry: parsed and validated
+# once, reparsed only when a file under config/ changes
+TheMarketingCrew.load_yaml = staticmethod(config_registry.load_yaml)
+
+
 if __name__ == "__main__":
     from datetime import datetime
 
@@ -242,6 +361,7 @@ if __name__ == "__main__":
         "industry": "Business Software",
         "campaign_duration": "3 months",
         "primary_goal": "Lead generation and brand awareness",
+        "location": "India",
     }
 
     crew = TheMarketingCrew()
@@ -0,0 +1,201 @@
+# event_channel.py
+
+import os
+import threading
+from collections import deque
+from queue import Empty
+from typing import Any, Deque, Dict, List, Optional
+
+from events import CrewEvent, EventType
+
+# Entries held at most; past it the least important waiting event is dropped
+DEFAULT_CAPACITY = int(os.getenv("CREW_EVENT_CAPACITY", "500"))
+
+# Merged into one "tool X called N times" entry while waiting to be read
+COALESCED = {EventType.TOOL_START, EventType.TOOL_FINISH}
+# Given up last, only to make room for a newer error
+ERRORS = {
+    EventType.ERROR,
+    EventType.CREW_ERROR,
+    EventType.AGENT_ERROR,
+    EventType.TASK_ERROR,
+    EventType.TOOL_ERROR,
+}
+# Never given up: the UI marks agents, tasks and the crew done from these.
+# There are only a few per run, so the channel may grow past capacity for them.
+COMPLETIONS = {
+    EventType.AGENT_FINISH,
+    EventType.TASK_COMPLETE,
+    EventType.CREW_COMPLETE,
+    EventType.CREW_ERROR,
+}
+
+
+class _ToolCalls:
+    """Pending summary of one tool's calls, still open for more"""
+
+    __slots__ = ("name", "calls", "seconds", "first_ns")
+
+    def __init__(self, name: str, ts_ns: int):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.first_ns = ts_ns
+
+    def add(self, event: CrewEvent, started: Deque[int]):
+        if event.type == EventType.TOOL_START:
+            started.append(event.ts_ns)
+        else:
+            self.calls += 1
+            if started:
+                self.seconds += (event.ts_ns - started.popleft()) / 1e9
+
+    def event(self) -> CrewEvent:
+        if self.calls == 0:
+            return CrewEvent(EventType.TOOL_START, name=self.name, ts_ns=self.first_ns)
+        return CrewEvent(
+            EventType.TOOL_FINISH,
+            name=self.name,
+            text=f"called {self.calls} time{'s' if self.calls != 1 else ''}, {self.seconds:.1f}s total",
+            ts_ns=self.first_ns,
+        )
+
+
+# Eviction ranks above the lifecycle events
+_ERROR = 3
+_COMPLETION = 4
+
+
+def _priority(entry: Any) -> int:
+    """
+    Lower goes first when the channel is full: tool summaries, info,
+    lifecycle, errors. Completions are never given up.
+    """
+    if isinstance(entry, _ToolCalls):
+        return 0
+    kind = getattr(entry, "type", None)
+    if kind in COALESCED:
+        return 0
+    if kind == EventType.INFO:
+        return 1
+    if kind in COMPLETIONS:
+        return _COMPLETION
+    if kind in ERRORS:
+        return _ERROR
+    return 2
+
+
+class EventChannel:
+    """
+    Bounded, coalescing replacement for the UI's event Queue.
+
+    Tool start/finish pairs are merged per tool into a single summary
+    entry until the UI reads it, so a tool-heavy agent produces one log
+    line instead of hundreds. A crew, agent or task event closes the open
+    summaries, keeping the log in order. At most ``capacity`` entries
+    wait: a new event replaces the oldest one of the lowest priority
+    waiting (tool summaries, then info, then crew, agent and task events),
+    unless that is more important than the new event itself, which is
+    then dropped. Errors go only to make room for newer errors. Agent,
+    task and crew completions are never dropped: when nothing less
+    important is waiting, the channel grows past ``capacity`` for them.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._entries: Deque[Any] = deque()
+        self._open: Dict[str, _ToolCalls] = {}
+        # Start times of tool calls still running, per tool
+        self._started: Dict[str, Deque[int]] = {}
+        self._stats = {"received": 0, "coalesced": 0, "dropped": 0}
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None):
+        """Accept an event; never blocks the producing agent"""
+        with self._lock:
+            self._stats["received"] += 1
+            kind = getattr(item, "type", None)
+            if kind in COALESCED:
+                started = self._started.setdefault(item.name, deque())
+                summary = self._open.get(item.name)
+                if summary is not None:
+                    summary.add(item, started)
+                    self._stats["coalesced"] += 1
+                    return
+                summary = self._open[item.name] = _ToolCalls(item.name, item.ts_ns)
+                summary.add(item, started)
+                item = summary
+            elif kind != EventType.TOOL_ERROR:
+                # Later tool calls belong after this event, in a new summary
+                self._open.clear()
+
+            if len(self._entries) >= self.capacity and not self._make_room(item):
+                if _priority(item) != _COMPLETION:
+                    self._stats["dropped"] += 1
+                    return
+            self._entries.append(item)
+
+    put_nowait = put
+
+    def _make_room(self, item: Any) -> bool:
+        # Caller holds the lock
+        priority = _priority(item)
+        if priority == _COMPLETION:
+            # Completions make room from anything but errors and other completions
+            priority = _ERROR - 1
+        victim = None
+        for index, entry in enumerate(self._entries):
+            rank = _priority(entry)
+            if rank <= priority and (victim is None or rank < victim[1]):
+                victim = (index, rank)
+                if rank == 0:
+                    break
+        if victim is None:
+            return False
+        entry = self._entries[victim[0]]
+        del self._entries[victim[0]]
+        if isinstance(entry, _ToolCalls) and self._open.get(entry.name) is entry:
+            del self._open[entry.name]
+        self._stats["dropped"] += 1
+        return True
+
+    def get_nowait(self) -> Any:
+        """
+        Raises:
+            Empty: If no event is waiting
+        """
+        with self._lock:
+            if not self._entries:
+                raise Empty
+            entry = self._entries.popleft()
+            if isinstance(entry, _ToolCalls):
+                if self._open.get(entry.name) is entry:
+                    del self._open[entry.name]
+                return entry.event()
+            return entry
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """Same as get_nowait; the UI polls rather than waits"""
+        return self.get_nowait()
+
+    def drain(self, limit: Optional[int] = None) -> List[Any]:
+        """Everything waiting (up to ``limit``), in order"""
+        items = []
+        while limit is None or len(items) < limit:
+            try:
+                items.append(self.get_nowait())
+            except Empty:
+                break
+        return items
+
+    def qsize(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def stats(self) -> Dict[str, int]:
+        """Events received, merged into summaries and dropped so far"""
+        with self._lock:
+            return dict(self._stats)
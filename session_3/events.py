@@ -0,0 +1,194 @@
+# events.py
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from enum import IntEnum
+from queue import Queue
+from typing import Dict, Any, Optional, Set
+
+from artifacts import atomic_write
+
+# Outputs referenced by events are stored here, per run, named by content hash
+PAYLOADS_DIR = os.getenv("CREW_PAYLOADS_DIR", os.path.join(".crew_state", "payloads"))
+
+# Characters of a payload kept inline on the event for display
+PREVIEW_CHARS = 200
+
+# Wall-clock anchor for monotonic timestamps. CLOCK_MONOTONIC is shared by
+# every process on the machine, so events from pool workers convert too.
+_WALL_NS = time.time_ns()
+_MONO_NS = time.monotonic_ns()
+
+
+class EventType(IntEnum):
+    INFO = 0
+    ERROR = 1
+    CREW_STARTED = 2
+    CREW_COMPLETE = 3
+    CREW_ERROR = 4
+    AGENT_START = 5
+    AGENT_FINISH = 6
+    AGENT_ERROR = 7
+    TASK_START = 8
+    TASK_COMPLETE = 9
+    TASK_ERROR = 10
+    TOOL_START = 11
+    TOOL_FINISH = 12
+    TOOL_ERROR = 13
+
+
+@dataclass(slots=True)
+class CrewEvent:
+    """
+    One execution log entry.
+
+    ``name`` is the crew, agent, task or tool the event is about and
+    ``text`` a short message, error or preview. Full outputs are not
+    carried on the event; ``payload_id`` refers to them in the payload
+    store instead.
+    """
+
+    type: EventType
+    name: str = ""
+    text: str = ""
+    payload_id: Optional[str] = None
+    ts_ns: int = 0
+
+    def __post_init__(self):
+        if not self.ts_ns:
+            self.ts_ns = time.monotonic_ns()
+
+    @property
+    def datetime(self) -> datetime:
+        """Wall-clock time of the event"""
+        return datetime.fromtimestamp((_WALL_NS + self.ts_ns - _MONO_NS) / 1e9)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly form, e.g. for clients outside this process"""
+        return {
+            "type": self.type.name.lower(),
+            "name": self.name,
+            "text": self.text,
+            "payload_id": self.payload_id,
+            "timestamp": self.datetime.isoformat(),
+        }
+
+
+def info(text: str) -> CrewEvent:
+    return CrewEvent(EventType.INFO, text=text)
+
+
+def error(text: str) -> CrewEvent:
+    return CrewEvent(EventType.ERROR, text=text)
+
+
+def seconds_between(start: CrewEvent, end: CrewEvent) -> float:
+    return (end.ts_ns - start.ts_ns) / 1e9
+
+
+class PayloadStore:
+    """
+    Content-addressed store for event payloads, one directory per run.
+
+    Identical outputs of a run are kept once. ``put`` only queues the
+    write, so event-bus handlers never wait on the disk; ``get`` serves a
+    payload still queued from memory. A run's payloads go with the run
+    through ``delete``. When several callers follow one run (see
+    singleflight), each ``retain``s its payloads and ``release`` deletes
+    them only once the last of those callers lets go.
+    """
+
+    def __init__(self, root: str = PAYLOADS_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self._queue: Queue = Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._pending: Dict[str, str] = {}
+        # Callers still showing each run's log, by run id
+        self._holders: Dict[str, Set[str]] = {}
+
+    def put(self, text: str, run_id: str) -> str:
+        """Queue a payload of a run and return its id"""
+        payload_id = f"{run_id}/{hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]}"
+        with self._lock:
+            if payload_id in self._pending:
+                return payload_id
+            self._pending[payload_id] = text
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._drain, daemon=True)
+                self._writer.start()
+        self._queue.put(payload_id)
+        return payload_id
+
+    def get(self, payload_id: str) -> Optional[str]:
+        with self._lock:
+            if payload_id in self._pending:
+                return self._pending[payload_id]
+        try:
+            with open(os.path.join(self.root, payload_id), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def retain(self, run_id: str, holder: str):
+        """Keep a run's payloads until ``holder`` releases them"""
+        with self._lock:
+            self._holders.setdefault(run_id, set()).add(holder)
+
+    def release(self, holder: str):
+        """
+        Let go of every run ``holder`` retained, deleting those nobody holds any more.
+
+        A run nobody retained goes when its own id is released, as with ``delete``.
+        """
+        with self._lock:
+            orphaned = [] if holder in self._holders else [holder]
+            for run_id, holders in list(self._holders.items()):
+                if holder in holders:
+                    holders.discard(holder)
+                    if not holders:
+                        del self._holders[run_id]
+                        orphaned.append(run_id)
+        for run_id in orphaned:
+            self.delete(run_id)
+
+    def delete(self, run_id: str):
+        """Remove every payload of a run, once its queued writes have landed"""
+        self._queue.join()
+        shutil.rmtree(os.path.join(self.root, run_id), ignore_errors=True)
+
+    def _drain(self):
+        while True:
+            payload_id = self._queue.get()
+            try:
+                with self._lock:
+                    text = self._pending[payload_id]
+                path = os.path.join(self.root, payload_id)
+                if not os.path.exists(path):
+                    atomic_write(path, text.encode("utf-8"))
+            except Exception:
+                pass  # a lost payload only loses the full text behind a preview
+            finally:
+                with self._lock:
+                    self._pending.pop(payload_id, None)
+                self._queue.task_done()
+
+
+payloads = PayloadStore()
+
+
+def with_payload(event_type: EventType, name: str, text: str, run_id: str) -> CrewEvent:
+    """Event with a preview of ``text``, the full text stored by reference under the run"""
+    if len(text) <= PREVIEW_CHARS:
+        return CrewEvent(event_type, name=name, text=text)
+    return CrewEvent(
+        event_type,
+        name=name,
+        text=text[:PREVIEW_CHARS] + "...",
+        payload_id=payloads.put(text, run_id),
+    )
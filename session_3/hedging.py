@@ -0,0 +1,286 @@
+# hedging.py
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Deque, Dict, Any, List, Optional, Union
+
+from crewai import BaseLLM, Crew
+from crewai.utilities.events import TaskCompletedEvent, crewai_event_bus
+from pydantic import BaseModel, Field
+
+from metrics import metrics
+from model_routing import LLMWrapper, fork_llm
+
+
+class HedgingConfig(BaseModel):
+    """Deadline and hedging defaults, set under `hedging` in models.yaml"""
+
+    enabled: bool = Field(default=True, description="Off sends every call straight through")
+    hedge_percentile: float = Field(
+        default=0.95, description="Latency percentile after which a duplicate request is sent"
+    )
+    min_samples: int = Field(
+        default=20, description="Calls observed before the percentile is trusted"
+    )
+    initial_hedge_seconds: float = Field(
+        default=45, description="Hedge delay until enough calls have been observed"
+    )
+    min_hedge_seconds: float = Field(
+        default=5, description="Never hedge sooner than this, however fast calls usually are"
+    )
+    max_hedges: int = Field(default=1, description="Duplicate requests per call")
+    timeout_seconds: float = Field(
+        default=180, description="Hard deadline per attempt; the call is retried after it"
+    )
+    retries: int = Field(default=1, description="Attempts after the first one times out")
+
+
+class TaskLatencyConfig(BaseModel):
+    """Per-task latency settings, set under `latency` in tasks.yaml"""
+
+    slo_seconds: Optional[float] = Field(
+        default=None,
+        description="Task latency objective; past it, calls for the task hedge at min_hedge_seconds",
+    )
+    hedge_after_seconds: Optional[float] = Field(
+        default=None, description="Fixed hedge delay instead of the observed percentile"
+    )
+    timeout_seconds: Optional[float] = Field(
+        default=None, description="Hard deadline per attempt for this task's calls"
+    )
+
+
+def load_hedging_config(config: Optional[Dict[str, Any]] = None) -> HedgingConfig:
+    """Settings from models.yaml; CREW_HEDGING=off disables hedging and deadlines"""
+    config = dict(config or {})
+    if os.getenv("CREW_HEDGING"):
+        config["enabled"] = os.environ["CREW_HEDGING"].lower() not in ("0", "off", "false")
+    return HedgingConfig(**config)
+
+
+class LLMTimeoutError(TimeoutError):
+    """Raised when every attempt of an LLM call ran into its hard deadline"""
+
+
+@dataclass
+class HedgingStats:
+    """Counters describing a crew's hedged and deadline-bounded LLM calls"""
+
+    calls: int = 0  # calls made under a deadline
+    hedges: int = 0  # duplicate requests sent
+    hedge_wins: int = 0  # calls answered by a duplicate rather than the original
+    timeouts: int = 0  # attempts abandoned at their hard deadline
+    retries: int = 0  # attempts started after a timeout
+    slo_breaches: int = 0  # tasks that finished past their latency objective
+
+    def summary(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+_stats_lock = threading.Lock()
+
+
+def _record(stats: HedgingStats, **counters: int):
+    with _stats_lock:
+        for counter, amount in counters.items():
+            setattr(stats, counter, getattr(stats, counter) + amount)
+
+
+class LatencyWindow:
+    """Recent successful call latencies per model"""
+
+    def __init__(self, size: int = 200):
+        self.size = size
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def add(self, model: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=self.size)).append(seconds)
+
+    def percentile(self, model: str, percentile: float, min_samples: int) -> Optional[float]:
+        """The latency ``percentile`` of a model, or None with too few samples"""
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        return samples[min(len(samples) - 1, int(percentile * len(samples)))]
+
+
+# Shared by every crew in this process, so each learns from the others' calls
+latency_window = LatencyWindow()
+
+
+class HedgedLLM(LLMWrapper):
+    """
+    Bounds every call with deadlines so one hung request cannot stall the run.
+
+    A call that has not answered after the model's usual latency (the
+    configured percentile of recent calls, or a task's fixed
+    `hedge_after_seconds`) gets a duplicate request, and whichever answers
+    first is used. Once a task is past its `slo_seconds` its calls hedge
+    as early as allowed. An attempt that exceeds the hard deadline is
+    abandoned and retried; when every attempt times out, LLMTimeoutError
+    is raised. Errors from the wrapped LLM are raised as they are.
+
+    Each request runs on its own copy of the wrapped LLM (see fork_llm),
+    with the time left to the deadline as its provider timeout, so
+    concurrent requests never share call state and an abandoned one ends
+    at the deadline instead of holding a connection.
+    """
+
+    def __init__(
+        self,
+        inner: BaseLLM,
+        config: HedgingConfig,
+        tasks_config: Optional[Dict[str, Any]] = None,
+        stats: Optional[HedgingStats] = None,
+    ):
+        super().__init__(inner)
+        self.config = config
+        self.enabled = config.enabled
+        # Shared by the LLMs of one crew, so a run reports only its own calls
+        self.stats = stats or HedgingStats()
+        self.latency: Dict[str, TaskLatencyConfig] = {
+            name: TaskLatencyConfig(**task_config["latency"])
+            for name, task_config in (tasks_config or {}).items()
+            if isinstance(task_config, dict) and task_config.get("latency")
+        }
+
+    def _hedge_delay(self, from_task: Optional[Any], task_latency: TaskLatencyConfig) -> float:
+        config = self.config
+        started = getattr(from_task, "start_time", None)
+        if task_latency.slo_seconds is not None and started is not None:
+            if (datetime.now() - started).total_seconds() > task_latency.slo_seconds:
+                return config.min_hedge_seconds
+        if task_latency.hedge_after_seconds is not None:
+            return task_latency.hedge_after_seconds
+        observed = latency_window.percentile(
+            self.inner.model, config.hedge_percentile, config.min_samples
+        )
+        return max(
+            config.min_hedge_seconds,
+            observed if observed is not None else config.initial_hedge_seconds,
+        )
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Union[str, Any]:
+        if not self.enabled:
+            return super().call(
+                messages, tools, callbacks, available_functions, from_task, from_agent
+            )
+
+        def attempt(timeout: float):
+            started = time.perf_counter()
+            inner = fork_llm(self.inner, timeout)
+            inner.stop = self.stop
+            result = inner.call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+            )
+            latency_window.add(self.inner.model, time.perf_counter() - started)
+            return result
+
+        task_latency = self.latency.get(getattr(from_task, "name", None), TaskLatencyConfig())
+        timeout = task_latency.timeout_seconds or self.config.timeout_seconds
+        _record(self.stats, calls=1)
+        for number in range(self.config.retries + 1):
+            if number:
+                _record(self.stats, retries=1)
+            try:
+                return self._hedged(attempt, self._hedge_delay(from_task, task_latency), timeout)
+            except LLMTimeoutError:
+                _record(self.stats, timeouts=1)
+                metrics.inc("crew_llm_hedges", model=self.inner.model, outcome="timeout")
+        raise LLMTimeoutError(
+            f"LLM call to {self.inner.model} timed out after {self.config.retries + 1} "
+            f"attempt(s) of {timeout:.0f}s"
+        )
+
+    def _hedged(self, attempt, hedge_delay: float, timeout: float) -> Any:
+        """One attempt with up to max_hedges duplicates, bounded by ``timeout``"""
+        started = time.monotonic()
+        deadline = started + timeout
+        executor = ThreadPoolExecutor(max_workers=1 + self.config.max_hedges)
+        pending = {executor.submit(attempt, timeout)}
+        original = next(iter(pending))
+        hedges = 0
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                next_hedge = (
+                    started + hedge_delay * (hedges + 1)
+                    if hedges < self.config.max_hedges
+                    else deadline
+                )
+                remaining = min(next_hedge, deadline) - time.monotonic()
+                done, pending = wait(pending, timeout=max(0, remaining), return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        last_error = future.exception()
+                        continue
+                    if future is not original:
+                        _record(self.stats, hedge_wins=1)
+                        metrics.inc("crew_llm_hedges", model=self.inner.model, outcome="won")
+                    return future.result()
+
+                now = time.monotonic()
+                if now >= deadline:
+                    raise LLMTimeoutError()
+                if not pending and last_error is not None:
+                    raise last_error
+                if now >= next_hedge and hedges < self.config.max_hedges:
+                    # Still waiting past the usual latency: race a duplicate
+                    hedges += 1
+                    _record(self.stats, hedges=1)
+                    metrics.inc("crew_llm_hedges", model=self.inner.model, outcome="sent")
+                    pending.add(executor.submit(attempt, max(0.0, deadline - time.monotonic())))
+            raise last_error
+        finally:
+            # Losing requests finish in the background and are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+@crewai_event_bus.on(TaskCompletedEvent)
+def _on_task_completed(source, event):
+    task = getattr(event, "task", None)
+    # The objective and the stats belong to the crew whose agent ran the task
+    llm = getattr(getattr(task, "agent", None), "llm", None)
+    while isinstance(llm, LLMWrapper) and not isinstance(llm, HedgedLLM):
+        llm = llm.inner
+    if not isinstance(llm, HedgedLLM):
+        return
+    latency = llm.latency.get(getattr(task, "name", None))
+    started = getattr(task, "start_time", None)
+    if latency is None or latency.slo_seconds is None or started is None:
+        return
+    if (datetime.now() - started).total_seconds() > latency.slo_seconds:
+        _record(llm.stats, slo_breaches=1)
+        metrics.inc("crew_task_slo_breaches", task=task.name)
+
+
+def enable_hedging(crew: Crew, enabled: bool = True):
+    """Switch hedging and deadlines on or off for every agent of a crew"""
+    for crew_agent in crew.agents:
+        llm = crew_agent.llm
+        while isinstance(llm, LLMWrapper) and not isinstance(llm, HedgedLLM):
+            llm = llm.inner
+        if isinstance(llm, HedgedLLM):
+            # models.yaml can keep it off regardless
+            llm.enabled = enabled and llm.config.enabled
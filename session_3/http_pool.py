@@ -0,0 +1,308 @@
+# http_pool.py
+
+import os
+import re
+import socket
+import threading
+import time
+import weakref
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+import requests
+from bs4 import BeautifulSoup
+from crewai_tools import ScrapeWebsiteTool, SerperDevTool
+from litellm.llms.custom_httpx.http_handler import HTTPHandler
+from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
+
+from metrics import metrics
+
+try:
+    import h2  # noqa: F401  # httpx negotiates HTTP/2 only when h2 is installed
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpPoolConfig(BaseModel):
+    """Connection pool settings, set under `http_pool` in models.yaml"""
+
+    max_connections_per_host: int = Field(
+        default=10, description="Concurrent connections to one host; further requests wait"
+    )
+    max_keepalive_connections: int = Field(
+        default=20, description="Idle connections kept open across all hosts"
+    )
+    keepalive_seconds: float = Field(
+        default=90, description="How long an idle connection is kept for reuse"
+    )
+    http2: bool = Field(default=True, description="Negotiate HTTP/2 with the LLM provider")
+    dns_ttl_seconds: float = Field(
+        default=300, description="How long resolved addresses are reused; 0 disables the cache"
+    )
+    connect_timeout_seconds: float = Field(default=5, description="TCP and TLS setup deadline")
+    llm_timeout_seconds: float = Field(
+        default=600, description="Read deadline for LLM responses; hedging usually acts first"
+    )
+
+
+class DnsCache:
+    """
+    Process-wide TTL cache in front of ``socket.getaddrinfo``.
+
+    Every new connection resolves its host, and the system resolver is
+    often uncached in containers. Only successful lookups are cached.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple, Tuple[float, Any]] = {}
+        self._resolve = None
+
+    def install(self):
+        if self._resolve is None and self.ttl_seconds > 0:
+            self._resolve = socket.getaddrinfo
+            socket.getaddrinfo = self.getaddrinfo
+
+    def uninstall(self):
+        if self._resolve is not None:
+            socket.getaddrinfo = self._resolve
+            self._resolve = None
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        addresses = self._resolve(host, port, family, type, proto, flags)
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, addresses)
+        return addresses
+
+
+class HttpPool:
+    """
+    Shared keep-alive HTTP clients for the LLM provider and the web tools.
+
+    The LLM client is httpx (HTTP/2 where the server supports it) handed to
+    litellm, the tools share one requests session. Both keep connections
+    alive, cap connections per host and resolve hosts through a DNS cache,
+    so repeated calls skip TCP, TLS and DNS setup. Requests and newly
+    opened connections are counted per client; the gap between the two is
+    the reuse the pool bought.
+    """
+
+    def __init__(self, config: Optional[HttpPoolConfig] = None):
+        self.config = config or HttpPoolConfig()
+        self._lock = threading.Lock()
+        self._llm_handler: Optional[HTTPHandler] = None
+        self._session: Optional[requests.Session] = None
+        self._dns: Optional[DnsCache] = None
+        self._seen_connections: "weakref.WeakSet" = weakref.WeakSet()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def configure(self, config: HttpPoolConfig):
+        """Apply settings from models.yaml; clients already handed out keep theirs"""
+        with self._lock:
+            self.config = config
+            self._llm_handler = None
+            self._session = None
+            if self._dns is not None:
+                self._dns.uninstall()
+                self._dns = None
+
+    def _ensure_dns(self):
+        # Caller holds the lock
+        if self._dns is None:
+            self._dns = DnsCache(self.config.dns_ttl_seconds)
+            self._dns.install()
+
+    def _record(
+        self,
+        client: str,
+        host: str,
+        new_connection: bool = False,
+        connect_seconds: float = 0.0,
+    ):
+        with self._lock:
+            stats = self._stats.setdefault(
+                client, {"requests": 0, "new_connections": 0, "connect_seconds": 0.0}
+            )
+            if new_connection:
+                stats["new_connections"] += 1
+                stats["connect_seconds"] += connect_seconds
+            else:
+                stats["requests"] += 1
+        if new_connection:
+            metrics.inc("crew_http_connections_opened", client=client, host=host)
+        else:
+            metrics.inc("crew_http_requests", client=client, host=host)
+
+    def llm_handler(self) -> HTTPHandler:
+        """The litellm handler every LLM call shares"""
+        with self._lock:
+            if self._llm_handler is None:
+                self._ensure_dns()
+                config = self.config
+                # Every call goes to the one provider host, so the total
+                # connection limit is the per-host limit
+                client = httpx.Client(
+                    http2=config.http2 and HTTP2_AVAILABLE,
+                    limits=httpx.Limits(
+                        max_connections=config.max_connections_per_host,
+                        max_keepalive_connections=config.max_keepalive_connections,
+                        keepalive_expiry=config.keepalive_seconds,
+                    ),
+                    timeout=httpx.Timeout(
+                        config.llm_timeout_seconds, connect=config.connect_timeout_seconds
+                    ),
+                    event_hooks={"request": [self._trace_llm_request]},
+                )
+                self._llm_handler = HTTPHandler(client=client)
+            return self._llm_handler
+
+    def llm_params(self, model: str) -> Dict[str, Any]:
+        """Extra LLM() arguments that route a model's calls through the pool"""
+        # litellm takes an HTTPHandler for Gemini; other providers expect their own SDK client
+        if model.startswith("gemini/"):
+            return {"client": self.llm_handler()}
+        return {}
+
+    def _trace_llm_request(self, request: httpx.Request):
+        host = request.url.host
+        self._record("llm", host)
+        opened: Dict[str, float] = {}
+
+        def trace(name: str, info: Dict[str, Any]):
+            # httpcore reports connect steps only when it opens a new connection
+            if name == "connection.connect_tcp.started":
+                opened["at"] = time.perf_counter()
+            elif name.endswith(".send_request_headers.started") and "at" in opened:
+                # TCP, TLS and protocol setup are done by the time headers go out
+                seconds = time.perf_counter() - opened.pop("at")
+                self._record("llm", host, new_connection=True, connect_seconds=seconds)
+
+        request.extensions["trace"] = trace
+
+    def session(self) -> requests.Session:
+        """The requests session the web tools share"""
+        with self._lock:
+            if self._session is None:
+                self._ensure_dns()
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.config.max_keepalive_connections,
+                    pool_maxsize=self.config.max_connections_per_host,
+                    # Wait for a free connection rather than open one per thread
+                    pool_block=True,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.hooks["response"].append(self._trace_tool_response)
+                self._session = session
+            return self._session
+
+    def _trace_tool_response(self, response: requests.Response, *args, **kwargs):
+        host = urlparse(response.url).hostname or ""
+        self._record("tools", host)
+        # Content is not read yet, so the response still holds its connection
+        connection = getattr(response.raw, "connection", None)
+        if connection is not None and connection not in self._seen_connections:
+            self._seen_connections.add(connection)
+            self._record("tools", host, new_connection=True)
+
+    def counters(self) -> Dict[str, Any]:
+        """Totals so far, to pass back to ``summary`` as ``since``"""
+        with self._lock:
+            dns = self._dns
+            return {
+                "clients": {client: dict(stats) for client, stats in self._stats.items()},
+                "dns_hits": dns.hits if dns else 0,
+                "dns_misses": dns.misses if dns else 0,
+            }
+
+    def summary(self, since: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Requests and new connections per client, plus DNS cache hits.
+
+        The pool serves the whole process, so a run passes the ``counters``
+        taken when it started and gets what changed since; runs overlapping
+        it are included. The process totals are on /metrics.
+        """
+        now = self.counters()
+        since = since or {"clients": {}, "dns_hits": 0, "dns_misses": 0}
+        clients = {}
+        for client, stats in now["clients"].items():
+            before = since["clients"].get(client, {})
+            delta = {counter: value - before.get(counter, 0) for counter, value in stats.items()}
+            if not delta["requests"] and not delta["new_connections"]:
+                continue
+            delta["reuse_rate"] = (
+                1 - delta["new_connections"] / delta["requests"] if delta["requests"] else 0.0
+            )
+            clients[client] = delta
+        return {
+            "clients": clients,
+            "http2": self.config.http2 and HTTP2_AVAILABLE,
+            "dns_hits": now["dns_hits"] - since["dns_hits"],
+            "dns_misses": now["dns_misses"] - since["dns_misses"],
+        }
+
+
+# Shared by every crew and tool in this process; ModelRouter configures it
+http_pool = HttpPool()
+
+
+class PooledSerperDevTool(SerperDevTool):
+    """SerperDevTool sending its searches over the shared pool"""
+
+    def _make_api_request(self, search_query: str, search_type: str) -> dict:
+        payload = {"q": search_query, "num": self.n_results}
+        if self.country != "":
+            payload["gl"] = self.country
+        if self.location != "":
+            payload["location"] = self.location
+        if self.locale != "":
+            payload["hl"] = self.locale
+
+        response = http_pool.session().post(
+            self._get_search_url(search_type),
+            headers={
+                "X-API-KEY": os.environ["SERPER_API_KEY"],
+                "content-type": "application/json",
+            },
+            json=payload,
+            timeout=10,
+        )
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            raise ValueError("Empty response from Serper API")
+        return results
+
+
+class PooledScrapeWebsiteTool(ScrapeWebsiteTool):
+    """ScrapeWebsiteTool fetching pages over the shared pool"""
+
+    def _run(self, **kwargs: Any) -> Any:
+        website_url = kwargs.get("website_url", self.website_url)
+        page = http_pool.session().get(
+            website_url,
+            timeout=15,
+            headers=self.headers,
+            cookies=self.cookies if self.cookies else {},
+        )
+        page.encoding = page.apparent_encoding
+        text = BeautifulSoup(page.text, "html.parser").get_text(" ")
+        text = re.sub("[ \t]+", " ", text)
+        return re.sub("\\s+\n\\s+", "\n", text)
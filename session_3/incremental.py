@@ -0,0 +1,253 @@
+# incremental.py
+
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, Any, List, Optional, Set
+
+from crewai import Crew, Task
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
+from crewai.types.usage_metrics import UsageMetrics
+from crewai.utilities.events import CrewKickoffCompletedEvent, crewai_event_bus
+
+from artifacts import ArtifactStore, atomic_write
+from metrics import metrics
+
+CACHE_PATH = os.getenv("CREW_TASK_CACHE", os.path.join(".crew_state", "task_outputs.json"))
+
+# Every run builds its own TaskOutputCache; saves from all of them in this
+# process take turns, so none merges against a half-written neighbour
+_save_lock = threading.Lock()
+
+# Same placeholder syntax crewai interpolates
+_PLACEHOLDER = re.compile(r"\{([A-Za-z_][A-Za-z0-9_\-]*)\}")
+
+# How tasks.yaml tells an agent where to save its file
+_SAVE_TO = re.compile(r"\bSave (?:\w+ )?to '([^']+)'")
+
+
+def _templates(task: Task) -> List[str]:
+    """Uninterpolated texts that make up a task's prompt"""
+    texts = [
+        task._original_description or task.description,
+        task._original_expected_output or task.expected_output,
+    ]
+    if task.agent is not None:
+        texts += [
+            task.agent._original_role or task.agent.role,
+            task.agent._original_goal or task.agent.goal,
+            task.agent._original_backstory or task.agent.backstory,
+        ]
+    return texts
+
+
+def task_name(task: Task) -> str:
+    return task.name or hashlib.sha256(_templates(task)[0].encode()).hexdigest()[:12]
+
+
+def artifact_path(task: Task) -> Optional[str]:
+    """The file a task's agent saves: its output_file, or the path its expected output names"""
+    if task.output_file:
+        return task.output_file
+    match = _SAVE_TO.search(task._original_expected_output or task.expected_output or "")
+    return match.group(1) if match else None
+
+
+def placeholders(task: Task) -> Set[str]:
+    """Inputs referenced by the task and its agent, excluding upstream tasks"""
+    return {name for text in _templates(task) for name in _PLACEHOLDER.findall(text)}
+
+
+def effective_inputs(task: Task) -> Set[str]:
+    """Inputs the task's output depends on, including through its context"""
+    names = set(placeholders(task))
+    for context_task in task.context if isinstance(task.context, list) else []:
+        names |= effective_inputs(context_task)
+    return names
+
+
+def task_keys(tasks: List[Task], inputs: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Content key of every task's output for the given inputs.
+
+    A key covers the task and agent templates, the values of the inputs the
+    task itself references and the keys of its context tasks, so it changes
+    exactly when something the output depends on changes.
+
+    Returns:
+        Dict[str, str]: Task name to key, in task order
+    """
+    keys: Dict[int, str] = {}
+
+    def key_for(task: Task) -> str:
+        if id(task) not in keys:
+            context = task.context if isinstance(task.context, list) else []
+            material = {
+                "task": task_name(task),
+                "templates": _templates(task),
+                "inputs": {
+                    name: str(inputs.get(name)) for name in sorted(placeholders(task))
+                },
+                "context": [key_for(context_task) for context_task in context],
+            }
+            keys[id(task)] = hashlib.sha256(
+                json.dumps(material, sort_keys=True).encode()
+            ).hexdigest()
+        return keys[id(task)]
+
+    return {task_name(task): key_for(task) for task in tasks}
+
+
+class TaskOutputCache:
+    """
+    Task outputs persisted across runs, keyed by task_keys().
+
+    Alongside each output the cache keeps the file its task saved, so a
+    run reusing the output can put that file back in its own namespace.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, max_entries: int = 200):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def get(self, key: str) -> Optional[TaskOutput]:
+        with self._lock:
+            data = self._entries.get(key)
+        if data is None:
+            return None
+        return TaskOutput(**{k: v for k, v in data.items() if k != "artifact"})
+
+    def artifact(self, key: str) -> Optional[str]:
+        """Content of the file the cached task saved, if it saved one"""
+        with self._lock:
+            return (self._entries.get(key) or {}).get("artifact")
+
+    def put(self, key: str, output: TaskOutput, artifact: Optional[str] = None):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = {
+                **output.model_dump(mode="json", exclude={"pydantic"}),
+                "artifact": artifact,
+            }
+            self._save()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self):
+        with _save_lock:
+            # Merge with entries other runs saved since we loaded
+            entries = {**self._load(), **self._entries}
+            self._entries = dict(list(entries.items())[-self.max_entries :])
+            atomic_write(os.path.abspath(self.path), json.dumps(self._entries).encode("utf-8"))
+
+
+def plan_rerun(crew: Crew, inputs: Dict[str, Any], cache: TaskOutputCache) -> Dict[str, List[str]]:
+    """
+    Work out which tasks a rerun with these inputs can reuse.
+
+    Returns:
+        Dict[str, List[str]]: Task names under "reused" and "rerun"
+    """
+    keys = task_keys(crew.tasks, inputs)
+    reused = [name for name, key in keys.items() if cache.get(key) is not None]
+    return {"reused": reused, "rerun": [name for name in keys if name not in reused]}
+
+
+def _saved_artifact(task: Task, store: Optional[ArtifactStore]) -> Optional[str]:
+    """Content of the file a task saved in the current run, if any"""
+    path = artifact_path(task)
+    if store is None or path is None:
+        return None
+    target = store.resolve(path)
+    if target != store.path_for(path):
+        return None  # not written in this run
+    try:
+        with open(target, "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def kickoff_incremental(
+    crew: Crew,
+    inputs: Dict[str, Any],
+    cache: Optional[TaskOutputCache] = None,
+    store: Optional[ArtifactStore] = None,
+) -> CrewOutput:
+    """
+    Kick off the crew, recomputing only tasks whose effective inputs changed.
+
+    Tasks with a cached output for their key get that output attached and are
+    left out of the kickoff; downstream tasks read it as context as usual.
+    The file a reused task saved is written again into the run's artifact
+    store, so downstream agents reading it find it.
+
+    Args:
+        crew: The crew to run
+        inputs: Campaign inputs
+        cache: Where outputs are looked up and stored
+        store: The run's artifact store, receiving the files of reused tasks
+
+    Returns:
+        CrewOutput: Output covering every task, reused or recomputed
+    """
+    cache = cache or TaskOutputCache()
+    keys = task_keys(crew.tasks, inputs)
+
+    rerun: List[Task] = []
+    for task in crew.tasks:
+        key = keys[task_name(task)]
+        cached = cache.get(key)
+        if cached is not None:
+            task.output = cached
+            path = artifact_path(task)
+            if store is not None and path is not None:
+                store.write(path, cache.artifact(key) or cached.raw)
+        else:
+            rerun.append(task)
+        metrics.inc(
+            "crew_cache_lookups",
+            cache="task_output",
+            result="miss" if cached is None else "hit",
+        )
+
+    token_usage = UsageMetrics()
+    if rerun:
+        partial = crew.model_copy(update={"tasks": rerun})
+        try:
+            partial.kickoff(inputs=inputs)
+        finally:
+            # Keep what finished even if a later task failed
+            for task in rerun:
+                if task.output is not None:
+                    cache.put(
+                        keys[task_name(task)], task.output, _saved_artifact(task, store)
+                    )
+        token_usage = partial.token_usage or token_usage
+
+    outputs = [task.output for task in crew.tasks]
+    final_output = outputs[-1]
+    if not rerun:
+        crewai_event_bus.emit(
+            crew,
+            CrewKickoffCompletedEvent(
+                crew_name=crew.name, output=final_output, total_tokens=0
+            ),
+        )
+    return CrewOutput(
+        raw=final_output.raw,
+        pydantic=final_output.pydantic,
+        json_dict=final_output.json_dict,
+        tasks_output=outputs,
+        token_usage=token_usage,
+    )
@@ -0,0 +1,175 @@
+# iteration_controller.py
+
+import json
+import math
+import os
+import re
+import threading
+from typing import Dict, Any, List, Optional
+
+from crewai import Agent
+from crewai.agents.parser import AgentAction, AgentFinish
+
+# One JSON line per finished agent execution, aggregated when loaded
+STATS_PATH = os.getenv("CREW_ITERATION_STATS", os.path.join(".crew_state", "iteration_stats.jsonl"))
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", str(text or "")).strip().lower()
+
+
+class _Trajectory:
+    """What one agent has done so far in the task it is executing"""
+
+    def __init__(self):
+        self.steps = 0
+        self.tool_calls: Dict[str, int] = {}
+        self.tool_results: Dict[str, int] = {}
+        self.last_thought: Optional[str] = None
+        self.stalled_steps = 0
+        self.terminated: Optional[str] = None
+
+
+class IterationController:
+    """
+    Stops agents that loop and sizes their iteration budgets from history.
+
+    Attach it to an agent through ``attach`` and the controller watches every
+    step. An agent that repeats the same tool call, keeps getting identical
+    tool results or produces the same thought over and over is converged:
+    its executor is pushed to the iteration limit so the next step forces a
+    final answer. Iterations used per agent are appended to the stats file,
+    so concurrent runs never overwrite each other's history, and ``budget``
+    derives the next run's max_iter from them.
+    """
+
+    def __init__(
+        self,
+        stats_path: str = STATS_PATH,
+        repeat_limit: int = 2,
+        stall_limit: int = 2,
+        history_size: int = 20,
+        min_budget: int = 3,
+        percentile: float = 0.9,
+    ):
+        self.stats_path = stats_path
+        self.repeat_limit = repeat_limit
+        self.stall_limit = stall_limit
+        self.history_size = history_size
+        self.min_budget = min_budget
+        self.percentile = percentile
+        self._lock = threading.Lock()
+        self._trajectories: Dict[int, _Trajectory] = {}
+        self._stats: Dict[str, Dict[str, Any]] = self._load()
+
+    def budget(self, agent_name: str, default: int) -> int:
+        """
+        Iteration budget for an agent, adapted from previous runs.
+
+        Args:
+            agent_name: Key of the agent in agents.yaml
+            default: Hard upper bound used until enough history exists
+
+        Returns:
+            int: The max_iter to give the agent
+        """
+        with self._lock:
+            history: List[int] = self._stats.get(agent_name, {}).get("iterations", [])
+        if len(history) < 3:
+            return default
+        ordered = sorted(history)
+        index = min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)
+        # One step of headroom above what the agent actually needed
+        return max(self.min_budget, min(default, ordered[index] + 1))
+
+    def attach(self, agent: Agent, agent_name: str) -> Agent:
+        """Watch the agent's steps; returns the agent for chaining"""
+        agent.step_callback = lambda step: self._on_step(agent, agent_name, step)
+        return agent
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-agent history: recent iteration counts and early exits"""
+        with self._lock:
+            return json.loads(json.dumps(self._stats))
+
+    def _on_step(self, agent: Agent, agent_name: str, step: Any):
+        if not isinstance(step, (AgentAction, AgentFinish)):
+            return  # tool results are reported again on the AgentAction
+
+        with self._lock:
+            trajectory = self._trajectories.setdefault(id(agent), _Trajectory())
+            trajectory.steps += 1
+
+            if isinstance(step, AgentFinish):
+                del self._trajectories[id(agent)]
+                self._record(agent_name, trajectory)
+                return
+
+            reason = self._converged(trajectory, step)
+
+        if reason and not trajectory.terminated:
+            trajectory.terminated = reason
+            executor = getattr(agent, "agent_executor", None)
+            if executor is not None:
+                # The next loop turn sees the limit and forces a final answer
+                executor.iterations = executor.max_iter
+
+    def _converged(self, trajectory: _Trajectory, step: AgentAction) -> Optional[str]:
+        call = f"{_normalize(step.tool)}|{_normalize(step.tool_input)}"
+        trajectory.tool_calls[call] = trajectory.tool_calls.get(call, 0) + 1
+        if trajectory.tool_calls[call] > self.repeat_limit:
+            return "repeated tool call"
+
+        result = getattr(step, "result", None)
+        if result:
+            key = f"{_normalize(step.tool)}|{hash(_normalize(result))}"
+            trajectory.tool_results[key] = trajectory.tool_results.get(key, 0) + 1
+            if trajectory.tool_results[key] > self.repeat_limit:
+                return "repeated tool result"
+
+        thought = _normalize(step.thought)
+        if thought and thought == trajectory.last_thought:
+            trajectory.stalled_steps += 1
+        else:
+            trajectory.stalled_steps = 0
+        trajectory.last_thought = thought
+        if trajectory.stalled_steps >= self.stall_limit:
+            return "stalled scratchpad"
+        return None
+
+    def _record(self, agent_name: str, trajectory: _Trajectory):
+        # Caller holds the lock
+        record = {
+            "agent": agent_name,
+            "iterations": trajectory.steps,
+            "early_exit": trajectory.terminated,
+        }
+        self._merge(self._stats, record)
+        directory = os.path.dirname(self.stats_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.stats_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def _merge(self, stats: Dict[str, Dict[str, Any]], record: Dict[str, Any]):
+        agent_stats = stats.setdefault(record["agent"], {"iterations": [], "early_exits": {}})
+        agent_stats["iterations"] = (agent_stats["iterations"] + [record["iterations"]])[
+            -self.history_size :
+        ]
+        if record.get("early_exit"):
+            exits = agent_stats["early_exits"]
+            exits[record["early_exit"]] = exits.get(record["early_exit"], 0) + 1
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        stats: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return stats
+        for line in lines:
+            try:
+                self._merge(stats, json.loads(line))
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue  # a line cut short by a crash
+        return stats
@@ -0,0 +1,301 @@
+# loadtest.py
+"""
+Load test for the dashboard: how many simultaneous sessions app.py serves.
+
+Drives N headless sessions through Streamlit's AppTest against a stub crew
+that emits a realistic event stream without calling any model. Each
+session starts a run and then polls like the browser's auto-refresh would,
+timing every rerun. Every concurrency level runs in a fresh process so
+memory figures are not skewed by earlier levels.
+
+AppTest keeps a single Streamlit runtime per process, so script runs are
+serialized. Reruns are GIL-bound Python either way, so this approximates
+one server process: rerun latency includes time queued behind other
+sessions, service time is the script run alone. Crew threads, queues and
+session state are shared the same way a real server shares them.
+
+    python loadtest.py --sessions 1,4,8,16 --slo-p95 1.0 --json report.json
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import resource
+import statistics
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from queue import Queue
+from typing import Dict, Any, List, Optional
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+STUB_TASKS = [
+    "market_research_task",
+    "marketing_strategy_task",
+    "content_calendar_task",
+    "content_drafting_blogs_task",
+    "content_drafting_social_task",
+    "seo_optimization_task",
+    "script_generation_task",
+]
+
+
+def stub_crew(
+    inputs: Dict[str, Any],
+    event_queue: Queue,
+    result_queue: Queue,
+    task_seconds: float = 0.5,
+    tool_calls: int = 20,
+    output_chars: int = 4000,
+    **options: Any,
+):
+    """Stand-in for run_crew_in_background: same events and payload, no model calls"""
+    import events
+    from events import CrewEvent, EventType
+
+    run_id = options.get("execution_id") or "loadtest"
+    event_queue.put(events.info("🚀 Starting CrewAI execution..."))
+    event_queue.put(CrewEvent(EventType.CREW_STARTED, name="crew"))
+    outputs = {}
+    for task_name in STUB_TASKS:
+        event_queue.put(CrewEvent(EventType.TASK_START, name=task_name))
+        event_queue.put(CrewEvent(EventType.AGENT_START, name=task_name))
+        for _ in range(tool_calls):
+            event_queue.put(CrewEvent(EventType.TOOL_START, name="Read a file's content"))
+            time.sleep(task_seconds / (tool_calls + 1))
+            event_queue.put(CrewEvent(EventType.TOOL_FINISH, name="Read a file's content"))
+        outputs[task_name] = f"# {task_name}\n\n" + "lorem ipsum " * (output_chars // 12)
+        for event_type in (EventType.AGENT_FINISH, EventType.TASK_COMPLETE):
+            event_queue.put(events.with_payload(event_type, task_name, outputs[task_name], run_id))
+    event_queue.put(CrewEvent(EventType.CREW_COMPLETE, name="crew"))
+    result_queue.put(
+        {
+            "success": True,
+            "result": outputs[STUB_TASKS[-1]],
+            "task_outputs": outputs,
+            "timestamp": datetime.now().isoformat(),
+        }
+    )
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # Peak rather than current, but the best other platforms offer
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+# AppTest's runtime is process-wide; one script run at a time
+_script_lock = threading.Lock()
+
+
+def _session(settings: Dict[str, Any], index: int = 0) -> Dict[str, Any]:
+    """One simulated user: load the page, start a run, poll until it finishes"""
+    from streamlit.testing.v1 import AppTest
+
+    latencies: List[float] = []
+    service: List[float] = []
+    errors: List[str] = []
+
+    def rerun(action=None):
+        started = time.perf_counter()
+        with _script_lock:
+            running = time.perf_counter()
+            (action or at).run()
+            finished = time.perf_counter()
+        latencies.append(finished - started)
+        service.append(finished - running)
+        errors.extend(str(e.value) for e in at.exception)
+
+    at = AppTest.from_file(APP_PATH, default_timeout=settings["timeout"])
+    rerun()
+    # The script's own auto-refresh sleeps inside the run; poll from here instead
+    auto_refresh = next(c for c in at.checkbox if c.label == "Auto-refresh logs")
+    rerun(auto_refresh.uncheck())
+    if not settings["identical"]:
+        # Distinct campaigns, or single-flight would fold them into one run
+        product = next(t for t in at.text_input if t.label == "Product Name")
+        rerun(product.input(f"{product.value} #{index}"))
+    start = next(b for b in at.button if "Start Marketing Crew" in b.label)
+    rerun(start.click())
+
+    deadline = time.monotonic() + settings["timeout"]
+    while at.session_state["crew_running"] and time.monotonic() < deadline:
+        time.sleep(settings["think_time"])
+        rerun()
+    finished = not at.session_state["crew_running"]
+    return {"latencies": latencies, "service": service, "errors": errors, "finished": finished}
+
+
+def run_level(sessions: int, settings: Dict[str, Any]) -> Dict[str, Any]:
+    """Run ``sessions`` simulated users at once and measure the process"""
+    os.environ.setdefault("CREW_METRICS_PORT", "0")
+    import runner
+
+    runner.run_crew_in_background = lambda inputs, event_queue, result_queue, **options: stub_crew(
+        inputs,
+        event_queue,
+        result_queue,
+        task_seconds=settings["task_seconds"],
+        tool_calls=settings["tool_calls"],
+    )
+
+    # One untimed page load, so imports and caches are not billed to sessions
+    from streamlit.testing.v1 import AppTest
+
+    AppTest.from_file(APP_PATH, default_timeout=settings["timeout"]).run()
+
+    baseline_rss = _rss_bytes()
+    baseline_threads = threading.active_count()
+    peak = {"threads": baseline_threads, "rss": baseline_rss}
+    sampling = threading.Event()
+
+    def sample():
+        while not sampling.wait(0.05):
+            peak["threads"] = max(peak["threads"], threading.active_count())
+            peak["rss"] = max(peak["rss"], _rss_bytes())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        results = list(executor.map(_session, [settings] * sessions, range(sessions)))
+    elapsed = time.perf_counter() - started
+    sampling.set()
+    sampler.join()
+
+    latencies = [latency for result in results for latency in result["latencies"]]
+    service = [seconds for result in results for seconds in result["service"]]
+    errors = [error for result in results for error in result["errors"]]
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "rerun_p50": _percentile(latencies, 50),
+        "rerun_p95": _percentile(latencies, 95),
+        "rerun_p99": _percentile(latencies, 99),
+        "rerun_max": max(latencies, default=0.0),
+        "rerun_mean": statistics.fmean(latencies) if latencies else 0.0,
+        "service_p50": _percentile(service, 50),
+        "service_p95": _percentile(service, 95),
+        "mb_per_session": (peak["rss"] - baseline_rss) / sessions / 2**20,
+        "peak_rss_mb": peak["rss"] / 2**20,
+        "peak_threads": peak["threads"],
+        "threads_per_session": (peak["threads"] - baseline_threads) / sessions,
+        "finished": sum(result["finished"] for result in results),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "seconds": elapsed,
+    }
+
+
+def capacity_report(levels: List[Dict[str, Any]], slo_p95: float) -> Dict[str, Any]:
+    """
+    Summarize the levels against a rerun latency objective.
+
+    A level passes when every session finished without errors and its p95
+    rerun latency stayed within ``slo_p95`` seconds; capacity is the largest
+    passing level below the first failing one.
+    """
+    capacity = 0
+    for level in levels:
+        passed = (
+            level["rerun_p95"] <= slo_p95
+            and level["finished"] == level["sessions"]
+            and not level["errors"]
+        )
+        level["passed"] = passed
+        if not passed:
+            break
+        capacity = level["sessions"]
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "slo_p95_seconds": slo_p95,
+        "capacity_sessions": capacity,
+        "levels": levels,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Capacity: {report['capacity_sessions']} concurrent session(s) "
+        f"at p95 rerun <= {report['slo_p95_seconds']:.2f}s",
+        "",
+        "| sessions | reruns | p50 (s) | p95 (s) | p99 (s) | service p95 (s) | MB/session | peak threads | finished | errors | pass |",
+        "|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|:---:|",
+    ]
+    for level in report["levels"]:
+        lines.append(
+            f"| {level['sessions']} | {level['reruns']} | {level['rerun_p50']:.3f} "
+            f"| {level['rerun_p95']:.3f} | {level['rerun_p99']:.3f} | {level['service_p95']:.3f} "
+            f"| {level['mb_per_session']:.1f} | {level['peak_threads']} "
+            f"| {level['finished']}/{level['sessions']} | {level['errors']} "
+            f"| {'✅' if level.get('passed') else '❌'} |"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Load test the marketing crew dashboard")
+    parser.add_argument("--sessions", default="1,2,4,8", help="Comma-separated concurrency levels")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Seconds between a session's polls")
+    parser.add_argument("--task-seconds", type=float, default=0.5, help="Stub time per task")
+    parser.add_argument("--tool-calls", type=int, default=20, help="Stub tool calls per task")
+    parser.add_argument("--timeout", type=float, default=120, help="Give up on a session after this long")
+    parser.add_argument("--slo-p95", type=float, default=1.0, help="Acceptable p95 rerun latency, seconds")
+    parser.add_argument("--json", dest="json_path", help="Also write the report as JSON here")
+    parser.add_argument(
+        "--identical",
+        action="store_true",
+        help="Every session submits the same campaign, so they share one run",
+    )
+    parser.add_argument(
+        "--keep-going", action="store_true", help="Run every level even after one fails"
+    )
+    args = parser.parse_args(argv)
+
+    settings = {
+        "think_time": args.think_time,
+        "task_seconds": args.task_seconds,
+        "tool_calls": args.tool_calls,
+        "timeout": args.timeout,
+        "identical": args.identical,
+    }
+    levels = []
+    for sessions in sorted(int(n) for n in args.sessions.split(",")):
+        # A fresh interpreter per level, so memory and threads start from zero
+        with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as executor:
+            level = executor.submit(run_level, sessions, settings).result()
+        levels.append(level)
+        print(
+            f"{sessions} session(s): p95 {level['rerun_p95']:.3f}s, "
+            f"{level['mb_per_session']:.1f} MB/session, {level['peak_threads']} threads",
+            flush=True,
+        )
+        if level["rerun_p95"] > args.slo_p95 and not args.keep_going:
+            break
+
+    report = capacity_report(levels, args.slo_p95)
+    print()
+    print(format_report(report))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
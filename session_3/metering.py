@@ -0,0 +1,261 @@
+# metering.py
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Union
+
+from crewai import BaseLLM
+from crewai.utilities.events import (
+    ToolUsageErrorEvent,
+    ToolUsageFinishedEvent,
+    crewai_event_bus,
+)
+from pydantic import BaseModel, Field
+
+from model_routing import LLMWrapper, UsageCapture
+
+# One JSON line per finished run
+LEDGER_PATH = os.getenv("CREW_LEDGER_PATH", os.path.join(".crew_state", "ledger.jsonl"))
+
+# Attributed to the crew's planning step, which runs outside any task
+PLANNING = "(planning)"
+
+
+class RunBudget(BaseModel):
+    """Limits for a single run; a run over any of them is aborted"""
+
+    max_cost_usd: Optional[float] = Field(default=None, description="Estimated spend in USD")
+    max_tokens: Optional[int] = Field(default=None, description="Prompt plus completion tokens")
+    max_tool_calls: Optional[int] = Field(default=None, description="Tool calls of any kind")
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised before an LLM call once the run has used up its budget"""
+
+
+def _counters() -> Dict[str, Union[int, float]]:
+    return {
+        "llm_calls": 0,
+        "prompt_tokens": 0,
+        "cached_tokens": 0,
+        "completion_tokens": 0,
+        "tool_calls": 0,
+        "tool_errors": 0,
+        "cost_usd": 0.0,
+    }
+
+
+class UsageLedger:
+    """
+    Token, tool-call and cost accounting for a crew's runs.
+
+    LLM usage arrives through MeteredLLM and tool calls through crewai's
+    tool events. Everything is attributed to the run, the agent and the
+    task, checked against the run's budget, and appended to the ledger
+    file when the run closes.
+    """
+
+    def __init__(
+        self,
+        pricing: Optional[Dict[str, Dict[str, float]]] = None,
+        tool_pricing: Optional[Dict[str, float]] = None,
+        cached_input_discount: float = 1.0,
+        path: str = LEDGER_PATH,
+    ):
+        self.pricing = pricing or {}
+        self.tool_pricing = tool_pricing or {}
+        self.cached_input_discount = cached_input_discount
+        self.path = path
+        self._lock = threading.Lock()
+        self.begin()
+
+    def begin(self, execution_id: Optional[str] = None, budget: Optional[RunBudget] = None):
+        """Start accounting a new run"""
+        with self._lock:
+            self.execution_id = execution_id
+            self.budget = budget or RunBudget()
+            self.started_at = datetime.now().isoformat()
+            self._totals = _counters()
+            self._agents: Dict[str, Dict[str, Any]] = {}
+            self._tasks: Dict[str, Dict[str, Any]] = {}
+            self._models: Dict[str, Dict[str, Any]] = {}
+
+    def _add(self, keys: Dict[str, str], **amounts: Union[int, float]):
+        # Caller holds the lock
+        targets = [self._totals]
+        for scope, key in keys.items():
+            targets.append(getattr(self, f"_{scope}").setdefault(key, _counters()))
+        for target in targets:
+            for counter, amount in amounts.items():
+                target[counter] += amount
+
+    def record_llm(self, agent: str, task: str, model: str, usage: UsageCapture):
+        """Account one LLM request: a call, or one of its drafts, hedges or retries"""
+        model = usage.model or model
+        prices = self.pricing.get(model, {})
+        uncached = usage.prompt_tokens - usage.cached_tokens
+        cost = (
+            uncached * prices.get("input", 0)
+            + usage.cached_tokens * prices.get("input", 0) * self.cached_input_discount
+            + usage.completion_tokens * prices.get("output", 0)
+        ) / 1_000_000
+        with self._lock:
+            self._add(
+                {"agents": agent, "tasks": task, "models": model},
+                llm_calls=1,
+                prompt_tokens=usage.prompt_tokens,
+                cached_tokens=usage.cached_tokens,
+                completion_tokens=usage.completion_tokens,
+                cost_usd=cost,
+            )
+
+    def record_tool(self, agent: str, task: str, tool_name: str, error: bool = False):
+        """Account one tool call; paid tools add their per-call price"""
+        with self._lock:
+            self._add(
+                {"agents": agent, "tasks": task},
+                tool_calls=1,
+                tool_errors=1 if error else 0,
+                cost_usd=self.tool_pricing.get(tool_name, 0.0),
+            )
+
+    def check(self):
+        """
+        Raises:
+            BudgetExceededError: If the run is over any of its limits
+        """
+        with self._lock:
+            totals, budget = dict(self._totals), self.budget
+        tokens = totals["prompt_tokens"] + totals["completion_tokens"]
+        if budget.max_cost_usd is not None and totals["cost_usd"] >= budget.max_cost_usd:
+            raise BudgetExceededError(
+                f"Run budget exceeded: ${totals['cost_usd']:.4f} of ${budget.max_cost_usd:.4f} spent"
+            )
+        if budget.max_tokens is not None and tokens >= budget.max_tokens:
+            raise BudgetExceededError(
+                f"Run budget exceeded: {tokens} of {budget.max_tokens} tokens used"
+            )
+        if budget.max_tool_calls is not None and totals["tool_calls"] > budget.max_tool_calls:
+            raise BudgetExceededError(
+                f"Run budget exceeded: {totals['tool_calls']} of {budget.max_tool_calls} tool calls made"
+            )
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals for the run, broken down per agent, task and model"""
+        with self._lock:
+            return {
+                "execution_id": self.execution_id,
+                "started_at": self.started_at,
+                "budget": self.budget.model_dump(),
+                "totals": dict(self._totals),
+                "agents": {k: dict(v) for k, v in self._agents.items()},
+                "tasks": {k: dict(v) for k, v in self._tasks.items()},
+                "models": {k: dict(v) for k, v in self._models.items()},
+            }
+
+    def close(self, status: str = "completed") -> Dict[str, Any]:
+        """Append the run to the ledger file and return its summary"""
+        entry = {**self.summary(), "status": status, "finished_at": datetime.now().isoformat()}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        return entry
+
+
+def recent_runs(limit: int = 20, path: str = LEDGER_PATH) -> List[Dict[str, Any]]:
+    """The last ``limit`` runs recorded in the ledger, newest first"""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.readlines()[-limit:]
+    runs = []
+    for line in reversed(lines):
+        try:
+            runs.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return runs
+
+
+class MeteredLLM(LLMWrapper):
+    """
+    Records every call's usage in a ledger and stops calling once over budget.
+
+    Each request a call makes is recorded as soon as it completes, so the
+    drafts that lost and hedges that finish after the call returned are
+    paid for too.
+    """
+
+    def __init__(self, inner: BaseLLM, ledger: UsageLedger):
+        super().__init__(inner)
+        self.ledger = ledger
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Union[str, Any]:
+        self.ledger.check()
+        # crewai's executor passes the task but not always the agent
+        agent = _agent_name(from_agent or getattr(from_task, "agent", None))
+        task = _task_name(from_task)
+        model = self.inner.model
+        usage = UsageCapture(
+            on_usage=lambda request: self.ledger.record_llm(agent, task, model, request)
+        )
+        try:
+            return super().call(
+                messages,
+                tools,
+                list(callbacks or []) + [usage],
+                available_functions,
+                from_task,
+                from_agent,
+            )
+        finally:
+            if not usage.requests:
+                # Nothing reported usage (a failure, or a provider without it); count the call
+                self.ledger.record_llm(agent, task, model, usage)
+
+
+def _agent_name(agent: Any) -> str:
+    role = getattr(agent, "_original_role", None) or getattr(agent, "role", None)
+    return role.strip() if role else "unknown"
+
+
+def _task_name(task: Any) -> str:
+    return getattr(task, "name", None) or PLANNING
+
+
+def _ledger_for(agent: Any) -> Optional[UsageLedger]:
+    # Agents of a metered crew carry their ledger on their LLM
+    return getattr(getattr(agent, "llm", None), "ledger", None)
+
+
+@crewai_event_bus.on(ToolUsageFinishedEvent)
+def _on_tool_finished(source, event):
+    ledger = _ledger_for(getattr(source, "agent", None))
+    if ledger is not None and not event.from_cache:
+        ledger.record_tool(
+            _agent_name(source.agent), _task_name(getattr(source, "task", None)), event.tool_name
+        )
+
+
+@crewai_event_bus.on(ToolUsageErrorEvent)
+def _on_tool_error(source, event):
+    ledger = _ledger_for(getattr(source, "agent", None))
+    if ledger is not None:
+        ledger.record_tool(
+            _agent_name(source.agent),
+            _task_name(getattr(source, "task", None)),
+            event.tool_name,
+            error=True,
+        )
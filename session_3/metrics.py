@@ -0,0 +1,322 @@
+# metrics.py
+
+import math
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from crewai.utilities.events import (
+    CrewKickoffCompletedEvent,
+    CrewKickoffFailedEvent,
+    CrewKickoffStartedEvent,
+    LLMCallCompletedEvent,
+    LLMCallFailedEvent,
+    TaskCompletedEvent,
+    TaskFailedEvent,
+    TaskStartedEvent,
+    ToolUsageErrorEvent,
+    ToolUsageFinishedEvent,
+)
+from crewai.utilities.events.base_event_listener import BaseEventListener
+from crewai.utilities.events.base_events import BaseEvent
+
+METRICS_HOST = os.getenv("CREW_METRICS_HOST", "127.0.0.1")
+# 0 disables the endpoint
+METRICS_PORT = int(os.getenv("CREW_METRICS_PORT", "9464"))
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Task latency buckets, in seconds
+TASK_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1200)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# name: (type, help, histogram buckets)
+FAMILIES: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {
+    "crew_runs_started": ("counter", "Crew kickoffs started", ()),
+    "crew_runs_finished": ("counter", "Crew kickoffs finished, by status", ()),
+    "crew_active_runs": ("gauge", "Crew kickoffs running in this process", ()),
+    "crew_task_duration_seconds": ("histogram", "Task execution time", TASK_BUCKETS),
+    "crew_tasks_finished": ("counter", "Tasks finished, by task and status", ()),
+    "crew_llm_calls": ("counter", "LLM calls, by model and status", ()),
+    "crew_llm_rate_limited": ("counter", "LLM calls rejected with HTTP 429", ()),
+    "crew_llm_hedges": ("counter", "Hedged LLM requests, by model and outcome", ()),
+    "crew_task_slo_breaches": ("counter", "Tasks that finished past their latency SLO", ()),
+    "crew_tool_calls": ("counter", "Tool calls, by tool and status", ()),
+    "crew_http_requests": ("counter", "HTTP requests on the shared pool, by client and host", ()),
+    "crew_http_connections_opened": ("counter", "New pooled connections, by client and host", ()),
+    "crew_cache_lookups": ("counter", "Cache lookups, by cache and result", ()),
+    "crew_events": ("counter", "Events seen on the crewai event bus, by type", ()),
+    "crew_pool_queue_depth": ("gauge", "Jobs waiting for a worker process", ()),
+    "crew_pool_active_jobs": ("gauge", "Jobs running in worker processes", ()),
+}
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _format_value(value: Any) -> str:
+    """Exact sample value: integers as they are, floats at full precision"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+class MetricsRegistry:
+    """
+    Counters, gauges and histograms rendered in the OpenMetrics text format.
+
+    Recording is a dict update under a lock, so it is cheap enough to do
+    inline in event handlers. Values that already live elsewhere (like
+    the process pool's queue) are read through callbacks at scrape time
+    instead of being recorded. Worker processes ``drain`` what they
+    recorded and the parent ``merge``s it, so one endpoint covers the pool.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], List[float]] = {}
+        self._callbacks: Dict[str, Callable[[], Optional[float]]] = {}
+
+    def inc(self, name: str, amount: float = 1, **labels: Any):
+        """Add to a counter, or adjust a gauge"""
+        key = (name, _labels(labels))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels: Any):
+        """Record a histogram observation"""
+        buckets = FAMILIES[name][2]
+        key = (name, _labels(labels))
+        with self._lock:
+            # Per-bucket counts (last one is +Inf), then sum and count
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(buckets) + 3)
+            histogram[bisect_left(buckets, value)] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def callback(self, name: str, read: Callable[[], Optional[float]]):
+        """Read a gauge from ``read`` at scrape time; None drops the sample"""
+        with self._lock:
+            self._callbacks[name] = read
+
+    def drain(self) -> Dict[str, Any]:
+        """Everything recorded since the last drain, resetting it"""
+        with self._lock:
+            values, self._values = self._values, {}
+            histograms, self._histograms = self._histograms, {}
+        return {"values": values, "histograms": histograms}
+
+    def merge(self, snapshot: Dict[str, Any]):
+        """Add a drained snapshot from another process"""
+        with self._lock:
+            for key, amount in snapshot["values"].items():
+                self._values[key] = self._values.get(key, 0) + amount
+            for key, counts in snapshot["histograms"].items():
+                histogram = self._histograms.setdefault(key, [0] * len(counts))
+                for index, count in enumerate(counts):
+                    histogram[index] += count
+
+    def render(self) -> str:
+        """The registry in OpenMetrics text format"""
+        with self._lock:
+            values = dict(self._values)
+            histograms = {key: list(counts) for key, counts in self._histograms.items()}
+            callbacks = dict(self._callbacks)
+        for name, read in callbacks.items():
+            try:
+                value = read()
+            except Exception:
+                value = None
+            if value is not None:
+                values[(name, ())] = value
+
+        lines = []
+        for name, (kind, help_text, buckets) in FAMILIES.items():
+            samples = sorted((labels, v) for (n, labels), v in values.items() if n == name)
+            series = sorted((labels, c) for (n, labels), c in histograms.items() if n == name)
+            if not samples and not series:
+                continue
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"# HELP {name} {help_text}")
+            suffix = "_total" if kind == "counter" else ""
+            for labels, value in samples:
+                lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+            for labels, counts in series:
+                cumulative = 0
+                for bound, count in zip(list(buckets) + ["+Inf"], counts):
+                    cumulative += count
+                    le = (("le", str(float(bound)) if bound != "+Inf" else bound),)
+                    lines.append(f"{name}_bucket{_format_labels(labels, le)} {_format_value(cumulative)}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(counts[-2])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {_format_value(counts[-1])}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+# Shared by everything in this process
+metrics = MetricsRegistry()
+
+
+def _is_rate_limit(error: Any) -> bool:
+    text = str(error)
+    return "429" in text or "RateLimit" in text or "RESOURCE_EXHAUSTED" in text
+
+
+class CrewMetricsListener(BaseEventListener):
+    """Feeds the metrics registry from crewai's event bus"""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self._task_started: Dict[int, int] = {}
+        super().__init__()
+
+    def _task_name(self, event: Any) -> str:
+        task = getattr(event, "task", None)
+        return getattr(task, "name", None) or "unknown"
+
+    def _task_seconds(self, event: Any) -> Optional[float]:
+        started = self._task_started.pop(id(getattr(event, "task", None)), None)
+        return None if started is None else (time.perf_counter_ns() - started) / 1e9
+
+    def setup_listeners(self, crewai_event_bus):
+        registry = self.registry
+
+        @crewai_event_bus.on(BaseEvent)
+        def on_any_event(source, event):
+            registry.inc("crew_events", type=event.type)
+
+        @crewai_event_bus.on(CrewKickoffStartedEvent)
+        def on_crew_started(source, event):
+            registry.inc("crew_runs_started")
+            registry.inc("crew_active_runs")
+
+        @crewai_event_bus.on(CrewKickoffCompletedEvent)
+        def on_crew_completed(source, event):
+            registry.inc("crew_runs_finished", status="completed")
+            registry.inc("crew_active_runs", -1)
+
+        @crewai_event_bus.on(CrewKickoffFailedEvent)
+        def on_crew_failed(source, event):
+            registry.inc("crew_runs_finished", status="failed")
+            registry.inc("crew_active_runs", -1)
+
+        @crewai_event_bus.on(TaskStartedEvent)
+        def on_task_started(source, event):
+            self._task_started[id(event.task)] = time.perf_counter_ns()
+
+        @crewai_event_bus.on(TaskCompletedEvent)
+        def on_task_completed(source, event):
+            name = self._task_name(event)
+            seconds = self._task_seconds(event)
+            if seconds is not None:
+                registry.observe("crew_task_duration_seconds", seconds, task=name)
+            registry.inc("crew_tasks_finished", task=name, status="completed")
+
+        @crewai_event_bus.on(TaskFailedEvent)
+        def on_task_failed(source, event):
+            name = self._task_name(event)
+            self._task_seconds(event)
+            registry.inc("crew_tasks_finished", task=name, status="failed")
+
+        @crewai_event_bus.on(LLMCallCompletedEvent)
+        def on_llm_completed(source, event):
+            registry.inc("crew_llm_calls", model=event.model or "unknown", status="completed")
+
+        @crewai_event_bus.on(LLMCallFailedEvent)
+        def on_llm_failed(source, event):
+            model = getattr(source, "model", None) or "unknown"
+            registry.inc("crew_llm_calls", model=model, status="failed")
+            if _is_rate_limit(event.error):
+                registry.inc("crew_llm_rate_limited", model=model)
+
+        @crewai_event_bus.on(ToolUsageFinishedEvent)
+        def on_tool_finished(source, event):
+            registry.inc(
+                "crew_tool_calls",
+                tool=event.tool_name,
+                status="cached" if event.from_cache else "completed",
+            )
+
+        @crewai_event_bus.on(ToolUsageErrorEvent)
+        def on_tool_error(source, event):
+            registry.inc("crew_tool_calls", tool=event.tool_name, status="failed")
+
+
+# Registered once per process, on first import
+metrics_listener = CrewMetricsListener(metrics)
+
+
+def track_pool(pool: Any):
+    """Expose a CrewProcessPool's queue depth and active jobs"""
+    ref = weakref.ref(pool)
+    metrics.callback("crew_pool_queue_depth", lambda: ref() and ref().queue_depth)
+    metrics.callback("crew_pool_active_jobs", lambda: ref() and ref().active_jobs)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would otherwise flood stderr
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(
+    host: str = METRICS_HOST, port: int = METRICS_PORT
+) -> Optional[ThreadingHTTPServer]:
+    """
+    Serve /metrics from a daemon thread; safe to call on every rerun.
+
+    Returns:
+        Optional[ThreadingHTTPServer]: The server, or None when disabled or
+        the port is taken (e.g. by another dashboard process)
+    """
+    global _server
+    with _server_lock:
+        if _server is not None or not port:
+            return _server
+        try:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError:
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, daemon=True).start()
+        return _server
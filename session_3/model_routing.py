@@ -0,0 +1,331 @@
+# model_routing.py
+
+import copy
+import os
+import threading
+import time
+from typing import Callable, Dict, Any, List, Optional, Union
+
+import yaml
+from crewai import LLM, BaseLLM
+from crewai.utilities.exceptions.context_window_exceeding_exception import (
+    LLMContextLengthExceededException,
+)
+from litellm.exceptions import RateLimitError
+from litellm.integrations.custom_logger import CustomLogger
+
+from http_pool import HttpPoolConfig, http_pool
+
+MODELS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "models.yaml")
+
+
+class UsageCapture(CustomLogger):
+    """
+    Collects the token usage crewai reports for a single LLM call.
+
+    A call can make several requests (drafts, hedges, retries), possibly
+    concurrently; their usage is summed. ``on_usage`` additionally receives
+    each request's own usage as soon as that request completes.
+    """
+
+    def __init__(self, on_usage: Optional[Callable[["UsageCapture"], None]] = None):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.model: Optional[str] = None
+        self.requests = 0
+        self.on_usage = on_usage
+        self._lock = threading.Lock()
+
+    def log_success_event(self, kwargs, response_obj, start_time, end_time):
+        # crewai passes {"usage": ...}; litellm's own logging passes the response
+        if not isinstance(response_obj, dict) or not response_obj.get("usage"):
+            return
+        usage = response_obj["usage"]
+        details = getattr(usage, "prompt_tokens_details", None)
+        request = UsageCapture()
+        request.model = (kwargs or {}).get("model")
+        request.prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        request.completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        request.cached_tokens = getattr(details, "cached_tokens", 0) or 0
+        request.requests = 1
+        with self._lock:
+            self.model = request.model or self.model
+            self.prompt_tokens += request.prompt_tokens
+            self.completion_tokens += request.completion_tokens
+            self.cached_tokens += request.cached_tokens
+            self.requests += 1
+        if self.on_usage is not None:
+            self.on_usage(request)
+
+
+class LLMWrapper(BaseLLM):
+    """
+    LLM that delegates to another LLM.
+
+    Subclasses override ``call`` to add behaviour around the wrapped model
+    while crewai keeps seeing an ordinary BaseLLM.
+    """
+
+    def __init__(self, inner: BaseLLM):
+        super().__init__(model=inner.model, temperature=inner.temperature)
+        self.inner = inner
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Union[str, Any]:
+        # The agent executor sets stop words on the LLM it was given
+        self.inner.stop = self.stop
+        return self.inner.call(
+            messages,
+            tools=tools,
+            callbacks=callbacks,
+            available_functions=available_functions,
+            from_task=from_task,
+            from_agent=from_agent,
+        )
+
+    def supports_function_calling(self) -> bool:
+        return self.inner.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size()
+
+
+class RouteStats:
+    """Per route/model latency, token and cost statistics of one crew's calls"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def record(
+        self,
+        route: str,
+        model: str,
+        seconds: float,
+        usage: UsageCapture,
+        cost: float,
+        error: bool = False,
+        fallback: bool = False,
+    ):
+        with self._lock:
+            stats = self._stats.setdefault(
+                f"{route} / {model}",
+                {
+                    "calls": 0,
+                    "errors": 0,
+                    "fallbacks": 0,
+                    "seconds": 0.0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "cost_usd": 0.0,
+                },
+            )
+            stats["calls"] += 1
+            stats["errors"] += 1 if error else 0
+            stats["fallbacks"] += 1 if fallback else 0
+            stats["seconds"] += seconds
+            stats["prompt_tokens"] += usage.prompt_tokens
+            stats["completion_tokens"] += usage.completion_tokens
+            stats["cost_usd"] += cost
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Stats keyed by 'route / model', with average latency per call"""
+        with self._lock:
+            return {
+                key: {**stats, "avg_seconds": stats["seconds"] / stats["calls"]}
+                for key, stats in self._stats.items()
+            }
+
+
+class ModelRouter:
+    """
+    Hands out routed LLMs configured in config/models.yaml.
+
+    Also keeps what the routes have in common across crews: models cooling
+    down after a rate limit. Latency, token and cost statistics belong to
+    the RouteStats each crew passes in, so a run reports only its calls.
+    """
+
+    def __init__(self, path: str = MODELS_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+        self.routes: Dict[str, Dict[str, Any]] = config.get("routes", {})
+        self.default_route: str = config.get("default_route", next(iter(self.routes), ""))
+        self.cooldown_seconds: float = config.get("cooldown_seconds", 30)
+        self.pricing: Dict[str, Dict[str, float]] = config.get("pricing", {})
+        self.prompt_cache: Dict[str, Any] = config.get("prompt_cache", {})
+        self.hedging: Dict[str, Any] = config.get("hedging", {})
+        http_pool.configure(HttpPoolConfig(**config.get("http_pool", {})))
+        self.tool_pricing: Dict[str, float] = config.get("tool_pricing", {})
+        self._lock = threading.Lock()
+        self._cooling_until: Dict[str, float] = {}
+
+    def llm(
+        self,
+        route: Optional[str] = None,
+        tasks_config: Optional[Dict[str, Any]] = None,
+        stats: Optional[RouteStats] = None,
+    ) -> "RoutedLLM":
+        """
+        Create an LLM for an agent or for planning.
+
+        Args:
+            route: The agent's route; the default route when omitted
+            tasks_config: Loaded tasks.yaml, for per-task `llm_route` overrides
+            stats: Where the calls are accounted; a fresh RouteStats when omitted
+
+        Returns:
+            RoutedLLM: An LLM that picks its route per call
+        """
+        task_routes = {
+            name: task_config["llm_route"]
+            for name, task_config in (tasks_config or {}).items()
+            if isinstance(task_config, dict) and task_config.get("llm_route")
+        }
+        return RoutedLLM(self, route or self.default_route, task_routes, stats)
+
+    def chain(self, route: str) -> List[LLM]:
+        """Fresh LLM instances for a route's fallback chain"""
+        if route not in self.routes:
+            raise ValueError(f"Unknown llm_route '{route}', expected one of {list(self.routes)}")
+        config = self.routes[route]
+        if not config.get("models"):
+            raise ValueError(f"llm_route '{route}' has no models")
+        return [
+            LLM(model=model, temperature=config.get("temperature"), **http_pool.llm_params(model))
+            for model in config.get("models", [])
+        ]
+
+    def available(self, model: str) -> bool:
+        with self._lock:
+            return self._cooling_until.get(model, 0) <= time.monotonic()
+
+    def record(
+        self,
+        stats: RouteStats,
+        route: str,
+        model: str,
+        seconds: float,
+        usage: UsageCapture,
+        error: Optional[Exception] = None,
+        fallback: bool = False,
+    ):
+        """Account one attempt on a route in ``stats``; rate-limited models cool down"""
+        prices = self.pricing.get(model, {})
+        cost = (
+            usage.prompt_tokens * prices.get("input", 0)
+            + usage.completion_tokens * prices.get("output", 0)
+        ) / 1_000_000
+        if isinstance(error, RateLimitError):
+            with self._lock:
+                self._cooling_until[model] = time.monotonic() + self.cooldown_seconds
+        stats.record(route, model, seconds, usage, cost, error is not None, fallback)
+
+
+class RoutedLLM(LLMWrapper):
+    """Sends each call down the route of the task being executed, with fallbacks"""
+
+    def __init__(
+        self,
+        router: ModelRouter,
+        route: str,
+        task_routes: Dict[str, str],
+        stats: Optional[RouteStats] = None,
+    ):
+        self.router = router
+        self.route = route
+        self.task_routes = task_routes
+        self.stats = stats or RouteStats()
+        self.chains = {
+            name: router.chain(name) for name in {route, *task_routes.values()}
+        }
+        super().__init__(self.chains[route][0])
+
+    def route_for(self, from_task: Optional[Any]) -> str:
+        name = getattr(from_task, "name", None)
+        return self.task_routes.get(name, self.route)
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Union[str, Any]:
+        route = self.route_for(from_task)
+        chain = self.chains[route]
+        # Skip models that are cooling down, unless none are left
+        candidates = [m for m in chain if self.router.available(m.model)] or chain
+
+        last_error: Optional[Exception] = None
+        for position, model in enumerate(candidates):
+            model.stop = self.stop
+            usage = UsageCapture()
+            started = time.perf_counter()
+            try:
+                result = model.call(
+                    messages,
+                    tools=tools,
+                    callbacks=list(callbacks or []) + [usage],
+                    available_functions=available_functions,
+                    from_task=from_task,
+                    from_agent=from_agent,
+                )
+            except LLMContextLengthExceededException:
+                # The agent handles this by summarizing; another model won't help
+                raise
+            except Exception as e:
+                self.router.record(
+                    self.stats, route, model.model, time.perf_counter() - started, usage, error=e
+                )
+                last_error = e
+                continue
+            self.router.record(
+                self.stats,
+                route,
+                model.model,
+                time.perf_counter() - started,
+                usage,
+                fallback=position > 0,
+            )
+            return result
+
+        raise last_error
+
+
+def fork_llm(llm: BaseLLM, timeout: Optional[float] = None) -> BaseLLM:
+    """
+    Copy of an LLM and every LLM it wraps, for one of several concurrent requests.
+
+    Per-call attributes such as ``stop`` and ``timeout`` are then the
+    request's own, while stats, caches, locks and HTTP clients stay shared.
+
+    Args:
+        llm: The LLM or wrapper to copy
+        timeout: Request timeout in seconds for the provider calls, if any
+    """
+    forked = copy.copy(llm)
+    if isinstance(llm, RoutedLLM):
+        forked.chains = {
+            route: [fork_llm(model, timeout) for model in chain]
+            for route, chain in llm.chains.items()
+        }
+        forked.inner = forked.chains[llm.route][0]
+    elif isinstance(llm, LLMWrapper):
+        forked.inner = fork_llm(llm.inner, timeout)
+    elif timeout is not None and hasattr(llm, "timeout"):
+        forked.timeout = timeout
+    return forked
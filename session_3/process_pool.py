@@ -0,0 +1,333 @@
+# process_pool.py
+
+import multiprocessing as mp
+import os
+import threading
+import uuid
+from collections import deque
+from datetime import datetime
+from multiprocessing.connection import Connection, wait
+from queue import Queue
+from typing import Dict, Any, List, Optional, Tuple
+
+import events
+from metrics import metrics, track_pool
+
+DEFAULT_WORKERS = int(os.getenv("CREW_POOL_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Keys the dashboard may set after the workers were spawned
+FORWARDED_ENV = ("GEMINI_API_KEY", "SERPER_API_KEY")
+
+
+class _PipeQueue:
+    """
+    Queue-like adapter used inside a worker process.
+
+    The listener and runner only ever call ``put``, so this forwards every
+    item to the parent over the worker's pipe, tagged with the current job.
+    """
+
+    def __init__(self, conn: Connection, kind: str, lock: threading.Lock):
+        self.conn = conn
+        self.kind = kind
+        self.job_id: Optional[str] = None
+        self._lock = lock
+
+    def put(self, item: Any):
+        # Events emitted outside of a job (e.g. while pre-building) are dropped
+        if self.job_id is None:
+            return
+        # Events are CrewEvents and results plain data, so both pickle as they are
+        with self._lock:
+            self.conn.send((self.kind, self.job_id, item))
+
+
+def _prebuild_crew():
+    """Build the crew for the next job; build errors surface when it runs"""
+    from crew import TheMarketingCrew
+
+    try:
+        return TheMarketingCrew().marketingcrew()
+    except Exception:
+        return None
+
+
+def _worker_main(conn: Connection):
+    """Entry point of a worker process: import once, then serve jobs forever"""
+    from runner import execute_crew
+    from streamlit_ui_listener import StreamlitCrewEventListener
+
+    send_lock = threading.Lock()
+    event_queue = _PipeQueue(conn, "event", send_lock)
+    result_queue = _PipeQueue(conn, "result", send_lock)
+
+    # One listener per process, so events from one run never reach another
+    listener = StreamlitCrewEventListener(event_queue)
+
+    next_crew = _prebuild_crew()
+    conn.send(("ready", None, None))
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+
+        job_id, inputs, options, env = job
+        os.environ.update(env)
+        event_queue.job_id = result_queue.job_id = job_id
+        listener.execution_id = options.get("execution_id") or job_id
+        execute_crew(inputs, event_queue, result_queue, crew=next_crew, **options)
+        event_queue.job_id = result_queue.job_id = None
+
+        # Hand what this run recorded to the parent's metrics endpoint
+        with send_lock:
+            conn.send(("metrics", None, metrics.drain()))
+
+        # Pre-build the crew for the next job while this worker is idle
+        next_crew = _prebuild_crew()
+        conn.send(("ready", None, None))
+
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.job_id: Optional[str] = None
+        self.cancelled = False
+
+
+class CrewProcessPool:
+    """
+    Runs TheMarketingCrew kickoffs in a pool of isolated worker processes.
+
+    Each worker imports the crew module and pre-builds a crew once, then
+    executes one job at a time. Events and results are forwarded to the
+    parent over a pipe and delivered to the queues given to ``submit``, so
+    callers consume them exactly like ``run_crew_in_background``. A worker
+    that crashes only fails the job it was running and is replaced.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS):
+        self._ctx = mp.get_context("spawn")
+        self._lock = threading.Lock()
+        self._pending: deque = deque()
+        self._jobs: Dict[str, Tuple[Queue, Queue]] = {}
+        self._closed = False
+
+        self._wake_reader, self._wake_writer = self._ctx.Pipe(duplex=False)
+        self._workers: List[_Worker] = [_Worker(self._ctx) for _ in range(workers)]
+
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self._dispatcher.start()
+        track_pool(self)
+
+    def submit(
+        self,
+        inputs: Dict[str, Any],
+        event_queue: Optional[Queue] = None,
+        result_queue: Optional[Queue] = None,
+        **options: Any,
+    ) -> str:
+        """
+        Queue a crew run on the pool.
+
+        Args:
+            inputs: Campaign inputs, the same dict passed to run_crew_in_background
+            event_queue: Queue receiving execution log events
+            result_queue: Queue receiving the final success or error payload
+            **options: Run options forwarded to execute_crew, e.g. incremental
+
+        Returns:
+            str: The job id, usable with cancel()
+        """
+        if self._closed:
+            raise RuntimeError("Process pool has been shut down")
+
+        job_id = str(uuid.uuid4())
+        with self._lock:
+            self._jobs[job_id] = (event_queue or Queue(), result_queue or Queue())
+            self._pending.append((job_id, inputs, options))
+        self._wake()
+        return job_id
+
+    def map(self, inputs_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run a batch of campaigns and block until every result is available"""
+        result_queues = [Queue() for _ in inputs_list]
+        for inputs, result_queue in zip(inputs_list, result_queues):
+            self.submit(inputs, Queue(), result_queue)
+        return [result_queue.get() for result_queue in result_queues]
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        A running job is stopped by terminating its worker, which is then
+        replaced like any other crashed worker.
+
+        Returns:
+            bool: True if the job was found and cancelled
+        """
+        with self._lock:
+            for pending in list(self._pending):
+                if pending[0] == job_id:
+                    self._pending.remove(pending)
+                    self._finish(job_id, "Execution cancelled")
+                    return True
+            for worker in self._workers:
+                if worker.job_id == job_id:
+                    worker.cancelled = True
+                    worker.process.terminate()
+                    return True
+        return False
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a free worker"""
+        return len(self._pending)
+
+    @property
+    def active_jobs(self) -> int:
+        """Number of jobs currently executing"""
+        return sum(1 for worker in self._workers if worker.job_id is not None)
+
+    def shutdown(self):
+        """Stop all workers; queued jobs are failed"""
+        with self._lock:
+            self._closed = True
+            while self._pending:
+                self._finish(self._pending.popleft()[0], "Process pool shut down")
+        self._wake()
+        self._dispatcher.join(timeout=5)
+        for worker in self._workers:
+            try:
+                worker.conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+
+    def _wake(self):
+        try:
+            self._wake_writer.send_bytes(b"")
+        except OSError:
+            pass
+
+    def _finish(self, job_id: str, error: str):
+        """Fail a job that will never produce a result of its own"""
+        event_queue, result_queue = self._jobs.pop(job_id, (None, None))
+        if result_queue is None:
+            return
+        event_queue.put(events.error(error))
+        result_queue.put(
+            {"success": False, "error": error, "timestamp": datetime.now().isoformat()}
+        )
+
+    def _dispatch_loop(self):
+        while not self._closed:
+            waitables = [self._wake_reader]
+            for worker in self._workers:
+                waitables += [worker.conn, worker.process.sentinel]
+
+            for ready in wait(waitables):
+                if ready is self._wake_reader:
+                    self._wake_reader.recv_bytes()
+                    continue
+                for worker in list(self._workers):
+                    if ready is worker.conn:
+                        self._receive(worker)
+                    elif ready is worker.process.sentinel:
+                        self._replace(worker)
+
+            self._assign()
+
+    def _receive(self, worker: _Worker) -> bool:
+        """Handle one message from a worker; False once its pipe is closed"""
+        try:
+            kind, job_id, payload = worker.conn.recv()
+        except (EOFError, OSError):
+            return False  # the sentinel reports the crash
+
+        if kind == "ready":
+            worker.ready = True
+            return True
+        if kind == "metrics":
+            metrics.merge(payload)
+            return True
+
+        with self._lock:
+            queues = self._jobs.get(job_id)
+            if queues is None:
+                return True
+            if kind == "event":
+                queues[0].put(payload)
+            elif kind == "result":
+                self._jobs.pop(job_id)
+                worker.job_id = None
+                queues[1].put(payload)
+        return True
+
+    def _replace(self, worker: _Worker):
+        # Drain whatever the worker managed to send before it died; a closed
+        # pipe stays readable, so stop at its EOF
+        while worker.conn.poll():
+            if not self._receive(worker):
+                break
+
+        exitcode = worker.process.exitcode
+        with self._lock:
+            if worker.job_id is not None:
+                self._finish(
+                    worker.job_id,
+                    "Execution cancelled"
+                    if worker.cancelled
+                    else f"Worker process exited unexpectedly (exit code {exitcode})",
+                )
+            worker.conn.close()
+            index = self._workers.index(worker)
+            self._workers[index] = _Worker(self._ctx)
+
+    def _assign(self):
+        with self._lock:
+            for worker in self._workers:
+                if not self._pending:
+                    return
+                if worker.ready and worker.job_id is None:
+                    job_id, inputs, options = self._pending.popleft()
+                    env = {
+                        key: os.environ[key] for key in FORWARDED_ENV if key in os.environ
+                    }
+                    worker.ready = False
+                    worker.job_id = job_id
+                    worker.conn.send((job_id, inputs, options, env))
+
+
+if __name__ == "__main__":
+    base_inputs = {
+        "product_name": "AI Powered Excel Automation Tool",
+        "target_audience": "Small and Medium Enterprises (SMEs)",
+        "product_description": "A tool that automates repetitive tasks in Excel using AI, saving time and reducing errors.",
+        "current_date": datetime.now().strftime("%Y-%m-%d"),
+        "industry": "Business Software",
+        "campaign_duration": "3 months",
+        "primary_goal": "Lead generation and brand awareness",
+        "location": "Ho Chi Minh City, Vietnam",
+    }
+    batch = [
+        {**base_inputs, "budget": budget}
+        for budget in ["Rs. 50,000", "Rs. 100,000", "Rs. 200,000"]
+    ]
+
+    pool = CrewProcessPool(workers=len(batch))
+    try:
+        for inputs, result in zip(batch, pool.map(batch)):
+            status = "succeeded" if result["success"] else f"failed: {result['error']}"
+            print(f"Campaign with budget {inputs['budget']} {status}")
+    finally:
+        pool.shutdown()
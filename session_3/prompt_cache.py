@@ -0,0 +1,219 @@
+# prompt_cache.py
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Union
+
+from crewai import BaseLLM
+from pydantic import BaseModel, Field
+
+from metrics import metrics
+from model_routing import LLMWrapper, UsageCapture
+
+
+# Provider errors that reject the cache markers themselves rather than the request
+_CACHE_REJECTION = re.compile(
+    r"cache_control|cached[_ ]?content|context caching|cach(?:e|ing) (?:is )?not supported",
+    re.IGNORECASE,
+)
+
+
+class PromptCacheConfig(BaseModel):
+    """Prompt-prefix caching settings, set under `prompt_cache` in models.yaml"""
+
+    mode: str = Field(
+        default="simulate", description="provider, simulate (local accounting only) or off"
+    )
+    min_prefix_tokens: int = Field(
+        default=4096, description="Smallest prefix worth caching; Gemini rejects smaller caches"
+    )
+    ttl: str = Field(default="600s", description="How long the provider keeps a cached prefix")
+    cached_input_discount: float = Field(
+        default=0.25, description="Share of the input price billed for cached tokens"
+    )
+
+
+def load_prompt_cache_config(config: Optional[Dict[str, Any]] = None) -> PromptCacheConfig:
+    """Settings from models.yaml; CREW_PROMPT_CACHE_MODE overrides the mode"""
+    config = dict(config or {})
+    if os.getenv("CREW_PROMPT_CACHE_MODE"):
+        config["mode"] = os.environ["CREW_PROMPT_CACHE_MODE"]
+    return PromptCacheConfig(**config)
+
+
+@dataclass
+class PromptCacheStats:
+    """Counters describing how often a crew's stable prompt prefixes were reused"""
+
+    calls: int = 0  # LLM calls seen
+    prefix_hits: int = 0  # calls whose prefix was already cached
+    prefix_misses: int = 0  # calls that had to send (and cache) the prefix
+    skipped: int = 0  # prefixes below min_prefix_tokens or rejected by the provider
+    cached_tokens: int = 0  # input tokens served from the cache
+    saved_usd: float = 0.0  # estimated input cost avoided
+    first_call_seconds: float = 0.0  # total latency of prefix misses
+    cached_call_seconds: float = 0.0  # total latency of prefix hits
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "avg_first_call_seconds": self.first_call_seconds / self.prefix_misses
+            if self.prefix_misses
+            else 0.0,
+            "avg_cached_call_seconds": self.cached_call_seconds / self.prefix_hits
+            if self.prefix_hits
+            else 0.0,
+        }
+
+
+_stats_lock = threading.Lock()
+
+
+def _record(stats: PromptCacheStats, **counters: Union[int, float]):
+    with _stats_lock:
+        for counter, amount in counters.items():
+            setattr(stats, counter, getattr(stats, counter) + amount)
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+
+
+def stable_prefix_length(messages: List[Dict[str, Any]]) -> int:
+    """
+    Number of leading messages that stay the same across an agent's iterations.
+
+    crewai starts every task with the agent's system prompt (role, goal,
+    backstory, tools) and a user message holding the task and its upstream
+    context; later iterations only append to the conversation.
+    """
+    for index, message in enumerate(messages):
+        if message.get("role") == "user":
+            return index + 1
+    return 0
+
+
+def mark_cached(messages: List[Dict[str, Any]], prefix_length: int, ttl: str) -> List[Dict[str, Any]]:
+    """Copy of the messages with the prefix marked for provider-side caching"""
+    marked = []
+    for index, message in enumerate(messages):
+        if index < prefix_length:
+            message = {
+                **message,
+                "content": [
+                    {
+                        "type": "text",
+                        "text": _text(message["content"]),
+                        "cache_control": {"type": "ephemeral", "ttl": ttl},
+                    }
+                ],
+            }
+        marked.append(message)
+    return marked
+
+
+class PrefixCachingLLM(LLMWrapper):
+    """
+    Reuses the stable prompt prefix of an agent across its iterations.
+
+    In ``provider`` mode the prefix is marked with ``cache_control`` so
+    litellm creates a Gemini cached content for it and later calls send only
+    the new messages. ``simulate`` leaves requests untouched and only
+    accounts for what caching would have saved, which keeps tests and
+    offline runs free of provider calls. A provider that rejects the cache
+    markers gets the call again without them; any other error is raised.
+    """
+
+    def __init__(
+        self,
+        inner: BaseLLM,
+        config: Optional[PromptCacheConfig] = None,
+        pricing: Optional[Dict[str, Dict[str, float]]] = None,
+        stats: Optional[PromptCacheStats] = None,
+    ):
+        super().__init__(inner)
+        self.config = config or PromptCacheConfig()
+        self.pricing = pricing or {}
+        # Shared by the LLMs of one crew, so a run reports only its own calls
+        self.stats = stats or PromptCacheStats()
+        self._lock = threading.Lock()
+        self._seen: set = set()
+        self._rejected: set = set()
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Union[str, Any]:
+        prefix_length = stable_prefix_length(messages) if isinstance(messages, list) else 0
+        if self.config.mode == "off" or not prefix_length:
+            return super().call(messages, tools, callbacks, available_functions, from_task, from_agent)
+
+        prefix = json.dumps(
+            [(m.get("role"), _text(m.get("content", ""))) for m in messages[:prefix_length]]
+        )
+        key = hashlib.sha256(prefix.encode()).hexdigest()
+        prefix_tokens = len(prefix) // 4
+        with self._lock:
+            hit = key in self._seen
+            self._seen.add(key)
+            rejected = key in self._rejected
+
+        _record(self.stats, calls=1)
+        if prefix_tokens < self.config.min_prefix_tokens or rejected:
+            _record(self.stats, skipped=1)
+            return super().call(messages, tools, callbacks, available_functions, from_task, from_agent)
+
+        usage = UsageCapture()
+        callbacks = list(callbacks or []) + [usage]
+        started = time.perf_counter()
+        if self.config.mode == "provider":
+            try:
+                result = super().call(
+                    mark_cached(messages, prefix_length, self.config.ttl),
+                    tools,
+                    callbacks,
+                    available_functions,
+                    from_task,
+                    from_agent,
+                )
+            except Exception as e:
+                if not _CACHE_REJECTION.search(str(e)):
+                    raise
+                # Caching is an optimization: retry once without it
+                with self._lock:
+                    self._rejected.add(key)
+                _record(self.stats, skipped=1)
+                return super().call(messages, tools, callbacks, available_functions, from_task, from_agent)
+            cached_tokens = usage.cached_tokens
+            hit = cached_tokens > 0
+        else:
+            result = super().call(messages, tools, callbacks, available_functions, from_task, from_agent)
+            cached_tokens = prefix_tokens if hit else 0
+
+        elapsed = time.perf_counter() - started
+        input_price = self.pricing.get(self.inner.model, {}).get("input", 0)
+        saved = cached_tokens * input_price * (1 - self.config.cached_input_discount) / 1_000_000
+        metrics.inc("crew_cache_lookups", cache="prompt_prefix", result="hit" if hit else "miss")
+        if hit:
+            _record(
+                self.stats,
+                prefix_hits=1,
+                cached_tokens=cached_tokens,
+                saved_usd=saved,
+                cached_call_seconds=elapsed,
+            )
+        else:
+            _record(self.stats, prefix_misses=1, first_call_seconds=elapsed)
+        return result
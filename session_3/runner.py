@@ -0,0 +1,271 @@
+# runner.py
+
+from datetime import datetime
+from queue import Queue
+from typing import Dict, Any, Optional
+
+from crewai import Crew
+
+from artifacts import ArtifactStore
+from cassettes import Cassette, CassetteConfig
+from config_registry import config_registry
+from crew import TheMarketingCrew
+import events
+from incremental import TaskOutputCache, kickoff_incremental, plan_rerun
+from metering import MeteredLLM, RunBudget, UsageLedger
+from model_routing import RoutedLLM
+from hedging import HedgedLLM, enable_hedging
+from http_pool import http_pool
+from prompt_cache import PrefixCachingLLM
+from speculative import SpeculativeLLM, enable_speculative_drafting
+from sweep import run_sweep
+from streamlit_ui_listener import StreamlitCrewEventListener
+
+# Global variable to keep event listener in memory (required by CrewAI)
+streamlit_listener = None
+
+
+def serialize_result(result: Any) -> Any:
+    """Convert a CrewOutput into something that can be queued or pickled"""
+    if hasattr(result, "raw"):
+        return result.raw
+    elif hasattr(result, "dict"):
+        return result.dict()
+    return str(result)
+
+
+def task_outputs(result: Any) -> Dict[str, str]:
+    """Raw output of each task in a CrewOutput, keyed by task name"""
+    return {
+        output.name or f"task_{index + 1}": output.raw
+        for index, output in enumerate(getattr(result, "tasks_output", None) or [])
+    }
+
+
+def delegation_summary(crew: Crew) -> Dict[str, Any]:
+    """Delegation metrics recorded by the guard shared by the crew's agents"""
+    for crew_agent in crew.agents:
+        guard = getattr(crew_agent, "delegation_guard", None)
+        if guard is not None:
+            return guard.summary()
+    return {}
+
+
+def tool_memo_summary(crew: Crew) -> Dict[str, Any]:
+    """Counters of the tool memo shared by the crew's file tools"""
+    for crew_agent in crew.agents:
+        for tool in crew_agent.tools or []:
+            memo = getattr(tool, "memo", None)
+            if memo is not None:
+                return memo.summary()
+    return {}
+
+
+def artifact_store(crew: Crew) -> Optional[ArtifactStore]:
+    """The artifact store shared by the crew's file tools"""
+    for crew_agent in crew.agents:
+        for tool in crew_agent.tools or []:
+            artifacts = getattr(tool, "artifacts", None)
+            if artifacts is not None:
+                return artifacts
+    return None
+
+
+def wrapped_llm(crew: Crew, wrapper: type) -> Optional[Any]:
+    """The first LLM of type ``wrapper`` in the chains of the crew's agents"""
+    for crew_agent in crew.agents:
+        llm = crew_agent.llm
+        while llm is not None:
+            if isinstance(llm, wrapper):
+                return llm
+            llm = getattr(llm, "inner", None)
+    return None
+
+
+def llm_stats(crew: Crew, wrapper: type) -> Dict[str, Any]:
+    """Summary of the stats the crew's ``wrapper`` LLMs share, empty without one"""
+    llm = wrapped_llm(crew, wrapper)
+    return llm.stats.summary() if llm is not None else {}
+
+
+def usage_ledger(crew: Crew) -> Optional[UsageLedger]:
+    """The usage ledger the crew's agents meter their LLM calls into"""
+    for crew_agent in crew.agents:
+        ledger = getattr(crew_agent.llm, "ledger", None)
+        if ledger is not None:
+            return ledger
+    return None
+
+
+def meter_into(crew: Crew, ledger: UsageLedger):
+    """Meter the crew's LLM and tool calls, planning included, into another ledger"""
+    for llm in [crew_agent.llm for crew_agent in crew.agents] + [crew.planning_llm]:
+        if isinstance(llm, MeteredLLM):
+            llm.ledger = ledger
+
+
+def close_ledger(
+    ledger: Optional[UsageLedger], owned: bool, status: str = "completed"
+) -> Dict[str, Any]:
+    """Close a run's own ledger; one owned by the caller only reports its summary"""
+    if ledger is None:
+        return {}
+    return ledger.close(status) if owned else ledger.summary()
+
+
+def execute_crew(
+    inputs: Dict[str, Any],
+    event_queue: Queue,
+    result_queue: Queue,
+    crew: Optional[Crew] = None,
+    incremental: bool = False,
+    speculative: bool = False,
+    execution_id: Optional[str] = None,
+    budget: Optional[Dict[str, Any]] = None,
+    cassette: Optional[Dict[str, Any]] = None,
+    cache: Optional[TaskOutputCache] = None,
+    bundle: bool = True,
+    ledger: Optional[UsageLedger] = None,
+):
+    """
+    Kick off a crew and report progress through the given queues.
+
+    Args:
+        inputs: Campaign inputs interpolated into the agent and task templates
+        event_queue: Queue receiving execution log events
+        result_queue: Queue receiving the final success or error payload
+        crew: A pre-built crew to run; a fresh one is built when omitted
+        incremental: Reuse cached outputs of tasks whose inputs did not change
+        speculative: Draft tasks configured with `drafting` best-of-N
+        execution_id: Namespace for the files this run writes
+        budget: RunBudget limits; the run is aborted once it exceeds them
+        cassette: CassetteConfig to record the run's LLM and tool calls, or
+            to replay a recorded run instead of calling providers and tools
+        cache: Task output cache of incremental runs; the shared file by default
+        bundle: Zip the run's artifacts and outputs once it finishes
+        ledger: Usage ledger of an enclosing run, e.g. a sweep variant, that
+            also holds the budget; the caller begins and closes it, and the
+            result carries its summary so far
+    """
+    store = tape = None
+    # A ledger passed in belongs to the caller, who closes it once
+    owned = ledger is None
+    http_before = http_pool.counters()
+    try:
+        # Reject incomplete inputs before any tokens are spent
+        config_registry.validate_inputs(inputs)
+
+        # Initialize crew
+        if crew is None:
+            crew = TheMarketingCrew().marketingcrew()
+        enable_speculative_drafting(crew, speculative)
+        # Replayed calls must be served once each, in order; never race them
+        enable_hedging(crew, not (cassette and cassette.get("mode") == "replay"))
+        store = artifact_store(crew)
+        if store is not None:
+            store.begin(execution_id)
+        if owned:
+            ledger = usage_ledger(crew)
+            if ledger is not None:
+                ledger.begin(execution_id, RunBudget(**(budget or {})))
+        else:
+            meter_into(crew, ledger)
+        if cassette:
+            tape = Cassette(CassetteConfig(**cassette), execution_id)
+            tape.attach(crew, inputs)
+
+        # Start execution log
+        event_queue.put(events.info("🚀 Starting CrewAI execution..."))
+
+        # Execute crew (events will be automatically captured)
+        reused = []
+        # A replay runs every task, so each recorded call is served again
+        if incremental and not (tape and tape.mode == "replay"):
+            cache = cache or TaskOutputCache()
+            reused = plan_rerun(crew, inputs, cache)["reused"]
+            if reused:
+                event_queue.put(
+                    events.info(
+                        f"♻️ Reusing cached output of {len(reused)} unchanged task(s): {', '.join(reused)}"
+                    )
+                )
+            result = kickoff_incremental(crew, inputs, cache, store)
+        else:
+            result = crew.kickoff(inputs=inputs)
+        outputs = task_outputs(result)
+        artifacts = store.close() if store is not None else {}
+        usage = close_ledger(ledger, owned)
+        recording = tape.close() if tape is not None else {}
+        archive = (
+            store.bundle(outputs, serialize_result(result))
+            if store is not None and bundle
+            else None
+        )
+
+        result_queue.put(
+            {
+                "success": True,
+                "result": serialize_result(result),
+                "task_outputs": outputs,
+                "delegation": delegation_summary(crew),
+                "tool_memo": tool_memo_summary(crew),
+                "reused_tasks": reused,
+                "model_routes": llm_stats(crew, RoutedLLM),
+                "drafting": llm_stats(crew, SpeculativeLLM),
+                "prompt_cache": llm_stats(crew, PrefixCachingLLM),
+                "hedging": llm_stats(crew, HedgedLLM),
+                "http_pool": http_pool.summary(since=http_before),
+                "artifacts": artifacts,
+                "bundle": archive,
+                "usage": usage,
+                "cassette": recording,
+                "timestamp": datetime.now().isoformat(),
+            }
+        )
+
+    except Exception as e:
+        # Land whatever the agents wrote before the failure
+        if store is not None:
+            store.close()
+        usage = close_ledger(ledger, owned, "failed")
+        # A recording of a failed run is kept to reproduce the failure
+        recording = tape.close() if tape is not None else {}
+
+        # Put error result
+        result_queue.put(
+            {
+                "success": False,
+                "error": str(e),
+                "usage": usage,
+                "cassette": recording,
+                "timestamp": datetime.now().isoformat(),
+            }
+        )
+
+        event_queue.put(events.error(str(e)))
+
+
+def run_crew_in_background(
+    inputs: Dict[str, Any],
+    event_queue: Queue,
+    result_queue: Queue,
+    **options: Any,
+):
+    """Run CrewAI in background thread with proper event listening"""
+    # Global event listener instance (required for proper registration)
+    global streamlit_listener
+
+    # Create and register event listener
+    streamlit_listener = StreamlitCrewEventListener(event_queue, options.get("execution_id"))
+
+    execute_crew(inputs, event_queue, result_queue, **options)
+
+
+def run_sweep_in_background(
+    base_inputs: Dict[str, Any], variations: Dict[str, Any], sweep_queue: Queue
+):
+    """Run a parameter sweep and put its results, or the error, on the queue"""
+    try:
+        sweep_queue.put({"success": True, **run_sweep(base_inputs, variations)})
+    except Exception as e:
+        sweep_queue.put({"success": False, "error": str(e)})
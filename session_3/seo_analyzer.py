@@ -0,0 +1,324 @@
+# seo_analyzer.py
+
+import os
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Type
+from urllib.parse import urlparse
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from tool_memo import never_cache
+
+DEFAULT_PATH = "resources/content/blog_drafts.md"
+
+# Common SEO guidance the report is checked against
+TITLE_CHARS = (30, 60)
+META_DESCRIPTION_CHARS = (120, 160)
+KEYWORD_DENSITY = (0.5, 2.5)  # percent of words
+LONG_SENTENCE_WORDS = 25
+TOP_TERMS = 8
+FILE_TITLE_MAX_WORDS = 20
+
+_STOPWORDS = frozenset(
+    """
+    a about above after again all also am an and any are as at be because been before
+    being below between both but by can could did do does doing down during each few
+    for from further had has have having he her here hers him his how i if in into is
+    it its itself just me more most my no nor not now of off on once only or other our
+    ours out over own same she should so some such than that the their theirs them then
+    there these they this those through to too under until up very was we were what
+    when where which while who whom why will with would you your yours
+    """.split()
+)
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+_LINK = re.compile(r"(?<!!)\[([^\]]*)\]\(([^)\s]+)[^)]*\)")
+_IMAGE = re.compile(r"!\[([^\]]*)\]\(([^)\s]+)[^)]*\)")
+# Emphasis around the label or the text, e.g. "**Meta Description:** text", is not part of it
+_META = re.compile(
+    r"^[\W_]*meta[ _-]?description[\W_]*?[:\-][\s*_]*(.+?)[\s*_]*$", re.IGNORECASE
+)
+_WORD = re.compile(r"[A-Za-z][A-Za-z'\-]*")
+_SENTENCE_END = re.compile(r"[.!?]+(?:\s|$)")
+
+
+def _syllables(word: str) -> int:
+    word = word.lower().strip("'-")
+    groups = re.findall(r"[aeiouy]+", word)
+    count = len(groups)
+    if word.endswith("e") and not word.endswith(("le", "ee")) and count > 1:
+        count -= 1
+    return max(1, count)
+
+
+def _plain_text(markdown: str) -> str:
+    """Prose only: no code, link targets, emphasis or heading markers"""
+    text = re.sub(r"```.*?```", " ", markdown, flags=re.DOTALL)
+    text = _IMAGE.sub(" ", text)
+    text = _LINK.sub(r"\1", text)
+    text = re.sub(r"`[^`]*`", " ", text)
+    text = re.sub(r"^\s*(#{1,6}|[-*+]|\d+\.|>)\s+", "", text, flags=re.MULTILINE)
+    return re.sub(r"[*_~|]", " ", text)
+
+
+def readability(text: str) -> Dict[str, float]:
+    """Flesch reading ease, Flesch-Kincaid grade and sentence length of plain text"""
+    words = _WORD.findall(text)
+    if not words:
+        return {
+            "flesch_reading_ease": 0.0,
+            "flesch_kincaid_grade": 0.0,
+            "avg_sentence_words": 0.0,
+            "long_sentences": 0,
+        }
+    # Lines without end punctuation (list items, table rows) count as sentences
+    sentences = [
+        s
+        for chunk in text.splitlines()
+        for s in _SENTENCE_END.split(chunk)
+        if _WORD.search(s)
+    ]
+    sentence_count = max(1, len(sentences))
+    syllables = sum(_syllables(w) for w in words)
+    per_sentence = len(words) / sentence_count
+    per_word = syllables / len(words)
+    return {
+        "flesch_reading_ease": round(206.835 - 1.015 * per_sentence - 84.6 * per_word, 1),
+        "flesch_kincaid_grade": round(0.39 * per_sentence + 11.8 * per_word - 15.59, 1),
+        "avg_sentence_words": round(per_sentence, 1),
+        "long_sentences": sum(len(_WORD.findall(s)) > LONG_SENTENCE_WORDS for s in sentences),
+    }
+
+
+def keyword_density(text: str, keywords: List[str]) -> Dict[str, float]:
+    """Percent of words taken up by each keyword phrase"""
+    words = [w.lower() for w in _WORD.findall(text)]
+    if not words:
+        return {keyword: 0.0 for keyword in keywords}
+    joined = " " + " ".join(words) + " "
+    density = {}
+    for keyword in keywords:
+        phrase = [w.lower() for w in _WORD.findall(keyword)]
+        if not phrase:
+            continue
+        occurrences = joined.count(" " + " ".join(phrase) + " ")
+        density[keyword] = round(100 * occurrences * len(phrase) / len(words), 2)
+    return density
+
+
+def top_terms(text: str, count: int = TOP_TERMS) -> Dict[str, int]:
+    """Most frequent non-stopword terms, candidates when no keywords are given"""
+    terms = Counter(
+        w.lower() for w in _WORD.findall(text) if len(w) > 2 and w.lower() not in _STOPWORDS
+    )
+    return dict(terms.most_common(count))
+
+
+def analyze_post(
+    markdown: str,
+    keywords: Optional[List[str]] = None,
+    site_host: str = "",
+) -> Dict[str, Any]:
+    """
+    SEO metrics for one markdown post.
+
+    Args:
+        markdown: The post, starting with its title heading if it has one
+        keywords: Target keyword phrases; the most frequent terms are reported when omitted
+        site_host: Host whose absolute links count as internal
+
+    Returns:
+        Dict[str, Any]: Structure, meta, link, readability and keyword metrics,
+        plus a list of ``issues`` that break common SEO guidance
+    """
+    lines = markdown.splitlines()
+    headings = [(len(m.group(1)), m.group(2)) for m in map(_HEADING.match, lines) if m]
+    title = next(
+        (text for level, text in headings if level == 1),
+        headings[0][1] if headings else "",
+    )
+    meta = next((m.group(1).strip().strip('"') for m in map(_META.match, lines) if m), "")
+    text = _plain_text("\n".join(line for line in lines if not _META.match(line)))
+    words = _WORD.findall(text)
+
+    internal = external = 0
+    for _, target in _LINK.findall(markdown):
+        host = urlparse(target).netloc
+        if host and host != site_host:
+            external += 1
+        else:
+            internal += 1
+    images = _IMAGE.findall(markdown)
+
+    report: Dict[str, Any] = {
+        "title": title,
+        "title_chars": len(title),
+        "words": len(words),
+        "headings": dict(sorted(Counter(f"h{level}" for level, _ in headings).items())),
+        "meta_description_chars": len(meta),
+        "internal_links": internal,
+        "external_links": external,
+        "images_missing_alt": sum(not alt.strip() for alt, _ in images),
+        **readability(text),
+    }
+    if keywords:
+        report["keyword_density"] = keyword_density(text, keywords)
+    else:
+        report["top_terms"] = top_terms(text)
+
+    issues = []
+    if not title:
+        issues.append("no title heading")
+    elif not TITLE_CHARS[0] <= len(title) <= TITLE_CHARS[1]:
+        issues.append(f"title is {len(title)} chars, aim for {TITLE_CHARS[0]}-{TITLE_CHARS[1]}")
+    if sum(level == 1 for level, _ in headings) > 1:
+        issues.append("more than one H1")
+    skipped = [
+        f"h{previous}->h{level}"
+        for (previous, _), (level, _) in zip(headings, headings[1:])
+        if level > previous + 1
+    ]
+    if skipped:
+        issues.append(f"heading levels skipped: {', '.join(skipped)}")
+    if not meta:
+        issues.append("no meta description")
+    elif not META_DESCRIPTION_CHARS[0] <= len(meta) <= META_DESCRIPTION_CHARS[1]:
+        issues.append(
+            f"meta description is {len(meta)} chars, aim for "
+            f"{META_DESCRIPTION_CHARS[0]}-{META_DESCRIPTION_CHARS[1]}"
+        )
+    if not internal:
+        issues.append("no internal links")
+    if report["images_missing_alt"]:
+        issues.append(f"{report['images_missing_alt']} image(s) without alt text")
+    if report["flesch_reading_ease"] < 50:
+        issues.append(
+            f"hard to read (Flesch {report['flesch_reading_ease']}), shorten sentences and words"
+        )
+    for keyword, density in report.get("keyword_density", {}).items():
+        if not KEYWORD_DENSITY[0] <= density <= KEYWORD_DENSITY[1]:
+            issues.append(
+                f"'{keyword}' density {density}%, "
+                f"aim for {KEYWORD_DENSITY[0]}-{KEYWORD_DENSITY[1]}%"
+            )
+    report["issues"] = issues
+    return report
+
+
+def split_posts(markdown: str) -> List[str]:
+    """A drafts file split at its H1 headings; the whole file when it has at most one"""
+    starts = [m.start() for m in re.finditer(r"^#\s", markdown, flags=re.MULTILINE)]
+    if len(starts) <= 1:
+        return [markdown]
+    posts = [markdown[start:end] for start, end in zip(starts, starts[1:] + [len(markdown)])]
+    # A leading H1 with hardly any text under it titles the file, not a post
+    if len(_WORD.findall(posts[0].split("\n", 1)[-1])) < FILE_TITLE_MAX_WORDS:
+        posts = posts[1:]
+    return posts
+
+
+def analyze_document(
+    markdown: str,
+    keywords: Optional[List[str]] = None,
+    site_host: str = "",
+) -> List[Dict[str, Any]]:
+    """analyze_post() for every post in a drafts file"""
+    return [analyze_post(post, keywords, site_host) for post in split_posts(markdown)]
+
+
+def format_report(reports: List[Dict[str, Any]]) -> str:
+    """Compact text report, one block per post, for an agent to act on"""
+    blocks = []
+    for number, report in enumerate(reports, 1):
+        headings = " ".join(f"{level}={n}" for level, n in report["headings"].items()) or "none"
+        lines = [
+            f"Post {number}: {report['title'] or '(untitled)'}",
+            f"  words={report['words']} title_chars={report['title_chars']} "
+            f"meta_description_chars={report['meta_description_chars']} headings: {headings}",
+            f"  links internal={report['internal_links']} external={report['external_links']} "
+            f"images_missing_alt={report['images_missing_alt']}",
+            f"  readability flesch={report['flesch_reading_ease']} "
+            f"grade={report['flesch_kincaid_grade']} "
+            f"avg_sentence_words={report['avg_sentence_words']} "
+            f"long_sentences={report['long_sentences']}",
+        ]
+        if "keyword_density" in report:
+            lines.append(
+                "  keyword density: "
+                + ", ".join(f"{k}={v}%" for k, v in report["keyword_density"].items())
+            )
+        else:
+            lines.append(
+                "  top terms: " + ", ".join(f"{k}({v})" for k, v in report["top_terms"].items())
+            )
+        lines.append("  issues: " + ("; ".join(report["issues"]) or "none"))
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+class SeoAnalyzerToolSchema(BaseModel):
+    """Input for SeoAnalyzerTool"""
+
+    file_path: str = Field(
+        default=DEFAULT_PATH, description="Markdown file with the blog posts to analyze"
+    )
+    keywords: str = Field(
+        default="",
+        description="Comma-separated target keywords; leave empty to get the most frequent terms",
+    )
+
+
+class SeoAnalyzerTool(BaseTool):
+    """
+    Computes SEO metrics of markdown posts locally, without the LLM.
+
+    Reads go through the run's artifacts and the crew's ToolMemo like the
+    file tools, so analyzing an unchanged file twice costs nothing.
+    """
+
+    name: str = "Analyze SEO metrics"
+    description: str = (
+        "Computes keyword density, heading structure, title and meta description length, "
+        "readability, internal/external links and missing alt text for every post in a "
+        "markdown file, and lists what breaks SEO guidance. Use it instead of counting yourself."
+    )
+    args_schema: Type[BaseModel] = SeoAnalyzerToolSchema
+    memo: Any = Field(default=None, exclude=True)
+    artifacts: Any = Field(default=None, exclude=True)
+    cache_function: Callable = never_cache
+
+    def _run(self, file_path: str = DEFAULT_PATH, keywords: str = "", **kwargs: Any) -> str:
+        if self.artifacts is not None:
+            file_path = self.artifacts.resolve(file_path)
+        terms = [k.strip() for k in keywords.split(",") if k.strip()]
+
+        def compute() -> str:
+            try:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    markdown = f.read()
+            except OSError as e:
+                return f"Error: could not read {file_path}: {e}"
+            return format_report(analyze_document(markdown, terms))
+
+        if self.memo is None:
+            return compute()
+        path = os.path.abspath(file_path)
+        return self.memo.lookup(("seo", path, tuple(terms)), path, compute)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="SEO metrics for markdown posts")
+    parser.add_argument("path", nargs="?", default=DEFAULT_PATH)
+    parser.add_argument("--keywords", default="", help="Comma-separated target keywords")
+    parser.add_argument("--json", action="store_true", help="Print the full metrics as JSON")
+    args = parser.parse_args()
+
+    with open(args.path, "r", encoding="utf-8") as f:
+        keywords = [k.strip() for k in args.keywords.split(",") if k.strip()]
+        reports = analyze_document(f.read(), keywords)
+    print(json.dumps(reports, indent=2) if args.json else format_report(reports))
@@ -0,0 +1,192 @@
+# singleflight.py
+
+import hashlib
+import json
+import os
+import threading
+from queue import Queue
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config_registry import config_registry
+from events import payloads
+
+# Deployment label folded into the crew version, e.g. a git revision, so a
+# code change stops new submissions from joining runs of the old code
+CREW_VERSION = os.getenv("CREW_VERSION", "")
+
+# Options that name a run rather than change what it does
+PER_RUN_OPTIONS = ("execution_id",)
+
+
+def crew_version() -> str:
+    """The deployment label plus a hash of the crew's configuration"""
+    return f"{CREW_VERSION}+{config_registry.version()}"
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items() if v not in (None, "")}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def campaign_key(inputs: Dict[str, Any], options: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Canonical hash of a submission.
+
+    Inputs and options are compared after trimming whitespace and dropping
+    empty values, with keys sorted, so the same campaign typed twice gets
+    the same key. Options that only name the run are ignored; everything
+    else (budget, drafting, cassette...) makes a different run.
+    """
+    material = {
+        "crew": crew_version(),
+        "inputs": _canonical(inputs),
+        "options": _canonical(
+            {k: v for k, v in (options or {}).items() if k not in PER_RUN_OPTIONS}
+        ),
+    }
+    return hashlib.sha256(
+        json.dumps(material, sort_keys=True, separators=(",", ":"), default=str).encode()
+    ).hexdigest()
+
+
+class Sink:
+    """Queue-like adapter for runners and the pool, which only ever call ``put``"""
+
+    def __init__(self, put: Callable[[Any], None]):
+        self.put = put
+
+
+class _Flight:
+    """One in-flight run and the callers attached to it"""
+
+    def __init__(self, owner: "SingleFlight", key: str, run_id: str):
+        self.owner = owner
+        self.key = key
+        # Execution id the run was started under; its payloads live there
+        self.run_id = run_id
+        self.handle: Any = None
+        self.events: List[Any] = []
+        self.subscribers: List[Tuple[Queue, Queue]] = []
+        self.lock = threading.Lock()
+        self.event_queue = Sink(self._put_event)
+        self.result_queue = Sink(self._put_result)
+
+    def attach(self, event_queue: Queue, result_queue: Queue):
+        with self.lock:
+            # A late joiner sees the run from its start
+            for event in self.events:
+                event_queue.put(event)
+            self.subscribers.append((event_queue, result_queue))
+
+    def _put_event(self, event: Any):
+        with self.lock:
+            self.events.append(event)
+            for event_queue, _ in self.subscribers:
+                event_queue.put(event)
+
+    def _put_result(self, result: Any):
+        # Identical submissions from now on start a fresh run
+        self.owner._land(self)
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for _, result_queue in subscribers:
+            result_queue.put(dict(result) if isinstance(result, dict) else result)
+
+
+class SingleFlight:
+    """
+    Coalesces identical campaign submissions onto one run.
+
+    The first submission for a key starts the run; identical submissions
+    made while it is in flight attach to it instead, receive its events
+    from the beginning and get their own copy of the result. A caller
+    that cancels only detaches, and the run itself is cancelled once no
+    caller is left. Every caller retains the run's event payloads, which
+    therefore stay until the last of them calls ``payloads.release`` with
+    its own run id.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._stats = {"started": 0, "joined": 0}
+
+    def submit(
+        self,
+        key: str,
+        event_queue: Queue,
+        result_queue: Queue,
+        start: Callable[[Any, Any], Any],
+        run_id: str,
+    ) -> bool:
+        """
+        Join the in-flight run for ``key``, or start one.
+
+        Args:
+            key: campaign_key() of the submission
+            event_queue: Queue receiving this caller's execution log events
+            result_queue: Queue receiving this caller's copy of the result
+            start: Launches the run given the flight's event and result
+                queues; what it returns (e.g. a pool job id) is kept for
+                ``leave``
+            run_id: The caller's execution id; a run this starts writes
+                under it, and the caller holds the payloads of the run it
+                follows until it releases this id
+
+        Returns:
+            bool: True if an identical run was already in flight and was joined
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            joined = flight is not None
+            if not joined:
+                flight = self._flights[key] = _Flight(self, key, run_id)
+            payloads.retain(flight.run_id, run_id)
+            flight.attach(event_queue, result_queue)
+            self._stats["joined" if joined else "started"] += 1
+        if joined:
+            return True
+
+        try:
+            flight.handle = start(flight.event_queue, flight.result_queue)
+        except BaseException:
+            self._land(flight)
+            raise
+        return False
+
+    def leave(self, key: str, event_queue: Queue) -> Tuple[bool, Any]:
+        """
+        Detach a caller from the run for ``key``.
+
+        Returns:
+            Tuple[bool, Any]: Whether that was the last caller, so the run
+            should be cancelled, and the handle ``start`` returned
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                return False, None
+            with flight.lock:
+                flight.subscribers = [s for s in flight.subscribers if s[0] is not event_queue]
+                last = not flight.subscribers
+            if last:
+                del self._flights[key]
+        return last, flight.handle
+
+    def summary(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._flights)}
+
+    def _land(self, flight: _Flight):
+        with self._lock:
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+
+
+# Shared by the dashboard's sessions and the HTTP API in this process
+campaign_flights = SingleFlight()
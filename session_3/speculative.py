@@ -0,0 +1,204 @@
+# speculative.py
+
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from crewai import BaseLLM, Crew
+from pydantic import BaseModel, Field
+
+from model_routing import LLMWrapper, fork_llm
+
+
+class DraftingConfig(BaseModel):
+    """Best-of-N settings for a task, set under `drafting` in tasks.yaml"""
+
+    drafts: int = Field(default=3, description="Concurrent drafts per LLM call")
+    latency_budget_seconds: float = Field(
+        default=60, description="How long to wait for an acceptable draft"
+    )
+    min_words: int = Field(default=0, description="Minimum words in the final answer")
+    max_words: Optional[int] = Field(default=None, description="Maximum words in the final answer")
+    min_sections: int = Field(default=0, description="Minimum markdown headings")
+    require_hashtags: bool = Field(default=False, description="At least one #hashtag")
+    require_cta: bool = Field(default=False, description="At least one call to action")
+
+
+@dataclass
+class DraftingStats:
+    """Counters describing speculative drafting for one crew"""
+
+    first_drafts: int = 0  # final answers that met every constraint on the first request
+    calls: int = 0  # final answers that were redrafted best-of-N
+    drafts: int = 0  # drafts requested for those calls, the first one included
+    accepted: int = 0  # calls answered by a redraft that met every constraint
+    best_effort: int = 0  # no acceptable draft in time; the best-scoring one was used
+    abandoned: int = 0  # drafts still running when a winner was chosen; their results are discarded
+    failed: int = 0  # drafts that raised or hit the latency budget
+
+    def summary(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+_stats_lock = threading.Lock()
+
+
+def _record(stats: DraftingStats, **counters: int):
+    with _stats_lock:
+        for counter, amount in counters.items():
+            setattr(stats, counter, getattr(stats, counter) + amount)
+
+
+_CTA = re.compile(
+    r"\b(sign up|get started|learn more|try (it|now|\w+ free)|buy now|shop now|book (a|your)|"
+    r"download|contact us|subscribe|register|join|claim|call to action|cta)\b",
+    re.IGNORECASE,
+)
+
+
+def score_draft(text: str, config: DraftingConfig) -> Tuple[bool, float]:
+    """
+    Check a draft against the task's constraints.
+
+    Intermediate steps (tool calls) are not creative output, so any draft
+    without a final answer is accepted as is.
+
+    Returns:
+        Tuple[bool, float]: Whether every constraint holds, and the share that does
+    """
+    if "Final Answer:" not in text:
+        return True, 1.0
+    answer = text.split("Final Answer:", 1)[1].strip()
+
+    words = len(re.findall(r"\b\w+\b", answer))
+    checks: List[bool] = []
+    if config.min_words:
+        checks.append(words >= config.min_words)
+    if config.max_words:
+        checks.append(words <= config.max_words)
+    if config.min_sections:
+        checks.append(len(re.findall(r"^#{1,6}\s", answer, re.MULTILINE)) >= config.min_sections)
+    if config.require_hashtags:
+        checks.append(re.search(r"(?<!\w)#[A-Za-z]\w+", answer) is not None)
+    if config.require_cta:
+        checks.append(_CTA.search(answer) is not None)
+
+    if not checks:
+        return True, 1.0
+    return all(checks), sum(checks) / len(checks)
+
+
+class SpeculativeLLM(LLMWrapper):
+    """
+    Redrafts final answers best-of-N for tasks configured with `drafting`.
+
+    Every call first goes out as a single request, so ReAct tool steps and
+    final answers that already meet the task's constraints cost nothing
+    extra. Only a final answer that misses a constraint is redrafted by
+    N - 1 concurrent requests, each bounded by the time left in the latency
+    budget. The first acceptable draft wins; drafts still running then are
+    abandoned, not cancelled, and finish within that bound. When the budget
+    runs out first, the best-scoring draft received so far is used. Calls
+    for other tasks, or while the mode is disabled, go straight to the
+    wrapped LLM.
+    """
+
+    def __init__(
+        self,
+        inner: BaseLLM,
+        tasks_config: Optional[Dict[str, Any]] = None,
+        stats: Optional[DraftingStats] = None,
+    ):
+        super().__init__(inner)
+        self.enabled = False
+        self.stats = stats or DraftingStats()
+        self.drafting: Dict[str, DraftingConfig] = {
+            name: DraftingConfig(**task_config["drafting"])
+            for name, task_config in (tasks_config or {}).items()
+            if isinstance(task_config, dict) and task_config.get("drafting")
+        }
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Union[str, Any]:
+        config = self.drafting.get(getattr(from_task, "name", None))
+        if not self.enabled or config is None or config.drafts <= 1:
+            return super().call(
+                messages, tools, callbacks, available_functions, from_task, from_agent
+            )
+
+        deadline = time.monotonic() + config.latency_budget_seconds
+        first = super().call(
+            messages, tools, callbacks, available_functions, from_task, from_agent
+        )
+        # Tool steps and native tool calls are not creative output
+        if not isinstance(first, str) or "Final Answer:" not in first:
+            return first
+        acceptable, score = score_draft(first, config)
+        if acceptable:
+            _record(self.stats, first_drafts=1)
+            return first
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            _record(self.stats, calls=1, drafts=1, best_effort=1)
+            return first
+
+        def draft():
+            # Bounded by the budget left, so an abandoned draft cannot outlive it
+            llm = fork_llm(self.inner, timeout=remaining)
+            llm.stop = self.stop
+            return llm.call(
+                messages, tools, callbacks, available_functions, from_task, from_agent
+            )
+
+        _record(self.stats, calls=1, drafts=config.drafts)
+        best: Tuple[float, Any] = (score, first)
+        executor = ThreadPoolExecutor(max_workers=config.drafts - 1)
+        pending = {executor.submit(draft) for _ in range(config.drafts - 1)}
+        try:
+            while pending:
+                # Once the budget is spent, settle for the best draft so far
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        result = future.result()
+                    except Exception:
+                        _record(self.stats, failed=1)
+                        continue
+                    # A redraft that went back to a tool step cannot replace the answer
+                    if not isinstance(result, str) or "Final Answer:" not in result:
+                        continue
+                    acceptable, score = score_draft(result, config)
+                    if acceptable:
+                        _record(self.stats, accepted=1, abandoned=len(pending))
+                        return result
+                    if score > best[0]:
+                        best = (score, result)
+
+            _record(self.stats, best_effort=1, abandoned=len(pending))
+            return best[1]
+        finally:
+            executor.shutdown(wait=False)
+
+
+def enable_speculative_drafting(crew: Crew, enabled: bool = True):
+    """Switch speculative drafting on or off for every agent of a crew"""
+    for crew_agent in crew.agents:
+        llm = crew_agent.llm
+        # The drafting layer may be wrapped by others, e.g. metering
+        while isinstance(llm, LLMWrapper) and not isinstance(llm, SpeculativeLLM):
+            llm = llm.inner
+        if isinstance(llm, SpeculativeLLM):
+            llm.enabled = enabled
@@ -1,13 +1,25 @@
 # streamlit_ui_listener.py
 
 import queue
+import uuid
 from crewai.utilities.events.base_event_listener import BaseEventListener
 from crewai.utilities.events import (
+    CrewKickoffStartedEvent,
+    CrewKickoffCompletedEvent,
+    CrewKickoffFailedEvent,
     AgentExecutionStartedEvent,
     AgentExecutionCompletedEvent,
-    CrewKickoffCompletedEvent,
+    AgentExecutionErrorEvent,
+    TaskStartedEvent,
+    TaskCompletedEvent,
+    TaskFailedEvent,
+    ToolUsageStartedEvent,
+    ToolUsageFinishedEvent,
+    ToolUsageErrorEvent,
 )
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from events import CrewEvent, EventType, with_payload
 
 
 class StreamlitUIListener(BaseEventListener):
@@ -69,3 +81,99 @@ class StreamlitUIListener(BaseEventListener):
                     "final_output": final_output,
                 },
             )
+
+
+class StreamlitCrewEventListener(BaseEventListener):
+    """Event listener for CrewAI events that sends updates to Streamlit UI"""
+
+    def __init__(self, event_queue: queue.Queue, execution_id: Optional[str] = None):
+        super().__init__()
+        self.event_queue = event_queue
+        # Full outputs behind the events are stored under this run
+        self.execution_id = execution_id or str(uuid.uuid4())
+
+    def setup_listeners(self, crewai_event_bus):
+        """Setup event listeners according to CrewAI documentation"""
+
+        @crewai_event_bus.on(CrewKickoffStartedEvent)
+        def on_crew_started(source, event):
+            self.event_queue.put(
+                CrewEvent(EventType.CREW_STARTED, name=event.crew_name or "Marketing Crew")
+            )
+
+        @crewai_event_bus.on(CrewKickoffCompletedEvent)
+        def on_crew_completed(source, event):
+            # The output also arrives as the run's result; keep a reference only
+            self.event_queue.put(
+                with_payload(
+                    EventType.CREW_COMPLETE,
+                    event.crew_name or "Marketing Crew",
+                    str(getattr(event, "output", "") or ""),
+                    self.execution_id,
+                )
+            )
+
+        @crewai_event_bus.on(CrewKickoffFailedEvent)
+        def on_crew_failed(source, event):
+            self.event_queue.put(
+                CrewEvent(
+                    EventType.CREW_ERROR,
+                    name=event.crew_name or "Marketing Crew",
+                    text=str(event.error),
+                )
+            )
+
+        @crewai_event_bus.on(AgentExecutionStartedEvent)
+        def on_agent_started(source, event):
+            self.event_queue.put(CrewEvent(EventType.AGENT_START, name=event.agent.role))
+
+        @crewai_event_bus.on(AgentExecutionCompletedEvent)
+        def on_agent_completed(source, event):
+            self.event_queue.put(
+                with_payload(
+                    EventType.AGENT_FINISH, event.agent.role, str(event.output), self.execution_id
+                )
+            )
+
+        @crewai_event_bus.on(AgentExecutionErrorEvent)
+        def on_agent_error(source, event):
+            self.event_queue.put(
+                CrewEvent(EventType.AGENT_ERROR, name=event.agent.role, text=str(event.error))
+            )
+
+        @crewai_event_bus.on(TaskStartedEvent)
+        def on_task_started(source, event):
+            self.event_queue.put(CrewEvent(EventType.TASK_START, name=_task_label(event)))
+
+        @crewai_event_bus.on(TaskCompletedEvent)
+        def on_task_completed(source, event):
+            self.event_queue.put(CrewEvent(EventType.TASK_COMPLETE, name=_task_label(event)))
+
+        @crewai_event_bus.on(TaskFailedEvent)
+        def on_task_failed(source, event):
+            self.event_queue.put(
+                CrewEvent(EventType.TASK_ERROR, name=_task_label(event), text=str(event.error))
+            )
+
+        @crewai_event_bus.on(ToolUsageStartedEvent)
+        def on_tool_usage_started(source, event):
+            self.event_queue.put(CrewEvent(EventType.TOOL_START, name=event.tool_name))
+
+        @crewai_event_bus.on(ToolUsageFinishedEvent)
+        def on_tool_usage_finished(source, event):
+            self.event_queue.put(CrewEvent(EventType.TOOL_FINISH, name=event.tool_name))
+
+        @crewai_event_bus.on(ToolUsageErrorEvent)
+        def on_tool_usage_error(source, event):
+            self.event_queue.put(
+                CrewEvent(EventType.TOOL_ERROR, name=event.tool_name, text=str(event.error))
+            )
+
+
+def _task_label(event) -> str:
+    """Short description of the task an event is about"""
+    task = getattr(event, "task", None)
+    description = " ".join(
+        (getattr(task, "description", None) or getattr(task, "name", None) or "Task").split()
+    )
+    return description[:100] + "..." if len(description) > 100 else description
@@ -0,0 +1,312 @@
+# sweep.py
+
+import itertools
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from queue import Queue
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from crewai import Crew, Task
+from crewai.tasks.task_output import TaskOutput
+
+import events
+from incremental import TaskOutputCache, task_keys, task_name
+from metering import RunBudget, UsageLedger
+
+DEFAULT_WORKERS = int(os.getenv("CREW_SWEEP_WORKERS", 4))
+
+
+def _build_crew() -> Crew:
+    from crew import TheMarketingCrew
+
+    return TheMarketingCrew().marketingcrew()
+
+
+def expand_grid(
+    base_inputs: Dict[str, Any], variations: Dict[str, List[Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Every combination of the varied inputs applied on top of the base inputs.
+
+    Args:
+        base_inputs: Inputs shared by all variants
+        variations: Input name to the values to try, e.g. {"budget": [...]}
+
+    Returns:
+        List[Dict[str, Any]]: One inputs dict per variant
+    """
+    varied = {name: values for name, values in variations.items() if values}
+    names = list(varied)
+    return [
+        {**base_inputs, **dict(zip(names, combination))}
+        for combination in itertools.product(*(varied[name] for name in names))
+    ]
+
+
+def _depths(tasks: List[Task]) -> Dict[str, int]:
+    """Longest chain of context tasks above each task"""
+    depths: Dict[str, int] = {}
+
+    def depth(task: Task) -> int:
+        name = task_name(task)
+        if name not in depths:
+            context = task.context if isinstance(task.context, list) else []
+            depths[name] = 1 + max((depth(c) for c in context), default=-1)
+        return depths[name]
+
+    for task in tasks:
+        depth(task)
+    return depths
+
+
+def _variant_ledgers(
+    template: Crew, execution_ids: List[str], budget: Optional[Dict[str, Any]]
+) -> List[Optional[UsageLedger]]:
+    """
+    One open usage ledger per variant, priced like the template crew's.
+
+    None per variant when the crew is not metered; its runs then keep
+    their own ledgers.
+    """
+    from runner import usage_ledger
+
+    priced = usage_ledger(template)
+    ledgers: List[Optional[UsageLedger]] = []
+    for execution_id in execution_ids:
+        ledger = None
+        if priced is not None:
+            ledger = UsageLedger(
+                priced.pricing, priced.tool_pricing, priced.cached_input_discount, priced.path
+            )
+            ledger.begin(execution_id, RunBudget(**(budget or {})))
+        ledgers.append(ledger)
+    return ledgers
+
+
+def _execute(
+    crew: Crew,
+    inputs: Dict[str, Any],
+    execution_id: str,
+    cache: TaskOutputCache,
+    budget: Optional[Dict[str, Any]],
+    bundle: bool,
+    ledger: Optional[UsageLedger] = None,
+) -> Dict[str, Any]:
+    """Run a crew incrementally through runner.execute_crew and return its result payload"""
+    from runner import execute_crew
+
+    result_queue: Queue = Queue()
+    execute_crew(
+        inputs,
+        Queue(),
+        result_queue,
+        crew=crew,
+        incremental=True,
+        execution_id=execution_id,
+        budget=budget,
+        cache=cache,
+        bundle=bundle,
+        ledger=ledger,
+    )
+    result = result_queue.get()
+    if not result["success"]:
+        raise RuntimeError(result["error"])
+    return result
+
+
+def _run_node(
+    crew_factory: Callable[[], Crew],
+    name: str,
+    upstream: List[str],
+    inputs: Dict[str, Any],
+    execution_id: str,
+    cache: TaskOutputCache,
+    budget: Optional[Dict[str, Any]],
+    ledger: Optional[UsageLedger],
+) -> TaskOutput:
+    """
+    Run one task in its variant's namespace, after the upstream tasks it may read.
+
+    The upstream tasks are already cached, so the incremental run only puts
+    their outputs and files back in place before running the task itself.
+    """
+    crew = crew_factory()
+    tasks = [t for t in crew.tasks if task_name(t) in upstream or task_name(t) == name]
+    # Planning covers the whole crew; it already ran for nothing here
+    partial = crew.model_copy(update={"tasks": tasks, "planning": False})
+    _execute(partial, inputs, execution_id, cache, budget, False, ledger)
+    return next(t for t in tasks if task_name(t) == name).output
+
+
+def run_sweep(
+    base_inputs: Dict[str, Any],
+    variations: Dict[str, List[Any]],
+    max_workers: int = DEFAULT_WORKERS,
+    cache: Optional[TaskOutputCache] = None,
+    crew_factory: Optional[Callable[[], Crew]] = None,
+    event_queue: Optional[Queue] = None,
+    budget: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Run a grid of campaign variants, computing shared tasks only once.
+
+    Each task output is keyed on the inputs it actually depends on (see
+    incremental.task_keys), so variants that agree on those inputs share
+    it; market research, for instance, is computed once for any number of
+    budgets. Tasks run in waves by dependency depth and every wave runs its
+    distinct tasks in parallel.
+
+    Every variant writes to its own artifact namespace and every task runs
+    through runner.execute_crew. A variant has one usage ledger, holding
+    its budget, for all of its task runs; it is appended to the ledger file
+    once the sweep is over. A task shared by several variants is paid for
+    by the first one needing it. A finished variant is bundled by one more
+    incremental run, which only collects the cached outputs and their files.
+
+    Args:
+        base_inputs: Inputs shared by all variants
+        variations: Input name to the values to try
+        max_workers: Tasks executed concurrently within a wave
+        cache: Output cache shared with incremental reruns
+        crew_factory: Builds a fresh crew; defaults to TheMarketingCrew
+        event_queue: Optional queue receiving progress events
+        budget: RunBudget limits applied to each variant
+
+    Returns:
+        Dict[str, Any]: "variants" with per-variant outputs and "stats"
+    """
+    crew_factory = crew_factory or _build_crew
+    cache = cache or TaskOutputCache()
+    variants = expand_grid(base_inputs, variations)
+    sweep_id = uuid.uuid4().hex[:8]
+    execution_ids = [f"sweep-{sweep_id}-{index + 1}" for index in range(len(variants))]
+
+    template = crew_factory()
+    order = [task_name(task) for task in template.tasks]
+    depths = _depths(template.tasks)
+    contexts = {
+        task_name(task): [task_name(c) for c in (task.context if isinstance(task.context, list) else [])]
+        for task in template.tasks
+    }
+    variant_keys = [task_keys(template.tasks, inputs) for inputs in variants]
+    ledgers = _variant_ledgers(template, execution_ids, budget)
+
+    def notify(message: str):
+        if event_queue is not None:
+            event_queue.put(events.info(message))
+
+    outputs: Dict[str, TaskOutput] = {}
+    errors: Dict[str, str] = {}
+    reused = 0
+    for key in {key for keys in variant_keys for key in keys.values()}:
+        cached = cache.get(key)
+        if cached is not None:
+            outputs[key] = cached
+            reused += 1
+
+    computed = 0
+    for level in sorted(set(depths.values())):
+        # Distinct tasks at this depth, each run for the first variant needing it
+        nodes: Dict[str, Tuple[str, int]] = {}
+        for index, keys in enumerate(variant_keys):
+            for name in order:
+                key = keys[name]
+                if depths[name] != level or key in outputs or key in errors:
+                    continue
+                failed = [keys[c] for c in contexts[name] if keys[c] in errors]
+                if failed:
+                    errors[key] = errors[failed[0]]
+                    continue
+                nodes.setdefault(key, (name, index))
+
+        if not nodes:
+            continue
+        notify(f"🧪 Sweep wave {level + 1}: running {len(nodes)} distinct task(s)")
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(
+                    _run_node,
+                    crew_factory,
+                    name,
+                    [
+                        upstream
+                        for upstream in order
+                        if depths[upstream] < level and variant_keys[index][upstream] in outputs
+                    ],
+                    variants[index],
+                    execution_ids[index],
+                    cache,
+                    budget,
+                    ledgers[index],
+                ): (key, name)
+                for key, (name, index) in nodes.items()
+            }
+            for future in as_completed(futures):
+                key, name = futures[future]
+                try:
+                    outputs[key] = future.result()
+                    computed += 1
+                except Exception as e:
+                    errors[key] = f"{name}: {e}"
+                    notify(f"❌ Sweep task {name} failed: {e}")
+
+    results = []
+    for inputs, keys, execution_id, ledger in zip(variants, variant_keys, execution_ids, ledgers):
+        label = ", ".join(f"{name}={inputs[name]}" for name in variations if variations[name])
+        final_key = keys[order[-1]]
+        bundle = None
+        if all(key in outputs for key in keys.values()):
+            try:
+                bundle = _execute(
+                    crew_factory(), inputs, execution_id, cache, budget, True, ledger
+                )["bundle"]
+            except Exception as e:
+                notify(f"❌ Sweep variant {label} could not be bundled: {e}")
+        failed = any(key in errors for key in keys.values())
+        usage = ledger.close("failed" if failed else "completed") if ledger is not None else {}
+        results.append(
+            {
+                "label": label,
+                "inputs": inputs,
+                "outputs": {name: outputs[keys[name]].raw for name in order if keys[name] in outputs},
+                "result": outputs[final_key].raw if final_key in outputs else None,
+                "error": errors.get(final_key),
+                "execution_id": execution_id,
+                "bundle": bundle,
+                "usage": usage,
+            }
+        )
+
+    return {
+        "variants": results,
+        "stats": {
+            "variants": len(variants),
+            "independent_task_runs": len(variants) * len(order),
+            "task_runs": computed,
+            "reused_from_cache": reused,
+        },
+    }
+
+
+if __name__ == "__main__":
+    base_inputs = {
+        "product_name": "AI Powered Excel Automation Tool",
+        "target_audience": "Small and Medium Enterprises (SMEs)",
+        "product_description": "A tool that automates repetitive tasks in Excel using AI, saving time and reducing errors.",
+        "current_date": datetime.now().strftime("%Y-%m-%d"),
+        "industry": "Business Software",
+        "location": "Ho Chi Minh City, Vietnam",
+    }
+    sweep = run_sweep(
+        base_inputs,
+        {
+            "budget": ["Rs. 50,000", "Rs. 100,000", "Rs. 200,000"],
+            "primary_goal": ["Lead generation", "Brand awareness"],
+            "campaign_duration": ["1 month", "3 months"],
+        },
+    )
+    print(sweep["stats"])
+    for variant in sweep["variants"]:
+        print(f"{variant['label']}: {'failed: ' + variant['error'] if variant['error'] else 'done'}")
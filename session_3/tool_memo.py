@@ -0,0 +1,188 @@
+# tool_memo.py
+
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from crewai_tools import DirectoryReadTool, FileReadTool, FileWriterTool
+from crewai_tools.tools.file_writer_tool.file_writer_tool import strtobool
+from pydantic import Field
+
+from metrics import metrics
+
+
+def never_cache(_args=None, _result=None) -> bool:
+    """
+    ``cache_function`` for tools whose results crewai must not cache.
+
+    crewai's tool cache keys on the arguments alone, so it would serve a
+    stale read after the file changed; ToolMemo, which checks the file,
+    memoizes those reads instead.
+    """
+    return False
+
+
+def _signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ToolMemo:
+    """
+    Memoizes read-only file tool calls within one crew run.
+
+    File reads are keyed on their arguments plus the file's mtime and size,
+    directory listings on the directory and its mtime. Writes made through
+    MemoFileWriterTool invalidate every entry for the written path. The
+    full result is always returned: an agent's scratchpad can be
+    summarized and a delegated coworker starts without one, so no caller
+    can be assumed to still hold an earlier result.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple, Tuple[Optional[Tuple[int, int]], str]] = {}
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def lookup(self, key: Tuple, path: str, compute: Callable[[], str]) -> str:
+        """
+        Return a memoized tool result, computing it on a miss.
+
+        Args:
+            key: Arguments identifying the call
+            path: File or directory the result depends on
+            compute: Produces the result when it is not memoized
+
+        Returns:
+            str: The tool output
+        """
+        signature = _signature(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            hit = entry is not None and signature is not None and entry[0] == signature
+            if hit:
+                self._stats["hits"] += 1
+                result = entry[1]
+
+        metrics.inc("crew_cache_lookups", cache="tool_memo", result="hit" if hit else "miss")
+        if not hit:
+            result = compute()
+            with self._lock:
+                self._stats["misses"] += 1
+                # Missing paths and tool errors are never memoized
+                if signature is not None and not result.startswith("Error"):
+                    self._entries[key] = (signature, result)
+        return result
+
+    def invalidate(self, path: str):
+        """Drop entries for a written file and for listings that contain it"""
+        path = os.path.abspath(path)
+        with self._lock:
+            stale = [
+                key
+                for key in self._entries
+                if key[1] == path or path.startswith(key[1].rstrip(os.sep) + os.sep)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self._stats["invalidations"] += len(stale)
+
+    def summary(self) -> Dict[str, int]:
+        """Hit, miss and invalidation counters for the run"""
+        with self._lock:
+            return dict(self._stats)
+
+
+class MemoFileReadTool(FileReadTool):
+    """FileReadTool whose reads go through a ToolMemo and the run's artifacts"""
+
+    memo: Any = Field(default=None, exclude=True)
+    artifacts: Any = Field(default=None, exclude=True)
+    cache_function: Callable = never_cache
+
+    def _run(
+        self,
+        file_path: Optional[str] = None,
+        start_line: Optional[int] = 1,
+        line_count: Optional[int] = None,
+    ) -> str:
+        file_path = file_path or self.file_path
+        if self.artifacts is not None and file_path:
+            file_path = self.artifacts.resolve(file_path)
+        if self.memo is None or file_path is None:
+            return super()._run(file_path, start_line, line_count)
+
+        path = os.path.abspath(file_path)
+        return self.memo.lookup(
+            ("read", path, start_line or 1, line_count),
+            path,
+            lambda: super(MemoFileReadTool, self)._run(
+                file_path, start_line, line_count
+            ),
+        )
+
+
+class MemoDirectoryReadTool(DirectoryReadTool):
+    """DirectoryReadTool whose listings go through a ToolMemo and the run's artifacts"""
+
+    memo: Any = Field(default=None, exclude=True)
+    artifacts: Any = Field(default=None, exclude=True)
+    cache_function: Callable = never_cache
+
+    def _run(self, **kwargs: Any) -> Any:
+        directory = kwargs.get("directory", self.directory)
+        if self.artifacts is not None and directory:
+            directory = kwargs["directory"] = self.artifacts.resolve(directory)
+        if self.memo is None or not directory:
+            return super()._run(**kwargs)
+
+        path = os.path.abspath(directory)
+        return self.memo.lookup(
+            ("list", path),
+            path,
+            lambda: super(MemoDirectoryReadTool, self)._run(**kwargs),
+        )
+
+
+class MemoFileWriterTool(FileWriterTool):
+    """
+    FileWriterTool that invalidates memoized reads of what it writes.
+
+    With an ArtifactStore, files go to the run's namespace through the
+    store's background writer instead of being written in the agent loop.
+    """
+
+    memo: Any = Field(default=None, exclude=True)
+    artifacts: Any = Field(default=None, exclude=True)
+
+    def _run(self, **kwargs: Any) -> str:
+        if (
+            self.artifacts is None
+            or "filename" not in kwargs
+            or "content" not in kwargs
+        ):
+            result = super()._run(**kwargs)
+        else:
+            result = self._write_artifact(**kwargs)
+        if self.memo is not None and "filename" in kwargs:
+            path = os.path.join(kwargs.get("directory") or "", kwargs["filename"])
+            self.memo.invalidate(path)
+            if self.artifacts is not None:
+                self.memo.invalidate(self.artifacts.path_for(path))
+        return result
+
+    def _write_artifact(self, **kwargs: Any) -> str:
+        filepath = os.path.join(kwargs.get("directory") or "", kwargs["filename"])
+        try:
+            overwrite = strtobool(kwargs.get("overwrite", False))
+        except ValueError as e:
+            return f"An error occurred while writing to the file: {str(e)}"
+        if self.artifacts.exists(filepath) and not overwrite:
+            return (
+                f"File {filepath} already exists and overwrite option was not passed."
+            )
+        self.artifacts.write(filepath, kwargs["content"])
+        return f"Content successfully written to {filepath}"